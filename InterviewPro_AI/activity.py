@@ -0,0 +1,116 @@
+"""
+InterviewPro AI - Daily Activity Bitmaps
+One bit per day per user for streaks and "N of last M days" checks
+"""
+
+import threading
+from datetime import date
+
+
+def _popcount(value):
+    return bin(value).count("1")
+
+
+class ActivityBitmap:
+    """Days a user was active, packed little-endian; bit 0 is `start_day`"""
+
+    def __init__(self, start_day, bitmap=b""):
+        self.start_day = start_day
+        self.bits = int.from_bytes(bitmap, "little")
+
+    def to_bytes(self):
+        return self.bits.to_bytes((self.bits.bit_length() + 7) // 8, "little")
+
+    def mark(self, day):
+        """Set the bit for an ordinal day; returns False if it was already set"""
+        if day < self.start_day:
+            # Rebase so the earlier day becomes bit 0
+            self.bits <<= self.start_day - day
+            self.start_day = day
+        bit = 1 << (day - self.start_day)
+        if self.bits & bit:
+            return False
+        self.bits |= bit
+        return True
+
+    def is_active(self, day):
+        offset = day - self.start_day
+        return offset >= 0 and bool(self.bits >> offset & 1)
+
+    def _window(self, end_day, days):
+        """Bits for the `days` days ending at end_day, with end_day as the highest bit"""
+        offset = end_day - self.start_day
+        if offset < 0:
+            return 0
+        bits = self.bits & ((1 << (offset + 1)) - 1)
+        low = offset - days + 1
+        return bits >> low if low >= 0 else bits << -low
+
+    def current_streak(self, today):
+        """Consecutive active days ending today (or yesterday, if today has no activity yet)"""
+        end_day = today if self.is_active(today) else today - 1
+        offset = end_day - self.start_day
+        if offset < 0:
+            return 0
+        mask = (1 << (offset + 1)) - 1
+        gaps = ~self.bits & mask
+        # The highest inactive day at or before end_day bounds the streak
+        return offset + 1 if gaps == 0 else offset - (gaps.bit_length() - 1)
+
+    def longest_streak(self):
+        """Longest run of consecutive active days"""
+        bits, run = self.bits, 0
+        while bits:
+            bits &= bits << 1
+            run += 1
+        return run
+
+    def active_days(self, today, days):
+        """Number of active days among the last `days` days (today included)"""
+        return _popcount(self._window(today, days))
+
+
+class ActivityTracker:
+    """Caches activity bitmaps per user and writes a bitmap only when a new day is set"""
+
+    def __init__(self, database):
+        self.db = database
+        self._lock = threading.Lock()
+        self._bitmaps = {}
+
+    def _get(self, user_id):
+        bitmap = self._bitmaps.get(user_id)
+        if bitmap is None:
+            row = self.db.get_activity_bitmap(user_id)
+            bitmap = ActivityBitmap(row["start_day"], row["bitmap"]) if row else None
+            if bitmap:
+                self._bitmaps[user_id] = bitmap
+        return bitmap
+
+    def record(self, user_id, day=None):
+        """Mark a user active on a day (today by default)"""
+        if not user_id:
+            return
+        day = (day or date.today()).toordinal()
+        with self._lock:
+            bitmap = self._get(user_id)
+            if bitmap is None:
+                bitmap = self._bitmaps[user_id] = ActivityBitmap(day)
+            if not bitmap.mark(day):
+                return
+            start_day, packed = bitmap.start_day, bitmap.to_bytes()
+        self.db.save_activity_bitmap(user_id, start_day, packed)
+
+    def summary(self, user_id, today=None):
+        """Current streak, longest streak and last-7/last-30 activity counts"""
+        today = (today or date.today()).toordinal()
+        with self._lock:
+            bitmap = self._get(user_id)
+            if bitmap is None:
+                return {"streak": 0, "longest_streak": 0, "last_7_days": 0, "last_30_days": 0}
+            return {
+                "streak": bitmap.current_streak(today),
+                "longest_streak": bitmap.longest_streak(),
+                "last_7_days": bitmap.active_days(today, 7),
+                "last_30_days": bitmap.active_days(today, 30),
+            }
@@ -0,0 +1,176 @@
+"""
+InterviewPro AI - Adaptive Question Selection
+Elo-style ratings per student category and per question, sampled through alias tables
+"""
+
+import hashlib
+import math
+import random
+import threading
+
+from ai_engine import DIFFICULTY_POINTS, QUESTION_BANK
+
+# Starting question ratings by labelled difficulty, and a new student's rating
+INITIAL_RATINGS = {"easy": 1200, "medium": 1400, "hard": 1600}
+STUDENT_START = 1400
+
+# Aim for questions the student is expected to answer this well
+TARGET_SUCCESS = 0.6
+TARGET_SPREAD = 0.15
+
+# Student ratings are bucketed into bands, each with its own precomputed alias table
+MIN_RATING = 800
+MAX_RATING = 2200
+BAND_WIDTH = 50
+
+# A category this many points below the student's average is twice as likely to be drawn
+WEAKNESS_SCALE = 100
+
+
+def question_key(question_text):
+    """Stable key for a question bank entry"""
+    return hashlib.sha1(question_text.encode("utf-8")).hexdigest()[:16]
+
+
+def expected_score(student_rating, question_rating):
+    return 1.0 / (1.0 + 10 ** ((question_rating - student_rating) / 400.0))
+
+
+def k_factor(answers):
+    """Big steps while a rating is new, smaller ones as evidence builds up"""
+    return max(10.0, 40.0 / (1 + answers / 20.0))
+
+
+class AliasTable:
+    """Walker's alias method: O(n) to build, O(1) per sample"""
+    __slots__ = ("prob", "alias")
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+
+    def sample(self, rng):
+        i = int(rng.random() * len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class QuestionSelector:
+    """Builds interview decks weighted toward a student's weak categories and difficulty band"""
+
+    def __init__(self, database, question_bank=QUESTION_BANK, rng=None):
+        self.db = database
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._bands = (MAX_RATING - MIN_RATING) // BAND_WIDTH + 1
+
+        self._pool = {}
+        self._question_ratings = {}
+        for category, levels in question_bank.items():
+            for difficulty, questions in levels.items():
+                for q in questions:
+                    key = question_key(q["q"])
+                    self._pool.setdefault(category, []).append({
+                        "category": category,
+                        "difficulty": difficulty,
+                        "question": q["q"],
+                        "ideal_answer": q["a"],
+                        "keywords": q["keywords"],
+                        "points": DIFFICULTY_POINTS.get(difficulty, 10),
+                        "question_key": key,
+                    })
+                    self._question_ratings[key] = [float(INITIAL_RATINGS.get(difficulty, STUDENT_START)), 0]
+
+        for row in self.db.get_question_ratings():
+            if row["question_key"] in self._question_ratings:
+                self._question_ratings[row["question_key"]] = [float(row["rating"]), row["answers"]]
+
+        self._students = {}
+        # category -> one alias table per band; None until the band is next drawn from
+        self._tables = {category: [None] * self._bands for category in self._pool}
+
+    def _band(self, rating):
+        return min(max(int((rating - MIN_RATING) // BAND_WIDTH), 0), self._bands - 1)
+
+    def _table(self, category, band):
+        """Alias table for one category and student rating band, weighting questions by difficulty fit"""
+        table = self._tables[category][band]
+        if table is None:
+            student_rating = MIN_RATING + (band + 0.5) * BAND_WIDTH
+            table = self._tables[category][band] = AliasTable([
+                math.exp(-((expected_score(student_rating, self._question_ratings[q["question_key"]][0])
+                            - TARGET_SUCCESS) / TARGET_SPREAD) ** 2 / 2) + 1e-3
+                for q in self._pool[category]
+            ])
+        return table
+
+    def _student(self, user_id):
+        ratings = self._students.get(user_id)
+        if ratings is None:
+            ratings = {row["category"]: [float(row["rating"]), row["answers"]]
+                       for row in self.db.get_skill_ratings(user_id)}
+            self._students[user_id] = ratings
+        return ratings
+
+    def select(self, user_id, categories, count):
+        """Draw `count` distinct questions from the given categories (all categories if none match)"""
+        categories = [c for c in dict.fromkeys(categories or []) if c in self._pool] or list(self._pool)
+        with self._lock:
+            ratings = self._student(user_id)
+            thetas = [ratings.get(c, (STUDENT_START, 0))[0] for c in categories]
+            tables = [self._table(c, self._band(theta)) for c, theta in zip(categories, thetas)]
+
+        mean = sum(thetas) / len(thetas)
+        category_table = AliasTable([2 ** ((mean - theta) / WEAKNESS_SCALE) for theta in thetas])
+        count = min(count, sum(len(self._pool[c]) for c in categories))
+
+        deck, seen, attempts = [], set(), 0
+        while len(deck) < count and attempts < count * 20:
+            attempts += 1
+            i = category_table.sample(self.rng)
+            question = self._pool[categories[i]][tables[i].sample(self.rng)]
+            if question["question_key"] not in seen:
+                seen.add(question["question_key"])
+                deck.append(dict(question))
+
+        # Heavily skewed weights can starve the rejection loop; top up from what is left
+        if len(deck) < count:
+            rest = [q for c in categories for q in self._pool[c] if q["question_key"] not in seen]
+            deck.extend(dict(q) for q in self.rng.sample(rest, count - len(deck)))
+        return deck
+
+    def record_answer(self, user_id, question, score):
+        """Move the student's category rating and the question's rating toward the observed score"""
+        key = question.get("question_key")
+        category = question.get("category")
+        if not user_id or key not in self._question_ratings or category not in self._pool:
+            return
+        outcome = min(max(score / 100.0, 0.0), 1.0)
+
+        with self._lock:
+            student = self._student(user_id).setdefault(category, [float(STUDENT_START), 0])
+            item = self._question_ratings[key]
+            surprise = outcome - expected_score(student[0], item[0])
+            student[0] += k_factor(student[1]) * surprise
+            item[0] -= k_factor(item[1]) * surprise
+            student[1] += 1
+            item[1] += 1
+            student_rating, student_answers = student
+            question_rating, question_answers = item
+            # The question's weight changed in every band; rebuild the student's band now
+            # and the others when they are next drawn from
+            self._tables[category] = [None] * self._bands
+            self._table(category, self._band(student_rating))
+
+        self.db.save_answer_ratings(user_id, category, student_rating, student_answers,
+                                    key, question_rating, question_answers)
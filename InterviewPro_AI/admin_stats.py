@@ -0,0 +1,18 @@
+"""
+InterviewPro AI - Admin Statistics Backfill
+Rebuilds the admin rollups (admin_daily_stats, admin_counters) from history.
+They are kept up to date as users register and sessions complete; run this
+after importing data or repairing sessions by hand.
+
+Usage: python admin_stats.py
+"""
+
+if __name__ == "__main__":
+    from models import Database
+
+    database = Database()
+    if database.rebuild_admin_stats():
+        stats = database.get_admin_stats()
+        print(f"✅ Rebuilt admin stats: {stats['total_students']} students, "
+              f"{stats['total_interviews']} interviews, {stats['avg_score']:.1f}% average")
+    database.close()
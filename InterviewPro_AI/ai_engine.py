@@ -8,6 +8,8 @@ import json
 import random
 import re
 
+from metrics import timed
+
 # Try to import OpenAI
 try:
     from openai import OpenAI
@@ -20,6 +22,9 @@ except ImportError:
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 OPENAI_MODEL = "gpt-3.5-turbo"
 
+# Points a question is worth by difficulty
+DIFFICULTY_POINTS = {"easy": 10, "medium": 15, "hard": 20}
+
 # Question bank by category and difficulty
 QUESTION_BANK = {
     "data_structures": {
@@ -151,10 +156,8 @@ QUESTION_BANK = {
 }
 
 
-def generate_questions(topics, interest, count=5):
-    """Generate interview questions based on selected topics and role interest"""
-    questions = []
-    
+def resolve_categories(topics, interest):
+    """Map selected topics (or the role interest when none are selected) to question bank categories"""
     # Parse topics - handle various formats
     if not topics or topics == "all" or (isinstance(topics, str) and topics.lower() == "all"):
         # If no specific topics or "all" selected, use interest-based categories
@@ -203,6 +206,15 @@ def generate_questions(topics, interest, count=5):
             else:
                 categories.append(topic)  # Use as-is
     
+    return categories
+
+
+@timed("ai")
+def generate_questions(topics, interest, count=5):
+    """Generate interview questions based on selected topics and role interest"""
+    questions = []
+    categories = resolve_categories(topics, interest)
+    
     # Calculate how many categories to use and questions per category
     num_categories = min(len(categories), max(2, (count + 1) // 2))
     selected_categories = categories[:num_categories]
@@ -226,7 +238,7 @@ def generate_questions(topics, interest, count=5):
                         "question": q["q"],
                         "ideal_answer": q["a"],
                         "keywords": q["keywords"],
-                        "points": {"easy": 10, "medium": 15, "hard": 20}[difficulty]
+                        "points": DIFFICULTY_POINTS[difficulty]
                     })
         
         # Shuffle and select specific number
@@ -239,6 +251,7 @@ def generate_questions(topics, interest, count=5):
     return questions[:count]
 
 
+@timed("ai")
 def evaluate_answer(question_data, user_answer):
     """Evaluate user answer and provide accurate feedback"""
     ideal_answer = question_data.get("ideal_answer", "")
@@ -420,6 +433,7 @@ def evaluate_answer(question_data, user_answer):
     }
 
 
+@timed("ai")
 def generate_follow_up(question_data, user_answer):
     """Generate follow-up questions based on user's answer"""
     score = evaluate_answer(question_data, user_answer).get("score", 0)
@@ -445,6 +459,7 @@ def generate_follow_up(question_data, user_answer):
     return follow_ups.get(category, "Can you elaborate on your answer with more details?")
 
 
+@timed("ai")
 def get_ai_evaluation(question, user_answer, api_key=None):
     """Get AI-powered evaluation using OpenAI"""
     if not OPENAI_AVAILABLE or not api_key:
@@ -501,6 +516,7 @@ Format your response as JSON:
         return None
 
 
+@timed("ai")
 def get_learning_recommendation(weak_categories):
     """Get learning recommendations based on weak areas"""
     recommendations = {
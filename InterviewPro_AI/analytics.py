@@ -0,0 +1,140 @@
+"""
+InterviewPro AI - Student Analytics
+Materialized per-student analytics built from grouped SQL aggregates
+"""
+
+import math
+
+# Weeks of history kept in the cached weekly trend
+TREND_WEEKS = 12
+
+# Category averages below this are weak areas, at or above STRONG_SCORE strengths
+WEAK_SCORE = 60
+STRONG_SCORE = 75
+
+
+def empty_analytics():
+    return {"sessions": 0, "score_sum": 0.0, "best_score": 0.0, "seconds": 0, "questions": 0,
+            "weeks": {}, "types": {}}
+
+
+def _add_bucket(buckets, key, total, count):
+    bucket = buckets.setdefault(key, {"sum": 0.0, "count": 0})
+    bucket["sum"] += float(total or 0)
+    bucket["count"] += int(count or 0)
+
+
+def merge_aggregates(payload, aggregates):
+    """Fold grouped aggregates (see Database.aggregate_student_history) into a cached payload"""
+    for week in aggregates["weeks"]:
+        key = str(week["week"])
+        bucket = payload["weeks"].setdefault(key, {"score_sum": 0.0, "sessions": 0, "seconds": 0, "questions": 0})
+        bucket["score_sum"] += float(week["score_sum"] or 0)
+        bucket["sessions"] += int(week["sessions"] or 0)
+        bucket["seconds"] += int(week["seconds"] or 0)
+        bucket["questions"] += int(week["questions"] or 0)
+        payload["sessions"] += int(week["sessions"] or 0)
+        payload["score_sum"] += float(week["score_sum"] or 0)
+        payload["seconds"] += int(week["seconds"] or 0)
+        payload["questions"] += int(week["questions"] or 0)
+        payload["best_score"] = max(payload["best_score"], float(week["best_score"] or 0))
+
+    for row in aggregates["answers"]:
+        _add_bucket(payload["types"], row["question_type"], row["score_sum"], row["answers"])
+
+    # Keep the weekly trend bounded
+    for key in sorted(payload["weeks"])[:-TREND_WEEKS]:
+        del payload["weeks"][key]
+    return payload
+
+
+def _average(bucket):
+    return round(bucket["sum"] / bucket["count"], 1) if bucket["count"] else 0
+
+
+def category_summary(rows):
+    """Mean, standard deviation and sample size per category from student_category_stats rows"""
+    summary = []
+    for row in rows:
+        count = int(row["answers"])
+        if not count:
+            continue
+        mean = float(row["score_sum"]) / count
+        variance = max(float(row["score_sq_sum"]) / count - mean * mean, 0.0)
+        summary.append({
+            "category": row["category"],
+            "answers": count,
+            "mean": round(mean, 1),
+            "stddev": round(math.sqrt(variance), 1),
+            "last_seen_at": row["last_seen_at"],
+        })
+    return sorted(summary, key=lambda c: c["mean"])
+
+
+def weak_categories(summary, limit=3):
+    """Lowest-scoring categories below WEAK_SCORE"""
+    return [c["category"] for c in summary if c["mean"] < WEAK_SCORE][:limit]
+
+
+def strong_categories(summary, limit=3):
+    """Highest-scoring categories at or above STRONG_SCORE"""
+    return [c["category"] for c in reversed(summary) if c["mean"] >= STRONG_SCORE][:limit]
+
+
+def category_label(category):
+    return category.replace("_", " ").title()
+
+
+def build_view(payload, categories=()):
+    """Turn a cached payload (and a category summary) into the values the analytics page renders"""
+    weekly_progress = [
+        {"day": f"W{key[-2:]}",
+         "score": round(week["score_sum"] / week["sessions"], 1) if week["sessions"] else 0}
+        for key, week in sorted(payload["weeks"].items())[-7:]
+    ]
+    skills_breakdown = [
+        {"skill": category_label(question_type), "score": _average(bucket)}
+        for question_type, bucket in sorted(payload["types"].items())
+    ]
+
+    return {
+        "total_interviews": payload["sessions"],
+        "avg_score": round(payload["score_sum"] / payload["sessions"], 1) if payload["sessions"] else 0,
+        "best_score": round(payload["best_score"], 1),
+        "avg_duration_minutes": round(payload["seconds"] / payload["sessions"] / 60) if payload["sessions"] else 0,
+        "avg_seconds_per_question": round(payload["seconds"] / payload["questions"]) if payload["questions"] else 0,
+        "weekly_progress": weekly_progress,
+        "skills_breakdown": skills_breakdown,
+        "improvement_areas": [category_label(c) for c in weak_categories(categories)],
+        "strengths": [category_label(c) for c in strong_categories(categories)],
+    }
+
+
+class AnalyticsCache:
+    """Per-student analytics cache, rebuilt on a miss and updated as sessions complete"""
+
+    def __init__(self, database):
+        self.db = database
+
+    def get(self, user_id):
+        """Analytics view for a student: one cached row read in the common case"""
+        payload = self.db.get_analytics_cache(user_id)
+        if payload is None:
+            payload = self.rebuild(user_id)
+        return build_view(payload, category_summary(self.db.get_category_stats(user_id)))
+
+    def rebuild(self, user_id):
+        """Recompute a student's analytics from all of their history"""
+        payload = merge_aggregates(empty_analytics(), self.db.aggregate_student_history(user_id))
+        self.db.save_analytics_cache(user_id, payload)
+        return payload
+
+    def session_completed(self, user_id, session_id):
+        """Fold just one completed session into the cached analytics"""
+        payload = self.db.get_analytics_cache(user_id)
+        if payload is None:
+            # Nothing cached yet; a full rebuild already includes this session
+            self.rebuild(user_id)
+            return
+        merge_aggregates(payload, self.db.aggregate_student_history(user_id, session_id=session_id))
+        self.db.save_analytics_cache(user_id, payload)
@@ -3,11 +3,33 @@ InterviewPro AI - Main Flask Application
 Technical Interview Preparation Platform
 """
 
-from flask import Flask, render_template, request, session, redirect, url_for, jsonify
+from flask import Flask, render_template, request, session, redirect, url_for, jsonify, Response, stream_with_context, g
 import os
 from datetime import datetime, timedelta
-from models import db
+from models import db, Database
+from ranking import rank_index
+from events import broadcaster
+from tournaments import TournamentEngine, public_deck
+from xp import XpLedger
+from activity import ActivityTracker
+from challenges import ChallengeEngine, SPEED_LIMIT_SECONDS, question_type_of
+from analytics import AnalyticsCache, category_summary, weak_categories, WEAK_SCORE
+from adaptive import QuestionSelector
+from spaced_repetition import ReviewScheduler, REVIEW_GRADES
+from timing import ResponseTimes, timing_key
+from calibration import CalibrationJob
+from write_behind import SessionWriteBuffer
+from archive import HistoryArchive
+from export import stream_export, available_formats, DATASETS as EXPORT_DATASETS, FORMATS as EXPORT_FORMATS
+from question_import import QuestionImporter, import_format
+from search import QuestionSearch
+from identity import IdentityCache
+from dashboard import DashboardLoader
+import metrics
+import tracing
+from querylog import query_log
 import random
+import itertools
 import base64
 from io import BytesIO
 from PIL import Image
@@ -15,6 +37,18 @@ from PIL import Image
 app = Flask(__name__)
 app.secret_key = "xxxx"
 
+# Per-route latency and per-request database / AI call counts, served at /metrics
+metrics.instrument_app(app)
+
+# Span trees for a sample of requests, written to traces/ or an OTLP collector
+tracing.instrument_app(app)
+
+# Slow statements are logged with their parameters; repeated ones flag N+1 patterns
+query_log.instrument_app(app)
+
+# Bearer token a Prometheus scraper can use instead of an admin session
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
 # Daily Challenges Data
 DAILY_CHALLENGES = [
     {"id": 1, "title": "Morning Brain Boost", "description": "Complete 3 technical questions", "type": "technical", "count": 3, "xp_reward": 50},
@@ -43,10 +77,94 @@ try:
 except Exception as e:
     print(f"⚠️ Database initialization warning: {e}")
 
+# Build the leaderboard rank index from stored scores
+rank_index.rebuild(db.get_leaderboard_rows())
+
+# Rows shown on the leaderboard page and pushed to its live subscribers
+LEADERBOARD_SIZE = 10
+_rank_moves = itertools.count()
+
+
+def publish_rank_move(user_id, old_rank, new_rank, points):
+    """Broadcast a rank move, plus a fresh top-K snapshot when it touches the top K"""
+    # Moves are never coalesced: every subscriber replays them in order to shift its own rank
+    broadcaster.publish("leaderboard", ("move", next(_rank_moves)), {
+        "type": "move", "user_id": user_id, "from": old_rank, "to": new_rank, "xp": points,
+        "to_next": rank_index.rank_of(user_id)[2]})
+    if min(old_rank or new_rank, new_rank) <= LEADERBOARD_SIZE:
+        broadcaster.publish("leaderboard", "top", {"type": "top", "rows": rank_index.top(LEADERBOARD_SIZE)})
+
+
+# Push rank changes to live leaderboard subscribers
+rank_index.add_listener(publish_rank_move)
+
+# Channels clients may subscribe to via /events/<channel>
+EVENT_CHANNELS = {"leaderboard", "tournaments"}
+
+# Daily practice activity, one bit per user per day
+activity = ActivityTracker(db)
+
+# XP is recorded in a durable ledger, flushed in batches on its own connection
+xp_ledger = XpLedger(Database())
+xp_ledger.add_listener(rank_index.add_points)
+xp_ledger.start()
+
+# Evaluations and session updates are written behind, in batches on their own connection;
+# flushing a session refreshes db's snapshot so the reads that follow see it
+session_writes = SessionWriteBuffer(Database(), reader=db)
+session_writes.start()
+
+# Tournament rounds are opened, closed and scored on a separate connection;
+# registrations and submissions get one each of their own
+tournament_engine = TournamentEngine(
+    Database(),
+    registrations=Database(),
+    submissions=Database(),
+    on_standings=lambda tournament_id, round_number, standings: broadcaster.publish(
+        "tournaments", ("standings", tournament_id),
+        {"tournament_id": tournament_id, "round": round_number, "standings": standings}),
+    award_xp=xp_ledger.award,
+    get_xp=xp_ledger.get_xp)
+tournament_engine.start()
+
+# Daily challenges advance from interview events and pay out XP when reached
+challenge_engine = ChallengeEngine(DAILY_CHALLENGES, db, award_xp=xp_ledger.award)
+
+# Per-student analytics, cached and folded forward as sessions complete
+analytics_cache = AnalyticsCache(db)
+
+# Adaptive question selection from per-student and per-question ratings
+question_selector = QuestionSelector(db)
+
+# Full-text question search over the question bank and database questions
+question_search = QuestionSearch()
+question_search.add_question_bank()
+question_search.refresh(db)
+
+# Spaced repetition schedule for category practice
+review_scheduler = ReviewScheduler(db)
+
+# Time-to-answer histograms per question, student and interview
+response_times = ResponseTimes(db)
+
+# Difficulty calibration from per-question answer statistics
+calibration_job = CalibrationJob(db)
+
+# Session history moved out of MySQL by archive.py, read back for /progress
+history_archive = HistoryArchive(db)
+
+# The logged in user and student profile, one joined query cached briefly per process
+identity_cache = IdentityCache(db)
+db.add_profile_listener(identity_cache.invalidate)
+
+# Dashboard reads run concurrently on a small pool of their own connections
+dashboard_loader = DashboardLoader(Database, identity_cache)
+
 # Import AI functions
 try:
     from ai_engine import (
         generate_questions,
+        resolve_categories,
         evaluate_answer,
         generate_follow_up,
         get_learning_recommendation
@@ -63,11 +181,54 @@ def is_logged_in():
     """Check if user is logged in"""
     return session.get("user_id") is not None
 
+def get_identity():
+    """(user, student) for the logged in user, loaded at most once per request"""
+    if not is_logged_in():
+        return None, None
+    if "identity" not in g:
+        g.identity = identity_cache.get(session.get("user_id"))
+    return g.identity
+
 def get_current_user():
     """Get current logged in user"""
-    if is_logged_in():
-        return db.get_user_by_id(session.get("user_id"))
-    return None
+    return get_identity()[0]
+
+def get_current_student():
+    """Get the logged in user's student profile"""
+    return get_identity()[1]
+
+
+def record_practice(user_id):
+    """Mark today as a practice day and feed the new streak to the challenge engine"""
+    activity.record(user_id)
+    challenge_engine.record_streak(user_id, activity.summary(user_id)["streak"])
+
+
+def record_question_time(q_index, skipped=False):
+    """Close the timer started when question q_index was shown"""
+    shown = session.get("interview_shown_at")
+    now = datetime.now().timestamp()
+    shown_at = shown["at"] if shown and shown["index"] == q_index else now
+    times = session.get("interview_times", [])
+    times.append({"shown_at": shown_at, "answered_at": now,
+                  "seconds": round(now - shown_at, 1), "skipped": skipped})
+    session["interview_times"] = times
+
+
+def record_question_stats(question, score, skipped=False):
+    """Fold an answer or skip into the question's running statistics"""
+    db.record_question_attempt(timing_key(question),
+                               question.get("question") or question.get("question_text"),
+                               question.get("category") or question.get("category_id"),
+                               question.get("difficulty"),
+                               score,
+                               skipped)
+
+
+@app.context_processor
+def inject_nav_xp():
+    """Make the logged in user's XP available to every template"""
+    return {"nav_xp": xp_ledger.get_xp(session.get("user_id")) if is_logged_in() else 0}
 
 # ==================== ROUTES ====================
 
@@ -97,6 +258,7 @@ def register():
         if user_id:
             # Create student profile
             db.create_student(user_id, year, department, None, target_role, experience)
+            rank_index.add_user(user_id, f"{first_name} {last_name}")
             
             # Auto login
             session["user_id"] = user_id
@@ -149,19 +311,15 @@ def dashboard():
     if not is_logged_in():
         return redirect(url_for("login"))
     
-    user_id = session.get("user_id")
-    student = db.get_student_by_user_id(user_id)
-    sessions = db.get_student_sessions(user_id, limit=5)
-    achievements = db.get_user_achievements(user_id)
-    
-    # Get all achievements to show progress
-    all_achievements = db.get_all_achievements()
+    view = dashboard_loader.load(session.get("user_id"))
+    g.identity = (view["user"], view["student"])
     
     return render_template("dashboard.html", 
-                           student=student, 
-                           sessions=sessions,
-                           achievements=achievements,
-                           all_achievements=all_achievements)
+                           student=view["student"], 
+                           sessions=view["sessions"],
+                           achievements=view["achievements"],
+                           all_achievements=view["all_achievements"],
+                           focus_areas=view["focus_areas"])
 
 
 @app.route("/start-interview", methods=["GET", "POST"])
@@ -177,12 +335,14 @@ def start_interview():
         question_count = int(request.form.get("question_count", 5))
         
         # Get student info for personalized questions
-        student = db.get_student_by_user_id(session.get("user_id"))
+        student = get_current_student()
         skills = student.get("target_role", "SDE") if student else "SDE"
         
-        # Generate questions using AI
+        # Pick questions adaptively from the student's weak areas and skill level
         if AI_AVAILABLE:
-            questions = generate_questions(skills, skills, question_count)
+            questions = question_selector.select(session.get("user_id"),
+                                                 resolve_categories(skills, skills),
+                                                 question_count)
         else:
             # Fallback questions
             questions = db.get_random_questions(question_count, session_type, difficulty)
@@ -198,6 +358,9 @@ def start_interview():
         session["interview_type"] = session_type
         session["interview_difficulty"] = difficulty
         session["interview_target_role"] = target_role
+        session["interview_started_at"] = datetime.now().timestamp()
+        session["interview_times"] = []
+        session.pop("interview_shown_at", None)
         
         # Create session in database
         session_id = db.create_interview_session(
@@ -240,6 +403,8 @@ def interview():
             else:
                 evaluation = {"score": 70, "feedback": "Good attempt!", "strengths": ["Answered"], "improvements": ["Add details"]}
             
+            record_question_time(q_index)
+            
             # Store answer and evaluation
             answers = session.get("interview_answers", [])
             answers.append({
@@ -248,6 +413,24 @@ def interview():
                 "evaluation": evaluation
             })
             session["interview_answers"] = answers
+            if session.get("current_session_id"):
+                # Question bank, fallback and AI questions (id missing or 0) are saved without an id,
+                # under their question type
+                session_writes.save_evaluation(
+                    session["current_session_id"],
+                    current_question.get("id") or None,
+                    question_type_of(current_question),
+                    answer,
+                    evaluation.get("score", 0),
+                    evaluation.get("feedback", ""),
+                    ", ".join(evaluation.get("strengths", [])),
+                    ", ".join(evaluation.get("improvements", [])),
+                    ", ".join(evaluation.get("keywords_found", [])),
+                    ", ".join(evaluation.get("keywords_missing", [])))
+            record_practice(session.get("user_id"))
+            challenge_engine.record_answer(session.get("user_id"), current_question)
+            question_selector.record_answer(session.get("user_id"), current_question, evaluation.get("score", 0))
+            record_question_stats(current_question, evaluation.get("score", 0))
             
             # Update score
             current_score = session.get("interview_score", 0)
@@ -262,6 +445,11 @@ def interview():
         
         return redirect(url_for("interview"))
     
+    # Start this question's timer on first display; reloads keep the original time
+    shown = session.get("interview_shown_at")
+    if not shown or shown["index"] != q_index:
+        session["interview_shown_at"] = {"index": q_index, "at": datetime.now().timestamp()}
+    
     # Calculate time remaining (5 minutes per question)
     time_limit = current_question.get("estimated_time", 5) * 60
     
@@ -282,6 +470,8 @@ def skip_question():
     questions = session.get("interview_questions", [])
     
     if questions and q_index < len(questions):
+        record_question_time(q_index, skipped=True)
+        
         # Store skipped question
         answers = session.get("interview_answers", [])
         answers.append({
@@ -291,6 +481,8 @@ def skip_question():
         })
         session["interview_answers"] = answers
         session["interview_q_index"] = q_index + 1
+        question_selector.record_answer(session.get("user_id"), questions[q_index], 0)
+        record_question_stats(questions[q_index], 0, skipped=True)
     
     return redirect(url_for("interview"))
 
@@ -312,30 +504,36 @@ def interview_result():
     max_score = sum(q.get("points", 10) for q in questions)
     percentage = (total_score / max_score * 100) if max_score > 0 else 0
     
+    # Calculate category performance
+    category_scores = {}
+    for i, ans in enumerate(answers):
+        if i < len(questions):
+            category = questions[i].get("category", "unknown")
+            category_scores.setdefault(category, []).append(ans.get("evaluation", {}).get("score", 0))
+    
+    category_performance = {cat: sum(scores) / len(scores) for cat, scores in category_scores.items()}
+    
     # Update database
     session_id = session.get("current_session_id")
     if session_id:
-        db.update_interview_session(session_id, completed=True, score=total_score)
+        session_writes.update_interview_session(session_id, answers=answers, completed=True,
+                                                score=total_score, category_scores=category_scores,
+                                                question_times=session.get("interview_times"))
+        response_times.record_session(session.get("user_id"), questions, session.get("interview_times", []))
         db.update_student_stats(session.get("user_id"), total_score)
+        analytics_cache.session_completed(session.get("user_id"), session_id)
+        rank_index.record_interview(session.get("user_id"), total_score, session.get("first_name"))
         db.check_and_award_achievements(session.get("user_id"))
     
-    # Calculate category performance
-    category_scores = {}
-    for i, ans in enumerate(answers):
-        if i < len(questions):
-            category = questions[i].get("category", "unknown")
-            score = ans.get("evaluation", {}).get("score", 0)
-            if category not in category_scores:
-                category_scores[category] = {"total": 0, "count": 0}
-            category_scores[category]["total"] += score
-            category_scores[category]["count"] += 1
-    
-    category_performance = {}
-    for cat, data in category_scores.items():
-        category_performance[cat] = data["total"] / data["count"] if data["count"] > 0 else 0
-    
-    # Determine weak areas for recommendations
-    weak_areas = [cat for cat, score in category_performance.items() if score < 60]
+    started_at = session.get("interview_started_at")
+    challenge_engine.record_interview_completed(
+        session.get("user_id"),
+        datetime.now().timestamp() - started_at if started_at else None)
+    
+    # Weak areas come from the student's history across sessions, falling back to this session
+    weak_areas = weak_categories(category_summary(db.get_category_stats(session.get("user_id"))))
+    if not weak_areas:
+        weak_areas = [cat for cat, score in category_performance.items() if score < WEAK_SCORE]
     recommendations = get_learning_recommendation(weak_areas) if weak_areas else []
     
     # Clear session data
@@ -344,6 +542,9 @@ def interview_result():
     session.pop("interview_q_index", None)
     session.pop("interview_score", None)
     session.pop("current_session_id", None)
+    session.pop("interview_started_at", None)
+    session.pop("interview_times", None)
+    session.pop("interview_shown_at", None)
     
     return render_template("result.html",
                            answers=answers,
@@ -361,14 +562,21 @@ def progress():
         return redirect(url_for("login"))
     
     user_id = session.get("user_id")
-    student = db.get_student_by_user_id(user_id)
-    sessions = db.get_student_sessions(user_id, limit=20)
+    student = get_current_student()
+    archived = request.args.get("archived") == "1"
+    if archived:
+        sessions, next_cursor = history_archive.get_sessions_page(user_id, after=request.args.get("after"))
+    else:
+        sessions, next_cursor = db.get_sessions_page(student_id=user_id, after=request.args.get("after"))
     achievements = db.get_user_achievements(user_id)
     
     return render_template("progress.html",
                            student=student,
                            sessions=sessions,
-                           achievements=achievements)
+                           achievements=achievements,
+                           next_cursor=next_cursor,
+                           archived=archived,
+                           has_archive=not archived and not next_cursor and history_archive.has_sessions())
 
 
 @app.route("/practice")
@@ -387,8 +595,22 @@ def practice_category(category_id):
     if not is_logged_in():
         return redirect(url_for("login"))
     
-    questions = db.get_questions_by_category(category_id, limit=20)
-    return render_template("practice_category.html", questions=questions, category_id=category_id)
+    questions = review_scheduler.practice_queue(session.get("user_id"), category_id)
+    return render_template("practice_category.html",
+                           questions=questions,
+                           category_id=category_id,
+                           review_grades=REVIEW_GRADES)
+
+
+@app.route("/practice/review/<int:question_id>", methods=["POST"])
+def practice_review(question_id):
+    """Grade recall of a practice question and schedule its next review"""
+    if not is_logged_in():
+        return redirect(url_for("login"))
+    
+    if review_scheduler.review(session.get("user_id"), question_id, request.form.get("grade")):
+        record_practice(session.get("user_id"))
+    return redirect(url_for("practice_category", category_id=request.form.get("category_id", type=int, default=0)))
 
 
 # ==================== NEW FEATURES ====================
@@ -399,25 +621,40 @@ def leaderboard():
     if not is_logged_in():
         return redirect(url_for("login"))
     
-    # Get top students (using mock data for demo)
-    leaderboard_data = [
-        {"rank": 1, "name": "Alex Chen", "xp": 2450, "interviews": 45, "avatar": "🎯"},
-        {"rank": 2, "name": "Sarah Kim", "xp": 2280, "interviews": 42, "avatar": "🚀"},
-        {"rank": 3, "name": "Mike Johnson", "xp": 2100, "interviews": 38, "avatar": "💻"},
-        {"rank": 4, "name": "Emma Davis", "xp": 1950, "interviews": 35, "avatar": "⭐"},
-        {"rank": 5, "name": "James Wilson", "xp": 1800, "interviews": 32, "avatar": "🔥"},
-        {"rank": 6, "name": "Lisa Park", "xp": 1650, "interviews": 29, "avatar": "💡"},
-        {"rank": 7, "name": "David Brown", "xp": 1500, "interviews": 26, "avatar": "⚡"},
-        {"rank": 8, "name": "Sophie Turner", "xp": 1380, "interviews": 24, "avatar": "🌟"},
-    ]
+    leaderboard_data = rank_index.top(LEADERBOARD_SIZE)
     
-    current_user_xp = 750  # Mock user XP
-    current_user_rank = 12
+    current_user_rank, current_user_xp, xp_to_next_rank = rank_index.rank_of(session.get("user_id")) or (None, 0, 0)
     
     return render_template("leaderboard.html", 
                            leaderboard=leaderboard_data,
                            current_user_xp=current_user_xp,
-                           current_user_rank=current_user_rank)
+                           current_user_rank=current_user_rank,
+                           xp_to_next_rank=xp_to_next_rank,
+                           current_user_id=session.get("user_id"))
+
+
+@app.route("/leaderboard/me")
+def leaderboard_me():
+    """Current user's rank, used by the live leaderboard to resync after a gap"""
+    if not is_logged_in():
+        return jsonify({"error": "Login required"}), 401
+    
+    rank, xp, to_next = rank_index.rank_of(session.get("user_id")) or (None, 0, 0)
+    return jsonify({"rank": rank, "xp": xp, "to_next": to_next})
+
+
+@app.route("/events/<channel>")
+def event_stream(channel):
+    """Server-Sent Events stream of live leaderboard / tournament updates"""
+    if not is_logged_in():
+        return redirect(url_for("login"))
+    
+    if channel not in EVENT_CHANNELS:
+        return jsonify({"error": "Unknown channel"}), 404
+    
+    return Response(stream_with_context(broadcaster.stream(channel)),
+                    mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 @app.route("/challenges")
@@ -429,15 +666,16 @@ def challenges():
     user_id = session.get("user_id")
     today = datetime.now().strftime("%Y-%m-%d")
     
-    # Get user's completed challenges for today
-    completed_challenges = session.get("completed_challenges", [])
-    user_xp = session.get("xp", 0)
-    streak = session.get("streak", 0)
+    # Challenges complete themselves from interview events
+    challenge_progress, completed_challenges = challenge_engine.status(user_id)
+    user_xp = xp_ledger.get_xp(user_id)
+    streak = activity.summary(user_id)["streak"]
     
     quote = random.choice(QUOTES)
     
     return render_template("challenges.html",
                            challenges=DAILY_CHALLENGES,
+                           challenge_progress=challenge_progress,
                            completed_challenges=completed_challenges,
                            today=today,
                            user_xp=user_xp,
@@ -445,25 +683,6 @@ def challenges():
                            quote=quote)
 
 
-@app.route("/challenges/complete/<int:challenge_id>")
-def complete_challenge(challenge_id):
-    """Mark a challenge as complete"""
-    if not is_logged_in():
-        return redirect(url_for("login"))
-    
-    challenge = next((c for c in DAILY_CHALLENGES if c["id"] == challenge_id), None)
-    
-    if challenge:
-        completed = session.get("completed_challenges", [])
-        if challenge_id not in completed:
-            completed.append(challenge_id)
-            session["completed_challenges"] = completed
-            session["xp"] = session.get("xp", 0) + challenge["xp_reward"]
-            session["streak"] = session.get("streak", 0) + 1
-    
-    return redirect(url_for("challenges"))
-
-
 @app.route("/assessment", methods=["GET", "POST"])
 def assessment():
     """Skills assessment quiz"""
@@ -480,7 +699,8 @@ def assessment():
         percentage = (score / total) * 100
         
         # Update user XP
-        session["xp"] = session.get("xp", 0) + percentage
+        xp_ledger.award(session.get("user_id"), percentage, "assessment")
+        record_practice(session.get("user_id"))
         
         return render_template("assessment_result.html", 
                                score=score, 
@@ -530,41 +750,9 @@ def analytics():
     if not is_logged_in():
         return redirect(url_for("login"))
     
-    user_id = session.get("user_id")
-    sessions = db.get_student_sessions(user_id, limit=20)
-    
-    # Calculate statistics
-    total_interviews = len(sessions)
-    avg_score = sum(s.percentage for s in sessions) / total_interviews if total_interviews > 0 else 0
-    
-    # Mock chart data
-    weekly_progress = [
-        {"day": "Mon", "score": 65},
-        {"day": "Tue", "score": 72},
-        {"day": "Wed", "score": 68},
-        {"day": "Thu", "score": 80},
-        {"day": "Fri", "score": 75},
-        {"day": "Sat", "score": 85},
-        {"day": "Sun", "score": 78},
-    ]
-    
-    skills_breakdown = [
-        {"skill": "Technical", "score": 82},
-        {"skill": "Behavioral", "score": 75},
-        {"skill": "Coding", "score": 68},
-        {"skill": "System Design", "score": 70},
-    ]
+    stats = analytics_cache.get(session.get("user_id"))
     
-    improvement_areas = ["System Design", "Coding Speed", "Data Structure Questions"]
-    strengths = ["Problem Analysis", "Communication", "Behavioral Questions"]
-    
-    return render_template("analytics.html",
-                           total_interviews=total_interviews,
-                           avg_score=round(avg_score, 1),
-                           weekly_progress=weekly_progress,
-                           skills_breakdown=skills_breakdown,
-                           improvement_areas=improvement_areas,
-                           strengths=strengths)
+    return render_template("analytics.html", **stats)
 
 
 @app.route("/xp")
@@ -573,7 +761,7 @@ def xp_details():
     if not is_logged_in():
         return redirect(url_for("login"))
     
-    user_xp = session.get("xp", 750)
+    user_xp = xp_ledger.get_xp(session.get("user_id"))
     level = user_xp // 500 + 1
     xp_to_next = 500 - (user_xp % 500)
     
@@ -596,6 +784,18 @@ def xp_details():
         {"name": "Resume Expert", "icon": "📄", "xp": 100, "desc": "Build 5 resumes"},
     ]
     
+    # Streak badges come straight from the activity bitmap, Speed Demon from answer times
+    streaks = activity.summary(session.get("user_id"))
+    answer_times = response_times.student_summary(session.get("user_id"))
+    for badge in all_badges:
+        if badge["name"] == "Week Warrior":
+            badge["earned"] = streaks["longest_streak"] >= 7
+        elif badge["name"] == "Streak Legend":
+            badge["earned"] = streaks["longest_streak"] >= 30
+        elif badge["name"] == "Speed Demon":
+            fastest = answer_times["fastest_interview"]
+            badge["earned"] = fastest is not None and fastest < SPEED_LIMIT_SECONDS
+    
     earned_xp = user_xp
     total_possible = sum(b["xp"] for b in all_badges)
     
@@ -605,79 +805,43 @@ def xp_details():
                            xp_to_next=xp_to_next,
                            badges=all_badges,
                            earned_xp=earned_xp,
-                           total_possible=total_possible)
+                           total_possible=total_possible,
+                           streaks=streaks)
 
 
 # ==================== TOURNAMENTS ====================
 
+REGISTRATION_MESSAGES = {
+    "registered": "You're in! Good luck.",
+    "already_registered": "You're already registered for this tournament.",
+    "full": "Sorry, this tournament is full or registration has closed.",
+    "insufficient_xp": "You don't have enough XP to pay the entry fee.",
+    "unavailable": "Registration is unavailable right now. Please try again later.",
+}
+
+
 @app.route("/tournaments")
 def tournaments():
     """Tournaments page"""
     if not is_logged_in():
         return redirect(url_for("login"))
     
-    tournaments_list = [
-        {
-            "id": 1,
-            "name": "Weekly Championship",
-            "icon": "🏆",
-            "description": "Compete against other candidates for the top spot!",
-            "type": "featured",
-            "entry_fee": 0,
-            "prize_pool": "5000 XP",
-            "participants": 127,
-            "start_date": "Saturday, 8:00 PM",
-            "duration": "2 hours",
-            "status": "open"
-        },
-        {
-            "id": 2,
-            "name": "Technical Focus",
-            "icon": "🎯",
-            "description": "Data structures & algorithms intensive tournament.",
-            "type": "technical",
-            "entry_fee": "500 XP",
-            "prize_pool": "3000 XP",
-            "participants": 64,
-            "start_date": "Tomorrow, 7:00 PM",
-            "duration": "1.5 hours",
-            "status": "open"
-        },
-        {
-            "id": 3,
-            "name": "Behavioral Round",
-            "icon": "💬",
-            "description": "Master soft skills and behavioral questions.",
-            "type": "behavioral",
-            "entry_fee": 0,
-            "prize_pool": "2000 XP",
-            "participants": 89,
-            "start_date": "Friday, 6:00 PM",
-            "duration": "1 hour",
-            "status": "open"
-        },
-        {
-            "id": 4,
-            "name": "System Design",
-            "icon": "🏗️",
-            "description": "Complex system design challenges.",
-            "type": "advanced",
-            "entry_fee": "1000 XP",
-            "prize_pool": "8000 XP",
-            "participants": 32,
-            "start_date": "Next Sunday",
-            "duration": "3 hours",
-            "status": "coming_soon"
-        },
-    ]
+    tournaments_list = db.get_tournaments()
+    for tournament in tournaments_list:
+        start_at = tournament.get("start_at")
+        tournament["start_date"] = start_at.strftime("%a, %d %b %I:%M %p") if start_at else "TBA"
+        if tournament["status"] == "running":
+            tournament["standings"] = db.get_tournament_standings(tournament["id"], limit=5)
     
-    user_xp = session.get("xp", 0)
-    my_registrations = []  # User's registered tournaments
+    user_xp = xp_ledger.get_xp(session.get("user_id"))
+    my_registrations = db.get_user_tournament_ids(session.get("user_id"))
+    message = REGISTRATION_MESSAGES.get(request.args.get("registration"))
     
     return render_template("tournaments.html",
                            tournaments=tournaments_list,
                            user_xp=user_xp,
-                           registrations=my_registrations)
+                           registrations=my_registrations,
+                           message=message)
 
 
 @app.route("/tournaments/register/<int:tournament_id>")
@@ -686,8 +850,55 @@ def tournament_register(tournament_id):
     if not is_logged_in():
         return redirect(url_for("login"))
     
-    # In a real app, handle registration logic
-    return redirect(url_for("tournaments"))
+    result = tournament_engine.register(tournament_id, session.get("user_id"))
+    if result == "registered":
+        tournament = db.get_tournament(tournament_id)
+        if tournament:
+            broadcaster.publish("tournaments", ("participants", tournament_id),
+                                {"tournament_id": tournament_id, "participants": tournament["participants"]})
+    
+    return redirect(url_for("tournaments", registration=result))
+
+
+@app.route("/tournaments/<int:tournament_id>/round", methods=["GET", "POST"])
+def tournament_round(tournament_id):
+    """Play the currently open round of a tournament"""
+    if not is_logged_in():
+        return redirect(url_for("login"))
+    
+    user_id = session.get("user_id")
+    tournament = db.get_tournament(tournament_id)
+    round_row = db.get_open_round(tournament_id)
+    
+    if not tournament or not round_row or not db.is_registered_for_tournament(tournament_id, user_id):
+        return redirect(url_for("tournaments"))
+    
+    if request.method == "POST":
+        answers = [request.form.get(f"answer_{i}", "").strip() for i in range(len(round_row["deck"]))]
+        submitted = tournament_engine.submit(tournament_id, user_id, answers)
+        return render_template("tournament_round.html",
+                               tournament=tournament,
+                               round=round_row,
+                               questions=public_deck(round_row["deck"]),
+                               time_left=0,
+                               submitted=submitted)
+    
+    time_left = max(0, int((round_row["ends_at"] - datetime.now()).total_seconds()))
+    return render_template("tournament_round.html",
+                           tournament=tournament,
+                           round=round_row,
+                           questions=public_deck(round_row["deck"]),
+                           time_left=time_left,
+                           submitted=False)
+
+
+@app.route("/tournaments/<int:tournament_id>/standings")
+def tournament_standings(tournament_id):
+    """Current standings of a tournament"""
+    if not is_logged_in():
+        return redirect(url_for("login"))
+    
+    return jsonify(db.get_tournament_standings(tournament_id, limit=50))
 
 
 # ==================== SKILL TREE ====================
@@ -795,8 +1006,7 @@ def submit_peer_review(review_id):
     if not is_logged_in():
         return redirect(url_for("login"))
     
-    # In a real app, save the review and award XP
-    session["xp"] = session.get("xp", 0) + 25
+    xp_ledger.award(session.get("user_id"), 25, "peer_review", f"review:{review_id}")
     
     return redirect(url_for("peer_review"))
 
@@ -1382,19 +1592,125 @@ def admin_dashboard():
         return redirect(url_for("admin"))
     
     stats = db.get_admin_stats()
-    students = db.get_all_students()
+    filters = {
+        "sort": request.args.get("sort", "interviews"),
+        "order": request.args.get("order", "desc"),
+        "level": request.args.get("level", ""),
+    }
+    students, next_cursor = db.get_students_page(sort=filters["sort"],
+                                                 descending=filters["order"] != "asc",
+                                                 experience_level=filters["level"] or None,
+                                                 after=request.args.get("after"))
+    
+    return render_template("admin_dashboard.html",
+                           stats=stats,
+                           students=students,
+                           filters=filters,
+                           next_cursor=next_cursor,
+                           export_datasets=EXPORT_DATASETS,
+                           export_formats=available_formats())
+
+
+@app.route("/admin/export/<dataset>.<fmt>")
+def admin_export(dataset, fmt):
+    """Stream a bulk export as a chunked download"""
+    if not session.get("role") == "admin":
+        return redirect(url_for("admin"))
+    
+    if dataset not in EXPORT_DATASETS or fmt not in available_formats():
+        return jsonify({"error": "Unknown export"}), 404
     
-    return render_template("admin_dashboard.html", stats=stats, students=students)
+    filename = f"interviewpro_{dataset}_{datetime.now():%Y%m%d}.{fmt}"
+    return Response(stream_export(dataset, fmt), mimetype=EXPORT_FORMATS[fmt],
+                    headers={"Content-Disposition": f"attachment; filename={filename}"})
+
+
+@app.route("/admin/sessions")
+def admin_sessions():
+    """Browse interview sessions"""
+    if not session.get("role") == "admin":
+        return redirect(url_for("admin"))
+    
+    filters = {
+        "student_id": request.args.get("student_id", type=int),
+        "status": request.args.get("status", ""),
+    }
+    sessions, next_cursor = db.get_sessions_page(student_id=filters["student_id"],
+                                                 status=filters["status"] or None,
+                                                 after=request.args.get("after"))
+    
+    return render_template("admin_sessions.html",
+                           sessions=sessions,
+                           filters=filters,
+                           next_cursor=next_cursor)
+
+
+@app.route("/admin/evaluations")
+def admin_evaluations():
+    """Browse answer evaluations"""
+    if not session.get("role") == "admin":
+        return redirect(url_for("admin"))
+    
+    session_id = request.args.get("session_id", type=int)
+    if session_id:
+        session_writes.flush_session(session_id)
+    evaluations, next_cursor = db.get_evaluations_page(session_id=session_id,
+                                                       after=request.args.get("after"))
+    
+    return render_template("admin_evaluations.html",
+                           evaluations=evaluations,
+                           session_id=session_id,
+                           next_cursor=next_cursor)
 
 
 @app.route("/admin/questions")
-def admin_questions():
+def admin_questions(import_report=None):
     """Manage questions"""
     if not session.get("role") == "admin":
         return redirect(url_for("admin"))
     
     categories = db.get_question_categories()
-    return render_template("admin_questions.html", categories=categories)
+    return render_template("admin_questions.html",
+                           categories=categories,
+                           timing_outliers=response_times.estimate_outliers(),
+                           mislabeled=calibration_job.mislabeled(),
+                           calibrated=request.args.get("calibrated", type=int),
+                           import_report=import_report)
+
+
+@app.route("/admin/questions/import", methods=["POST"])
+def admin_import_questions():
+    """Bulk import questions from an uploaded CSV, JSON or YAML file"""
+    if not session.get("role") == "admin":
+        return redirect(url_for("admin"))
+    
+    upload = request.files.get("questions_file")
+    fmt = import_format(upload.filename if upload else None)
+    if not fmt:
+        report = {"inserted": 0, "duplicates": 0,
+                  "errors": [(0, "upload a .csv, .json, .jsonl or .yaml file")]}
+    else:
+        # The import is one transaction on its own connection, never mixed with other requests' writes
+        database = Database()
+        try:
+            report = QuestionImporter(database).run(upload.stream, fmt,
+                                                    dry_run=bool(request.form.get("dry_run")))
+        finally:
+            database.close()
+        if report["inserted"] and not request.form.get("dry_run"):
+            question_search.refresh(db)
+    report["dry_run"] = bool(request.form.get("dry_run"))
+    return admin_questions(import_report=report)
+
+
+@app.route("/admin/questions/calibrate", methods=["POST"])
+def admin_calibrate_questions():
+    """Recalibrate questions whose statistics changed since the last run"""
+    if not session.get("role") == "admin":
+        return redirect(url_for("admin"))
+    
+    processed = calibration_job.run()
+    return redirect(url_for("admin_questions", calibrated=processed))
 
 
 @app.route("/admin/questions/add", methods=["POST"])
@@ -1412,8 +1728,9 @@ def admin_add_question():
     points = int(request.form.get("points", 10))
     estimated_time = int(request.form.get("estimated_time", 5))
     
-    db.add_question(category_id, question_type, difficulty, question_text, 
-                   ideal_answer, keywords, points, estimated_time)
+    if db.add_question(category_id, question_type, difficulty, question_text, 
+                       ideal_answer, keywords, points, estimated_time):
+        question_search.refresh(db)
     
     return redirect(url_for("admin_questions"))
 
@@ -1438,6 +1755,16 @@ def admin_stats():
     return jsonify(stats)
 
 
+@app.route("/metrics")
+def metrics_endpoint():
+    """Prometheus metrics, for admins or a scraper holding METRICS_TOKEN"""
+    token_ok = METRICS_TOKEN and request.headers.get("Authorization") == f"Bearer {METRICS_TOKEN}"
+    if not token_ok and session.get("role") != "admin":
+        return jsonify({"error": "Admin access required"}), 403
+    
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
 # ==================== API ROUTES ====================
 
 @app.route("/api/questions")
@@ -1451,6 +1778,30 @@ def api_get_questions():
     return jsonify(questions)
 
 
+@app.route("/api/questions/search")
+def api_search_questions():
+    """Full-text question search, filtered by category and difficulty"""
+    if not is_logged_in():
+        return jsonify({"error": "Login required"}), 401
+    
+    results = question_search.search(request.args.get("q", ""),
+                                     category=request.args.get("category"),
+                                     difficulty=request.args.get("difficulty"),
+                                     limit=min(request.args.get("limit", 20, type=int), 100))
+    return jsonify({"results": results})
+
+
+@app.route("/api/questions/autocomplete")
+def api_autocomplete_questions():
+    """Question suggestions for a partly typed query"""
+    if not is_logged_in():
+        return jsonify({"error": "Login required"}), 401
+    
+    return jsonify(question_search.autocomplete(request.args.get("q", ""),
+                                                category=request.args.get("category"),
+                                                difficulty=request.args.get("difficulty")))
+
+
 @app.route("/api/evaluate", methods=["POST"])
 def api_evaluate():
     """API to evaluate answer"""
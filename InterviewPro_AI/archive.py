@@ -0,0 +1,247 @@
+"""
+InterviewPro AI - History Archival
+Exports monthly partitions of interview_sessions and evaluations that fall
+outside the retention window to gzip-compressed JSONL, then drops them
+
+Usage: python archive.py [retention_months]
+"""
+
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+
+from pagination import encode_cursor, decode_cursor
+
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive"))
+
+# Whole months of history kept in MySQL, not counting the current one
+RETENTION_MONTHS = 12
+
+# Monthly partitions kept ready ahead of the current month
+MONTHS_AHEAD = 2
+
+TABLES = ("interview_sessions", "evaluations")
+
+TIME_COLUMNS = ("started_at", "completed_at", "evaluated_at")
+
+# Rows per gzip member; a read decompresses only the members holding the rows it needs
+ARCHIVE_BLOCK_ROWS = 256
+
+# Session archive indexes kept in memory; the least recently read is evicted first
+MAX_CACHED_INDEXES = 24
+
+
+def add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def to_json(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8")
+    return str(value)
+
+
+def from_archive(row):
+    """An archived row with its timestamps parsed back into datetimes"""
+    for column in TIME_COLUMNS:
+        if row.get(column):
+            row[column] = datetime.fromisoformat(row[column])
+    return row
+
+
+class HistoryArchive:
+    """Moves old session history to compressed files and reads it back"""
+
+    def __init__(self, database, directory=ARCHIVE_DIR, retention_months=RETENTION_MONTHS):
+        self.db = database
+        self.directory = directory
+        self.retention_months = retention_months
+        self._lock = threading.Lock()
+        self._indexes = OrderedDict()   # archive path -> session index, least recently read first
+
+    def ensure_partitions(self, today=None):
+        """Create monthly partitions through MONTHS_AHEAD months from now"""
+        first = (today or date.today()).replace(day=1)
+        horizon = add_months(first, MONTHS_AHEAD + 1)
+        for table in TABLES:
+            partitions = self.db.get_partitions(table)
+            if not partitions:
+                continue
+            ends = [p["range_end"].date() for p in partitions if p["range_end"]]
+            month = max(ends) if ends else first
+            months = []
+            while month < horizon:
+                months.append((f"p{month:%Y%m}", add_months(month, 1)))
+                month = add_months(month, 1)
+            self.db.add_month_partitions(table, months)
+
+    def run(self, today=None):
+        """Archive every partition that ends on or before the retention cutoff"""
+        self.ensure_partitions(today)
+        cutoff = add_months((today or date.today()).replace(day=1), -self.retention_months)
+        count = 0
+        for table in TABLES:
+            previous = self.db.get_archived_partitions(table)
+            archived = {p["partition_name"] for p in previous}
+            range_start = previous[0]["range_end"] if previous else None
+            for partition in self.db.get_partitions(table):
+                range_end = partition["range_end"]
+                if range_end is None or range_end.date() > cutoff:
+                    break
+                name = partition["partition_name"]
+                if name in archived:
+                    # Exported and recorded on an earlier run whose drop failed
+                    path, rows = self._path(table, name), partition["table_rows"]
+                else:
+                    path, rows = self.export(table, name)
+                if self.db.drop_archived_partition(table, name, path, rows, range_start, range_end):
+                    count += 1
+                range_start = range_end
+        print(f"✅ Archived {count} partitions older than {cutoff:%Y-%m}")
+        return count
+
+    def export(self, table, partition):
+        """Write a partition to <directory>/<table>/<partition>.jsonl.gz; returns (path, rows)
+
+        The file is a series of gzip members of ARCHIVE_BLOCK_ROWS rows each, so it still
+        reads as one gzip stream. Session archives also get a <path>.index file (see _index).
+        """
+        path = self._path(table, partition)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        index = {"blocks": [], "students": {}}
+        rows = 0
+        with open(path + ".tmp", "wb") as raw:
+            block = []
+            for row in self.db.iter_partition_rows(table, partition):
+                if table == "interview_sessions":
+                    index["students"].setdefault(str(row["student_id"]), []).append(
+                        [to_json(row["started_at"]), row["id"], len(index["blocks"])])
+                block.append(json.dumps(row, default=to_json, separators=(",", ":")) + "\n")
+                rows += 1
+                if len(block) == ARCHIVE_BLOCK_ROWS:
+                    self._write_block(raw, block, index)
+                    block = []
+            if block or not rows:
+                self._write_block(raw, block, index)
+        if table == "interview_sessions":
+            self._write_index(path, index)
+        os.replace(path + ".tmp", path)
+        return path, rows
+
+    @staticmethod
+    def _write_block(raw, lines, index):
+        index["blocks"].append(raw.tell())
+        with gzip.GzipFile(fileobj=raw, mode="wb") as member:
+            member.write("".join(lines).encode("utf-8"))
+
+    @staticmethod
+    def _write_index(path, index):
+        # Newest first, the order pages are read in
+        for entries in index["students"].values():
+            entries.sort(reverse=True)
+        with open(path + ".index.tmp", "w", encoding="utf-8") as out:
+            json.dump(index, out, separators=(",", ":"))
+        os.replace(path + ".index.tmp", path + ".index")
+
+    def _path(self, table, partition):
+        return os.path.join(self.directory, table, f"{partition}.jsonl.gz")
+
+    def _index(self, path):
+        """Session index of an archive file: block offsets, and per student the
+        (started_at, id, block) of each session, newest first"""
+        with self._lock:
+            index = self._indexes.get(path)
+            if index is not None:
+                self._indexes.move_to_end(path)
+                return index
+        if os.path.exists(path + ".index"):
+            with open(path + ".index", encoding="utf-8") as source:
+                index = json.load(source)
+        else:
+            index = self._build_index(path)
+        with self._lock:
+            self._indexes[path] = index
+            while len(self._indexes) > MAX_CACHED_INDEXES:
+                self._indexes.popitem(last=False)
+        return index
+
+    def _build_index(self, path):
+        """Index an archive written before exports were blocked: the whole file is one block"""
+        index = {"blocks": [0], "students": {}}
+        with gzip.open(path, "rt", encoding="utf-8") as lines:
+            for line in lines:
+                row = json.loads(line)
+                index["students"].setdefault(str(row["student_id"]), []).append(
+                    [row["started_at"], row["id"], 0])
+        try:
+            self._write_index(path, index)
+        except OSError as e:
+            print(f"⚠️ Could not save archive index for {path}: {e}")
+        return index
+
+    @staticmethod
+    def _read_blocks(path, blocks, wanted):
+        """Decompress only the wanted blocks of an archive; returns {block: [row, ...]}"""
+        rows = {}
+        with open(path, "rb") as raw:
+            for block in sorted(wanted):
+                raw.seek(blocks[block])
+                end = blocks[block + 1] if block + 1 < len(blocks) else None
+                data = raw.read(end - blocks[block]) if end is not None else raw.read()
+                rows[block] = [json.loads(line) for line in gzip.decompress(data).splitlines()]
+        return rows
+
+    def has_sessions(self):
+        return bool(self.db.get_archived_partitions("interview_sessions"))
+
+    def get_sessions_page(self, student_id, after=None, limit=20):
+        """One page of a student's archived sessions, newest first; returns (sessions, next_cursor)"""
+        position = decode_cursor(after)
+        if position:
+            position = (datetime.fromisoformat(position[0]), position[1])
+        sessions = []
+        # Archives cover disjoint time ranges, newest first, so stop once a page is filled
+        for archived in self.db.get_archived_partitions("interview_sessions"):
+            if len(sessions) > limit:
+                break
+            if position and archived["range_start"] and archived["range_start"] > position[0]:
+                continue
+            index = self._index(archived["path"])
+            wanted = {}   # (started_at, id) -> block
+            for started_at, session_id, block in index["students"].get(str(student_id), ()):
+                if len(sessions) + len(wanted) > limit:
+                    break
+                if not position or (datetime.fromisoformat(started_at), session_id) < position:
+                    wanted[(started_at, session_id)] = block
+            if not wanted:
+                continue
+            blocks = self._read_blocks(archived["path"], index["blocks"], set(wanted.values()))
+            for rows in blocks.values():
+                for row in rows:
+                    if row["student_id"] == student_id and (row["started_at"], row["id"]) in wanted:
+                        sessions.append(from_archive(row))
+
+        sessions.sort(key=lambda s: (s["started_at"], s["id"]), reverse=True)
+        if len(sessions) > limit:
+            sessions = sessions[:limit]
+            return sessions, encode_cursor(sessions[-1]["started_at"], sessions[-1]["id"])
+        return sessions, None
+
+
+if __name__ == "__main__":
+    import sys
+    from models import Database
+
+    database = Database()
+    months = int(sys.argv[1]) if len(sys.argv) > 1 else RETENTION_MONTHS
+    HistoryArchive(database, retention_months=months).run()
+    database.close()
@@ -0,0 +1,101 @@
+"""
+InterviewPro AI - Question Difficulty Calibration
+Re-estimates question difficulty from running answer statistics
+
+Usage: python calibration.py
+"""
+
+import math
+from datetime import timedelta
+
+from timing import percentiles
+
+JOB_NAME = "question_calibration"
+
+# Questions need this many attempts (answers + skips) before they are judged
+MIN_ATTEMPTS = 10
+
+# Effective mean score (skips count as zero) at or above which a question is easy / medium
+EASY_SCORE = 70
+MEDIUM_SCORE = 45
+
+# Seconds the watermark stays behind the database clock, so rows written by
+# transactions still in flight when a run reads are picked up by the next one
+COMMIT_LAG = 5
+
+
+def estimate_difficulty(score_sum, answers, skips):
+    """Difficulty implied by the observed scores, or None with too little data"""
+    attempts = answers + skips
+    if attempts < MIN_ATTEMPTS:
+        return None
+    effective = score_sum / attempts
+    if effective >= EASY_SCORE:
+        return "easy"
+    if effective >= MEDIUM_SCORE:
+        return "medium"
+    return "hard"
+
+
+def describe(row):
+    """Mean, standard deviation and skip rate for a question_stats row"""
+    answers, skips = row["answers"], row["skips"]
+    mean = row["score_sum"] / answers if answers else 0.0
+    variance = max(row["score_sq_sum"] / answers - mean * mean, 0.0) if answers else 0.0
+    return {
+        "mean": round(mean, 1),
+        "stddev": round(math.sqrt(variance), 1),
+        "skip_rate": round(skips / (answers + skips), 2) if answers + skips else 0.0,
+    }
+
+
+class CalibrationJob:
+    """Recalibrates only the questions whose statistics changed since the last run"""
+
+    def __init__(self, database):
+        self.db = database
+
+    def run(self, now=None):
+        """Recalibrate questions changed up to now, by default the database clock"""
+        # Start a fresh read so rows committed since this connection last read are seen
+        self.db.end_snapshot()
+        now = now or self.db.get_database_time()
+        if now is None:
+            return 0
+        now -= timedelta(seconds=COMMIT_LAG)
+        watermark = self.db.get_job_watermark(JOB_NAME)
+        if watermark and watermark >= now:
+            return 0
+        rows = self.db.get_question_stats_since(watermark, now)
+        if rows:
+            histograms = {}
+            for bucket in self.db.get_response_time_buckets("question", [r["question_key"] for r in rows]):
+                histograms.setdefault(bucket["scope_key"], {})[bucket["bucket"]] = bucket["samples"]
+            self.db.save_question_calibration([
+                (estimate_difficulty(r["score_sum"], r["answers"], r["skips"]),
+                 percentiles(histograms.get(r["question_key"], {}), (50,))["p50"],
+                 r["question_key"])
+                for r in rows
+            ])
+        self.db.set_job_watermark(JOB_NAME, now)
+        print(f"✅ Calibrated {len(rows)} questions changed since {watermark or 'the beginning'}")
+        return len(rows)
+
+    def mislabeled(self, limit=50):
+        """Questions whose estimated difficulty differs from their label"""
+        rows = self.db.get_mislabeled_questions(limit)
+        for row in rows:
+            row.update(describe(row))
+        return rows
+
+
+if __name__ == "__main__":
+    from models import Database
+
+    database = Database()
+    job = CalibrationJob(database)
+    job.run()
+    for question in job.mislabeled():
+        print(f"⚠️ Labeled {question['labeled_difficulty']}, looks {question['estimated_difficulty']} "
+              f"(mean {question['mean']}, skips {question['skip_rate']:.0%}): {question['question_text']}")
+    database.close()
@@ -0,0 +1,119 @@
+"""
+InterviewPro AI - Daily Challenge Engine
+Per-user daily challenge progress driven by interview events
+"""
+
+import threading
+from datetime import date
+
+# Interviews finished faster than this count toward "speed" challenges
+SPEED_LIMIT_SECONDS = 5 * 60
+
+# Fallback question type for question bank categories without a question_type
+CATEGORY_TYPES = {
+    "algorithms": "coding",
+    "data_structures": "coding",
+    "behavioral": "behavioral",
+    "system_design": "system_design",
+}
+
+
+def question_type_of(question):
+    """Question type used for challenge matching"""
+    return question.get("question_type") or CATEGORY_TYPES.get(question.get("category"), "technical")
+
+
+class DailyProgress:
+    """One user's challenge counters for a single day"""
+    __slots__ = ("day", "counts", "completed")
+
+    def __init__(self, day, counts=None, completed=None):
+        self.day = day
+        self.counts = counts or {}
+        self.completed = completed or set()
+
+
+class ChallengeEngine:
+    """Routes events to the challenges they can advance and completes them at their threshold"""
+
+    def __init__(self, challenges, database, award_xp=None):
+        self.db = database
+        self.award_xp = award_xp
+        self.challenges = {c["id"]: c for c in challenges}
+        # Event key -> challenges it advances, so an event only touches its own challenges
+        self._by_event = {}
+        for challenge in challenges:
+            self._by_event.setdefault(self._event_key(challenge["type"]), []).append(challenge)
+        self._lock = threading.Lock()
+        self._progress = {}
+
+    @staticmethod
+    def _event_key(challenge_type):
+        if challenge_type == "speed":
+            return "interview_completed"
+        if challenge_type == "streak":
+            return "streak"
+        return f"answer:{challenge_type}"
+
+    def _get_progress(self, user_id, today):
+        progress = self._progress.get(user_id)
+        if progress is None or progress.day != today:
+            # New day (or first event in this process): start from what is stored for today
+            rows = self.db.get_challenge_progress(user_id, today)
+            progress = DailyProgress(
+                today,
+                {row["challenge_id"]: row["progress"] for row in rows},
+                {row["challenge_id"] for row in rows if row["completed_at"]},
+            )
+            self._progress[user_id] = progress
+        return progress
+
+    def _apply(self, user_id, event_key, amount=1, absolute=False, today=None):
+        challenges = self._by_event.get(event_key)
+        if not challenges or not user_id:
+            return []
+        today = today or date.today()
+
+        newly_completed, writes = [], []
+        with self._lock:
+            progress = self._get_progress(user_id, today)
+            for challenge in challenges:
+                cid = challenge["id"]
+                if cid in progress.completed:
+                    continue
+                count = max(progress.counts.get(cid, 0), amount) if absolute else progress.counts.get(cid, 0) + amount
+                progress.counts[cid] = count
+                done = count >= challenge["count"]
+                if done:
+                    progress.completed.add(cid)
+                    newly_completed.append(challenge)
+                writes.append((user_id, today, cid, count, done))
+
+        if writes:
+            self.db.save_challenge_progress(writes)
+        for challenge in newly_completed:
+            if self.award_xp:
+                self.award_xp(user_id, challenge["xp_reward"], "daily_challenge",
+                              f"challenge:{challenge['id']}:{today.isoformat()}")
+        return newly_completed
+
+    def record_answer(self, user_id, question):
+        """An answered interview question"""
+        return self._apply(user_id, f"answer:{question_type_of(question)}")
+
+    def record_interview_completed(self, user_id, duration_seconds):
+        """A finished interview; fast ones advance speed challenges"""
+        if duration_seconds is None or duration_seconds >= SPEED_LIMIT_SECONDS:
+            return []
+        return self._apply(user_id, "interview_completed")
+
+    def record_streak(self, user_id, streak):
+        """The user's current practice streak in days"""
+        return self._apply(user_id, "streak", amount=streak, absolute=True)
+
+    def status(self, user_id, today=None):
+        """Today's progress and completed challenge IDs for a user"""
+        today = today or date.today()
+        with self._lock:
+            progress = self._get_progress(user_id, today)
+            return dict(progress.counts), set(progress.completed)
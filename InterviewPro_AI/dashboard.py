@@ -0,0 +1,73 @@
+"""
+InterviewPro AI - Dashboard Loader
+Runs the dashboard's independent reads at the same time on a small pool of
+connections and returns them as one view model
+"""
+
+import contextvars
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from analytics import category_summary, WEAK_SCORE
+from querylog import query_log
+
+# Connections (and worker threads) shared by all dashboard requests; one per read
+POOL_SIZE = 5
+
+# Weak categories shown as focus areas
+FOCUS_AREAS = 3
+
+
+class DashboardLoader:
+    """Loads everything /dashboard shows; it takes about as long as the slowest read"""
+
+    def __init__(self, database_factory, identity_cache, pool_size=POOL_SIZE):
+        """database_factory(autocommit=True) opens one pooled connection.
+
+        Pooled connections live for the whole process, so they run in autocommit: under
+        REPEATABLE READ a connection that never ends its transaction keeps reading the
+        snapshot from its first query, and identity misses read here would refill the
+        identity cache with that stale profile.
+        """
+        self.identity_cache = identity_cache
+        self._connections = queue.Queue()
+        for _ in range(pool_size):
+            self._connections.put(database_factory(autocommit=True))
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="dashboard")
+
+    def load(self, user_id):
+        """View model for a student's dashboard"""
+        reads = {
+            "identity": lambda database: self.identity_cache.get(user_id, database),
+            "sessions": lambda database: database.get_student_sessions(user_id, limit=5),
+            "achievements": lambda database: database.get_user_achievements(user_id),
+            "all_achievements": lambda database: database.get_all_achievements(),
+            "category_stats": lambda database: database.get_category_stats(user_id),
+        }
+        # Each read runs in a copy of this request's context, so it is traced with it, and
+        # counts its statements separately; the counts are merged back here
+        futures = {name: self._executor.submit(contextvars.copy_context().run,
+                                               query_log.run_counted, self._run, read)
+                   for name, read in reads.items()}
+        results = {}
+        for name, future in futures.items():
+            results[name], counts = future.result()
+            query_log.merge(counts)
+
+        user, student = results["identity"]
+        return {
+            "user": user,
+            "student": student,
+            "sessions": results["sessions"],
+            "achievements": results["achievements"],
+            "all_achievements": results["all_achievements"],
+            "focus_areas": [c for c in category_summary(results["category_stats"])
+                            if c["mean"] < WEAK_SCORE][:FOCUS_AREAS],
+        }
+
+    def _run(self, read):
+        database = self._connections.get()
+        try:
+            return read(database)
+        finally:
+            self._connections.put(database)
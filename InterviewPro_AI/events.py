@@ -0,0 +1,103 @@
+"""
+InterviewPro AI - Live Event Broadcasting
+Server-Sent Events fan-out for leaderboard and tournament updates
+"""
+
+import json
+import queue
+import threading
+import time
+
+
+class EventBroadcaster:
+    """Single publisher that coalesces bursts and fans out to SSE subscribers"""
+
+    def __init__(self, flush_interval=0.5, queue_size=50, heartbeat=15):
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self._lock = threading.Lock()
+        self._pending = {}       # channel -> {key: latest payload}
+        self._subscribers = {}   # channel -> set of subscriber queues
+        self._has_pending = threading.Event()
+        self._thread = None
+
+    def _ensure_publisher(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="event-publisher", daemon=True)
+            self._thread.start()
+
+    def publish(self, channel, key, payload):
+        """Queue an update; later updates for the same key replace earlier ones"""
+        with self._lock:
+            if not self._subscribers.get(channel):
+                return
+            self._pending.setdefault(channel, {})[key] = payload
+            self._ensure_publisher()
+        self._has_pending.set()
+
+    def subscribe(self, channel):
+        """Register a new subscriber queue on a channel"""
+        subscriber = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, channel, subscriber):
+        """Remove a subscriber queue from a channel"""
+        with self._lock:
+            self._subscribers.get(channel, set()).discard(subscriber)
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+    def _run(self):
+        while True:
+            self._has_pending.wait()
+            # Let a burst of updates accumulate before broadcasting
+            time.sleep(self.flush_interval)
+            self._has_pending.clear()
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                targets = {channel: list(self._subscribers.get(channel, ()))
+                           for channel in pending}
+
+            for channel, updates in pending.items():
+                # Encode once per flush, shared by every subscriber
+                message = f"event: {channel}\ndata: {json.dumps(list(updates.values()), default=str)}\n\n"
+                for subscriber in targets[channel]:
+                    self._offer(subscriber, message)
+
+    @staticmethod
+    def _offer(subscriber, message):
+        try:
+            subscriber.put_nowait(message)
+        except queue.Full:
+            # Slow client: drop its oldest message rather than block the publisher
+            try:
+                subscriber.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                pass
+
+    def stream(self, channel):
+        """Generator of SSE messages for one client connection"""
+        subscriber = self.subscribe(channel)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    yield subscriber.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(channel, subscriber)
+
+
+# Global broadcaster instance
+broadcaster = EventBroadcaster()
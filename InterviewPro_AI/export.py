@@ -0,0 +1,148 @@
+"""
+InterviewPro AI - Bulk Export
+Streams sessions, evaluations and students as CSV, NDJSON or Parquet in
+fixed-size batches, so memory stays flat however large the export is
+
+Usage: python export.py <sessions|evaluations|students> <csv|ndjson|parquet> <output_file>
+"""
+
+import csv
+import io
+import json
+from decimal import Decimal
+
+from archive import to_json
+from models import Database, EXPORT_QUERIES
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Rows fetched from MySQL and encoded per chunk (one Parquet row group)
+EXPORT_BATCH = 5000
+
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+DATASETS = tuple(EXPORT_QUERIES)
+
+# Parquet column types per dataset, following schema.sql. Declared rather than inferred:
+# a column that is NULL throughout the first batch says nothing about its type.
+# ENUM, TEXT and JSON columns are text; DECIMAL columns are doubles.
+_SESSION_COLUMNS = {
+    "id": "int", "student_id": "int", "session_type": "text", "difficulty": "text",
+    "target_role": "text", "questions_asked": "text", "answers_given": "text",
+    "question_times": "text", "total_score": "int", "max_score": "int", "percentage": "double",
+    "status": "text", "started_at": "timestamp", "completed_at": "timestamp",
+}
+_EVALUATION_COLUMNS = {
+    "id": "int", "session_id": "int", "question_id": "int", "question_type": "text",
+    "answer_text": "text", "score": "double", "max_score": "double", "feedback": "text",
+    "strengths": "text", "improvements": "text", "keywords_found": "text",
+    "keywords_missing": "text", "evaluated_at": "timestamp",
+}
+_STUDENT_COLUMNS = {
+    "user_id": "int", "year": "int", "department": "text", "cgpa": "double",
+    "target_role": "text", "experience_level": "text", "total_interviews": "int",
+    "avg_score": "double", "total_score": "int", "created_at": "timestamp",
+    "updated_at": "timestamp", "email": "text", "first_name": "text", "last_name": "text",
+    "registered_at": "timestamp",
+}
+PARQUET_COLUMNS = {
+    "sessions": _SESSION_COLUMNS,
+    "evaluations": _EVALUATION_COLUMNS,
+    "students": _STUDENT_COLUMNS,
+}
+
+
+def available_formats():
+    return [fmt for fmt in FORMATS if fmt != "parquet" or PARQUET_AVAILABLE]
+
+
+def plain(value):
+    """A column value as something csv and pyarrow both accept"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8")
+    return value
+
+
+def encode_csv(batches, dataset):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for index, (columns, rows) in enumerate(batches):
+        if index == 0:
+            writer.writerow(columns)
+        writer.writerows([plain(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def encode_ndjson(batches, dataset):
+    for columns, rows in batches:
+        yield "".join(json.dumps(dict(zip(columns, row)), default=to_json, separators=(",", ":")) + "\n"
+                      for row in rows).encode("utf-8")
+
+
+def parquet_schema(dataset, columns):
+    """Arrow schema for a dataset's columns, in the order the query returned them"""
+    arrow_types = {"int": pa.int64(), "double": pa.float64(), "text": pa.string(),
+                   "timestamp": pa.timestamp("us")}
+    declared = PARQUET_COLUMNS[dataset]
+    # A column added to the table since PARQUET_COLUMNS was written is exported as text
+    return pa.schema([pa.field(column, arrow_types[declared.get(column, "text")])
+                      for column in columns])
+
+
+def encode_parquet(batches, dataset):
+    """One row group per batch, typed by the dataset's declared schema"""
+    sink = io.BytesIO()
+    writer = schema = None
+    for columns, rows in batches:
+        if schema is None:
+            schema = parquet_schema(dataset, columns)
+            writer = pq.ParquetWriter(sink, schema, compression="snappy")
+        data = {column: [plain(row[i]) for row in rows] for i, column in enumerate(columns)}
+        writer.write_table(pa.table(data, schema=schema))
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+    writer.close()
+    yield sink.getvalue()
+
+
+ENCODERS = {"csv": encode_csv, "ndjson": encode_ndjson, "parquet": encode_parquet}
+
+
+def stream_export(dataset, fmt, batch_size=EXPORT_BATCH):
+    """Encoded chunks of an export, read on a connection opened for this export alone"""
+    database = Database()
+    if not database.connection:
+        return
+    try:
+        for chunk in ENCODERS[fmt](database.export_batches(dataset, batch_size), dataset):
+            if chunk:
+                yield chunk
+    finally:
+        # Skips the ping in Database.close, which fails while unread rows are pending
+        database.connection.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 4 or sys.argv[1] not in DATASETS or sys.argv[2] not in available_formats():
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(2)
+    with open(sys.argv[3], "wb") as out:
+        for chunk in stream_export(sys.argv[1], sys.argv[2]):
+            out.write(chunk)
+    print(f"✅ Exported {sys.argv[1]} to {sys.argv[3]}")
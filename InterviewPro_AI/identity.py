@@ -0,0 +1,49 @@
+"""
+InterviewPro AI - Current User Identity
+The logged in user and their student profile, loaded with one joined query
+and cached briefly per process
+"""
+
+import threading
+import time
+
+# Seconds an identity is reused; bounds staleness between processes, which do not share invalidations
+IDENTITY_TTL = 30
+
+# Identities kept per process before the oldest are evicted
+MAX_IDENTITIES = 10000
+
+
+class IdentityCache:
+    """Short-lived per-process cache of (user, student) by user id"""
+
+    def __init__(self, database, ttl=IDENTITY_TTL, max_size=MAX_IDENTITIES):
+        self.db = database
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = {}   # user_id -> (expires_at, user, student), oldest first
+
+    def get(self, user_id, database=None):
+        """(user, student) for a user id; either may be None. Callers get their own copies.
+
+        A miss is read on database when given, for callers holding their own connection.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is None or entry[0] <= now:
+            user, student = (database or self.db).get_identity(user_id)
+            entry = (now + self.ttl, user, student)
+            with self._lock:
+                self._entries.pop(user_id, None)
+                self._entries[user_id] = entry
+                while len(self._entries) > self.max_size:
+                    del self._entries[next(iter(self._entries))]
+        _, user, student = entry
+        return (dict(user) if user else None), (dict(student) if student else None)
+
+    def invalidate(self, user_id):
+        """Forget a user after their account or profile changes"""
+        with self._lock:
+            self._entries.pop(user_id, None)
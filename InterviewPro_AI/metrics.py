@@ -0,0 +1,197 @@
+"""
+InterviewPro AI - Performance Metrics
+Request latency, timed spans around database and AI calls, and per-request
+call counts, exposed in the Prometheus text format
+"""
+
+import bisect
+import functools
+import inspect
+import threading
+import time
+from contextvars import ContextVar
+
+import tracing
+
+# Seconds; covers a cached lookup up to a slow OpenAI completion
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Calls of one kind made while serving a single request
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+# Calls counted for the request being served on this thread, if any
+_request = ContextVar("metrics_request", default=None)
+
+# Start times of render_template calls in progress on this thread
+_renders = threading.local()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in list(zip(names, values)) + list(extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            lines.append(f"{self.name}{_labels(self.labels, label_values)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series = {}   # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((k, list(v)) for k, v in self._series.items())
+        for label_values, counts in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labels, label_values, [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, label_values)} {_number(round(counts[-1], 6))}")
+            lines.append(f"{self.name}_count{_labels(self.labels, label_values)} {cumulative}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram("interviewpro_http_request_duration_seconds",
+                            "Time to produce a response, by route", ("route", "method"))
+REQUESTS = Counter("interviewpro_http_requests_total",
+                   "Responses sent, by route and status", ("route", "method", "status"))
+SPAN_SECONDS = Histogram("interviewpro_span_duration_seconds",
+                         "Time spent in database, AI and template calls", ("kind", "name"))
+SPAN_ERRORS = Counter("interviewpro_span_errors_total",
+                      "Database, AI and template calls that raised", ("kind", "name"))
+REQUEST_CALLS = Histogram("interviewpro_request_calls",
+                          "Database and AI calls made per request, by route", ("route", "kind"),
+                          buckets=COUNT_BUCKETS)
+
+REGISTRY = [REQUEST_SECONDS, REQUESTS, SPAN_SECONDS, SPAN_ERRORS, REQUEST_CALLS]
+
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def record_span(kind, name, seconds, failed=False):
+    SPAN_SECONDS.observe(seconds, kind, name)
+    if failed:
+        SPAN_ERRORS.inc(kind, name)
+    calls = _request.get()
+    if calls is not None:
+        calls[kind] = calls.get(kind, 0) + 1
+
+
+def timed(kind, name=None):
+    """Decorator recording each call as a span of the given kind"""
+    def decorate(func):
+        span = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            traced = tracing.start_span(span, kind)
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                record_span(kind, span, time.perf_counter() - start, failed)
+                tracing.end_span(traced, error=failed)
+        return wrapper
+    return decorate
+
+
+def instrument_methods(cls, kind):
+    """Time every public method of a class; generators are left alone, as their work happens later"""
+    for attr, func in list(vars(cls).items()):
+        if attr.startswith("_") or not inspect.isfunction(func) or inspect.isgeneratorfunction(func):
+            continue
+        setattr(cls, attr, timed(kind, attr)(func))
+    return cls
+
+
+def instrument_app(app):
+    """Record latency, status and per-request call counts for every Flask request"""
+    from flask import request, before_render_template, template_rendered
+
+    def start_request():
+        request.environ["metrics.start"] = time.perf_counter()
+        _request.set({})
+
+    def finish_request(response):
+        start = request.environ.get("metrics.start")
+        if start is None:
+            return response
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        REQUEST_SECONDS.observe(time.perf_counter() - start, route, request.method)
+        REQUESTS.inc(route, request.method, str(response.status_code))
+        calls = _request.get() or {}
+        for kind in ("db", "ai"):
+            REQUEST_CALLS.observe(calls.get(kind, 0), route, kind)
+        return response
+
+    def end_request(exc=None):
+        _request.set(None)
+
+    def template_started(sender, template, context, **extra):
+        if not hasattr(_renders, "stack"):
+            _renders.stack = []
+        name = template.name or "string"
+        _renders.stack.append((time.perf_counter(), tracing.start_span(name, "template")))
+
+    def template_finished(sender, template, context, **extra):
+        if getattr(_renders, "stack", None):
+            start, traced = _renders.stack.pop()
+            record_span("template", template.name or "string", time.perf_counter() - start)
+            tracing.end_span(traced)
+
+    app.before_request(start_request)
+    app.after_request(finish_request)
+    app.teardown_request(end_request)
+    before_render_template.connect(template_started, app)
+    template_rendered.connect(template_finished, app)
@@ -0,0 +1,373 @@
+"""
+InterviewPro AI - Baseline schema
+The tables create_tables() used to create on every startup
+"""
+
+
+def up(m):
+    # Users table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            email VARCHAR(255) NOT NULL UNIQUE,
+            password_hash VARCHAR(255) NOT NULL,
+            role ENUM('student', 'admin', 'mentor') NOT NULL DEFAULT 'student',
+            first_name VARCHAR(100) NOT NULL,
+            last_name VARCHAR(100) NOT NULL,
+            phone VARCHAR(20),
+            is_active BOOLEAN DEFAULT TRUE,
+            is_verified BOOLEAN DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_email (email),
+            INDEX idx_role (role)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Students table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS students (
+            user_id INT PRIMARY KEY,
+            year INT NOT NULL,
+            department VARCHAR(100),
+            cgpa DECIMAL(3,2),
+            target_role VARCHAR(100),
+            experience_level ENUM('beginner', 'intermediate', 'advanced') DEFAULT 'beginner',
+            total_interviews INT DEFAULT 0,
+            avg_score DECIMAL(5,2) DEFAULT 0,
+            total_score INT DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            INDEX idx_interviews (total_interviews),
+            INDEX idx_avg_score (avg_score),
+            INDEX idx_level_interviews (experience_level, total_interviews),
+            INDEX idx_level_score (experience_level, avg_score)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Question categories table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS question_categories (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL UNIQUE,
+            description TEXT,
+            icon VARCHAR(50),
+            difficulty ENUM('easy', 'medium', 'hard', 'all') DEFAULT 'all',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Questions table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS questions (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            category_id INT NOT NULL,
+            question_type ENUM('technical', 'behavioral', 'coding', 'system_design') NOT NULL,
+            difficulty ENUM('easy', 'medium', 'hard') NOT NULL,
+            question_text TEXT NOT NULL,
+            ideal_answer TEXT,
+            keywords TEXT,
+            points INT DEFAULT 10,
+            estimated_time INT DEFAULT 5,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (category_id) REFERENCES question_categories(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Interview sessions table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS interview_sessions (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            student_id INT NOT NULL,
+            session_type ENUM('technical', 'behavioral', 'mixed', 'coding') NOT NULL DEFAULT 'mixed',
+            difficulty ENUM('easy', 'medium', 'hard') DEFAULT 'medium',
+            target_role VARCHAR(100),
+            questions_asked JSON,
+            answers_given JSON,
+            question_times JSON,
+            total_score INT DEFAULT 0,
+            max_score INT DEFAULT 100,
+            percentage DECIMAL(5,2) DEFAULT 0,
+            status ENUM('in_progress', 'completed', 'abandoned') DEFAULT 'in_progress',
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            completed_at TIMESTAMP NULL,
+            FOREIGN KEY (student_id) REFERENCES users(id) ON DELETE CASCADE,
+            INDEX idx_student_started (student_id, started_at),
+            INDEX idx_status_started (status, started_at),
+            INDEX idx_started_at (started_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Evaluations table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS evaluations (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            session_id INT NOT NULL,
+            question_id INT NOT NULL,
+            answer_text TEXT,
+            score DECIMAL(5,2) DEFAULT 0,
+            max_score DECIMAL(5,2) DEFAULT 10,
+            feedback TEXT,
+            strengths TEXT,
+            improvements TEXT,
+            keywords_found TEXT,
+            keywords_missing TEXT,
+            evaluated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES interview_sessions(id) ON DELETE CASCADE,
+            FOREIGN KEY (question_id) REFERENCES questions(id) ON DELETE CASCADE,
+            INDEX idx_session_evaluated (session_id, evaluated_at),
+            INDEX idx_evaluated_at (evaluated_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Achievements table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS achievements (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL UNIQUE,
+            description TEXT,
+            icon VARCHAR(50),
+            category ENUM('interview', 'score', 'streak', 'milestone') NOT NULL,
+            requirement_type VARCHAR(50),
+            requirement_value INT,
+            points INT DEFAULT 10,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # User achievements table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS user_achievements (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            achievement_id INT NOT NULL,
+            earned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            FOREIGN KEY (achievement_id) REFERENCES achievements(id) ON DELETE CASCADE,
+            UNIQUE KEY unique_achievement (user_id, achievement_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Tournaments table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS tournaments (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(150) NOT NULL,
+            description TEXT,
+            icon VARCHAR(50),
+            tournament_type ENUM('featured', 'technical', 'behavioral', 'advanced') NOT NULL DEFAULT 'featured',
+            entry_fee INT DEFAULT 0,
+            prize_pool INT DEFAULT 0,
+            capacity INT NOT NULL DEFAULT 256,
+            participants INT DEFAULT 0,
+            round_count INT DEFAULT 1,
+            questions_per_round INT DEFAULT 5,
+            round_minutes INT DEFAULT 30,
+            start_at DATETIME NOT NULL,
+            status ENUM('coming_soon', 'open', 'running', 'completed') DEFAULT 'open',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_status_start (status, start_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Tournament registrations table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS tournament_registrations (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            tournament_id INT NOT NULL,
+            user_id INT NOT NULL,
+            score INT DEFAULT 0,
+            final_rank INT NULL,
+            registered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (tournament_id) REFERENCES tournaments(id) ON DELETE CASCADE,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            UNIQUE KEY unique_registration (tournament_id, user_id),
+            INDEX idx_standings (tournament_id, score),
+            INDEX idx_user (user_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Tournament rounds table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS tournament_rounds (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            tournament_id INT NOT NULL,
+            round_number INT NOT NULL,
+            deck JSON NOT NULL,
+            starts_at DATETIME NOT NULL,
+            ends_at DATETIME NOT NULL,
+            status ENUM('open', 'closed', 'scored') DEFAULT 'open',
+            FOREIGN KEY (tournament_id) REFERENCES tournaments(id) ON DELETE CASCADE,
+            UNIQUE KEY unique_round (tournament_id, round_number),
+            INDEX idx_status_end (status, ends_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Tournament submissions table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS tournament_submissions (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            round_id INT NOT NULL,
+            user_id INT NOT NULL,
+            answers JSON NOT NULL,
+            score INT NULL,
+            submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (round_id) REFERENCES tournament_rounds(id) ON DELETE CASCADE,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            UNIQUE KEY unique_submission (round_id, user_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # XP ledger table (append-only)
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS xp_ledger (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            amount INT NOT NULL,
+            source VARCHAR(50) NOT NULL,
+            reference_id VARCHAR(100),
+            created_at DATETIME NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            INDEX idx_user (user_id, id),
+            INDEX idx_created_at (created_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Per-user XP rollup table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS user_xp (
+            user_id INT PRIMARY KEY,
+            total_xp INT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Daily activity bitmap table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS user_activity (
+            user_id INT PRIMARY KEY,
+            start_day INT NOT NULL,
+            bitmap VARBINARY(4096) NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Daily challenge progress table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS daily_challenge_progress (
+            user_id INT NOT NULL,
+            challenge_day DATE NOT NULL,
+            challenge_id INT NOT NULL,
+            progress INT NOT NULL DEFAULT 0,
+            completed_at TIMESTAMP NULL,
+            PRIMARY KEY (user_id, challenge_day, challenge_id),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Per-student category aggregates table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS student_category_stats (
+            user_id INT NOT NULL,
+            category VARCHAR(100) NOT NULL,
+            answers INT NOT NULL DEFAULT 0,
+            score_sum DOUBLE NOT NULL DEFAULT 0,
+            score_sq_sum DOUBLE NOT NULL DEFAULT 0,
+            last_seen_at DATETIME NULL,
+            PRIMARY KEY (user_id, category),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Per-question answer statistics table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS question_stats (
+            question_key VARCHAR(64) PRIMARY KEY,
+            question_text VARCHAR(255),
+            category VARCHAR(100),
+            labeled_difficulty ENUM('easy', 'medium', 'hard'),
+            answers INT NOT NULL DEFAULT 0,
+            skips INT NOT NULL DEFAULT 0,
+            score_sum DOUBLE NOT NULL DEFAULT 0,
+            score_sq_sum DOUBLE NOT NULL DEFAULT 0,
+            median_seconds INT NULL,
+            estimated_difficulty ENUM('easy', 'medium', 'hard') NULL,
+            calibrated_at DATETIME NULL,
+            updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+            INDEX idx_updated_at (updated_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Background job watermarks table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS job_watermarks (
+            job_name VARCHAR(50) PRIMARY KEY,
+            watermark DATETIME(6) NOT NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Response time histogram table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS response_time_buckets (
+            scope ENUM('question', 'student', 'interview') NOT NULL,
+            scope_key VARCHAR(64) NOT NULL,
+            bucket SMALLINT NOT NULL,
+            samples INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (scope, scope_key, bucket)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Spaced repetition schedule table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS review_schedule (
+            student_id INT NOT NULL,
+            question_id INT NOT NULL,
+            category_id INT NOT NULL,
+            ease DOUBLE NOT NULL DEFAULT 2.5,
+            interval_days INT NOT NULL DEFAULT 0,
+            repetitions INT NOT NULL DEFAULT 0,
+            due_at DATETIME NOT NULL,
+            last_reviewed_at DATETIME NULL,
+            PRIMARY KEY (student_id, question_id),
+            FOREIGN KEY (student_id) REFERENCES users(id) ON DELETE CASCADE,
+            FOREIGN KEY (question_id) REFERENCES questions(id) ON DELETE CASCADE,
+            INDEX idx_due (student_id, category_id, due_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Per-student category skill ratings table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS student_skill_ratings (
+            user_id INT NOT NULL,
+            category VARCHAR(100) NOT NULL,
+            rating DOUBLE NOT NULL,
+            answers INT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, category),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Question difficulty ratings table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS question_ratings (
+            question_key VARCHAR(64) PRIMARY KEY,
+            rating DOUBLE NOT NULL,
+            answers INT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Per-student analytics cache table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS student_analytics (
+            user_id INT PRIMARY KEY,
+            payload JSON NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
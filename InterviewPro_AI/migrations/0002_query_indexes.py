@@ -0,0 +1,40 @@
+"""
+InterviewPro AI - Query indexes
+Reconciles the indexes of databases built from schema.sql with those built by
+create_tables(), and adds composites for the filters and sorts in models.py
+"""
+
+
+def up(m):
+    # Interview history, admin session pages and dashboard stats read
+    # (student_id | status, started_at) ranges; the single-column indexes are
+    # prefixes of those and completed_at is never filtered on
+    m.add_index("interview_sessions", "idx_student_started", ["student_id", "started_at"])
+    m.add_index("interview_sessions", "idx_status_started", ["status", "started_at"])
+    m.add_index("interview_sessions", "idx_started_at", ["started_at"])
+    m.drop_index("interview_sessions", "idx_student")
+    m.drop_index("interview_sessions", "idx_status")
+    m.drop_index("interview_sessions", "idx_completed_at")
+
+    # Evaluations are always read per session in evaluated_at order
+    m.add_index("evaluations", "idx_session_evaluated", ["session_id", "evaluated_at"])
+    m.add_index("evaluations", "idx_evaluated_at", ["evaluated_at"])
+    m.drop_index("evaluations", "idx_session")
+
+    # Random interview decks filter on is_active, question_type and difficulty;
+    # category practice and reviews on category_id, is_active and difficulty
+    m.add_index("questions", "idx_active_type_difficulty", ["is_active", "question_type", "difficulty"])
+    m.add_index("questions", "idx_category_active_difficulty", ["category_id", "is_active", "difficulty"])
+    m.drop_index("questions", "idx_category")
+    m.drop_index("questions", "idx_type")
+    m.drop_index("questions", "idx_difficulty")
+
+    # Admin student pages sort by interviews or score, optionally within a level
+    m.add_index("students", "idx_interviews", ["total_interviews"])
+    m.add_index("students", "idx_avg_score", ["avg_score"])
+    m.add_index("students", "idx_level_interviews", ["experience_level", "total_interviews"])
+    m.add_index("students", "idx_level_score", ["experience_level", "avg_score"])
+    m.drop_index("students", "idx_experience")
+
+    # The calibration report lists questions with an estimated difficulty
+    m.add_index("question_stats", "idx_estimated_difficulty", ["estimated_difficulty"])
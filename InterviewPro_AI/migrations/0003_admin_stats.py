@@ -0,0 +1,46 @@
+"""
+InterviewPro AI - Admin statistics rollups
+Daily rollup and global counters, seeded from existing history
+"""
+
+
+def up(m):
+    # Per-day admin statistics table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS admin_daily_stats (
+            stat_date DATE PRIMARY KEY,
+            new_students INT NOT NULL DEFAULT 0,
+            sessions_completed INT NOT NULL DEFAULT 0,
+            score_sum DOUBLE NOT NULL DEFAULT 0
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Global admin counters table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS admin_counters (
+            name VARCHAR(50) PRIMARY KEY,
+            value DOUBLE NOT NULL DEFAULT 0
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    m.execute("""
+        INSERT INTO admin_daily_stats (stat_date, sessions_completed, score_sum)
+        SELECT DATE(started_at), COUNT(*), COALESCE(SUM(percentage), 0)
+        FROM interview_sessions WHERE status = 'completed'
+        GROUP BY DATE(started_at)
+        ON DUPLICATE KEY UPDATE sessions_completed = VALUES(sessions_completed),
+            score_sum = VALUES(score_sum)
+    """)
+    m.execute("""
+        INSERT INTO admin_daily_stats (stat_date, new_students)
+        SELECT DATE(created_at), COUNT(*) FROM users WHERE role = 'student'
+        GROUP BY DATE(created_at)
+        ON DUPLICATE KEY UPDATE new_students = VALUES(new_students)
+    """)
+    m.execute("""
+        INSERT INTO admin_counters (name, value)
+        SELECT 'total_students', COALESCE(SUM(new_students), 0) FROM admin_daily_stats
+        UNION ALL SELECT 'total_interviews', COALESCE(SUM(sessions_completed), 0) FROM admin_daily_stats
+        UNION ALL SELECT 'score_sum', COALESCE(SUM(score_sum), 0) FROM admin_daily_stats
+        ON DUPLICATE KEY UPDATE value = VALUES(value)
+    """)
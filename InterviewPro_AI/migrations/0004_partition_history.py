@@ -0,0 +1,70 @@
+"""
+InterviewPro AI - Monthly partitions for session history
+interview_sessions by started_at and evaluations by evaluated_at, one
+partition per month plus p_future for everything past the last boundary
+
+MySQL cannot partition tables that have or are referenced by foreign keys,
+and every unique key must contain the partitioning column, so the foreign
+keys are dropped and the primary keys become (id, <time column>).
+"""
+
+from datetime import date
+
+# Months to create ahead of the current one; the archive job keeps this topped up
+MONTHS_AHEAD = 2
+
+PARTITIONED = (("interview_sessions", "started_at"), ("evaluations", "evaluated_at"))
+
+
+def next_month(day):
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def up(m):
+    # evaluations references interview_sessions, so its keys go first
+    for table, _ in reversed(PARTITIONED):
+        m.drop_foreign_keys(table)
+    # The index MySQL created for the question_id foreign key, under a regular name
+    m.add_index("evaluations", "idx_question", ["question_id"])
+    m.drop_index("evaluations", "question_id")
+
+    for table, column in PARTITIONED:
+        if m.is_partitioned(table):
+            continue
+        oldest = m.query(f"SELECT MIN({column}) FROM {table}")[0][0]
+        month = (oldest.date() if oldest else date.today()).replace(day=1)
+        last = date.today().replace(day=1)
+        for _ in range(MONTHS_AHEAD):
+            last = next_month(last)
+
+        partitions = []
+        while month <= last:
+            bound = next_month(month)
+            partitions.append(f"PARTITION p{month:%Y%m} VALUES LESS THAN "
+                              f"(UNIX_TIMESTAMP('{bound:%Y-%m-%d} 00:00:00'))")
+            month = bound
+        partitions.append("PARTITION p_future VALUES LESS THAN MAXVALUE")
+
+        m.execute(f"""
+            ALTER TABLE {table}
+            MODIFY {column} TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            DROP PRIMARY KEY,
+            ADD PRIMARY KEY (id, {column})
+        """)
+        m.execute(f"ALTER TABLE {table} PARTITION BY RANGE (UNIX_TIMESTAMP({column})) "
+                  f"({', '.join(partitions)})")
+
+    # Exported partitions, so archived history can still be read
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS archived_partitions (
+            table_name VARCHAR(64) NOT NULL,
+            partition_name VARCHAR(64) NOT NULL,
+            path VARCHAR(500) NOT NULL,
+            row_count INT NOT NULL DEFAULT 0,
+            range_start DATETIME NULL,
+            range_end DATETIME NOT NULL,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (table_name, partition_name),
+            INDEX idx_table_end (table_name, range_end)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
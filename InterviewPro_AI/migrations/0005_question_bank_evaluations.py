@@ -0,0 +1,14 @@
+"""
+InterviewPro AI - Evaluations for question bank questions
+Built-in question bank questions have no questions row, so their evaluations
+are stored with a NULL question_id and carry their own question_type
+"""
+
+
+def up(m):
+    m.execute("ALTER TABLE evaluations MODIFY question_id INT NULL")
+    m.execute("""
+        ALTER TABLE evaluations
+        ADD COLUMN question_type ENUM('technical', 'behavioral', 'coding', 'system_design') NULL
+        AFTER question_id
+    """)
@@ -0,0 +1,138 @@
+"""
+InterviewPro AI - Hot queries
+Request-path queries from models.py that must be served by an index.
+Checked with: python migrate.py InterviewPro_AI --check
+
+Statements models.py keeps as module constants are imported rather than copied.
+"""
+
+from datetime import datetime
+
+from models import (IDENTITY_SQL, STUDENTS_PAGE_SELECT, SESSIONS_PAGE_SELECT,
+                    EVALUATIONS_PAGE_SELECT, WEEKLY_HISTORY_SQL, ANSWER_HISTORY_SQL, USER_XP_SQL,
+                    SEARCHABLE_QUESTIONS_SQL, keyset_sql)
+
+NOW = datetime(2025, 1, 1)
+
+# Tables small enough to be read whole: reference data, one row per tournament,
+# one row per day
+ALLOW_FULL_SCAN = ("achievements", "question_categories", "tournaments", "admin_daily_stats")
+
+HOT_QUERIES = [
+    ("get_user_by_email", "SELECT * FROM users WHERE email = %s", ("student1@edu.com",)),
+    ("get_student_by_user_id", "SELECT * FROM students WHERE user_id = %s", (1,)),
+    ("get_identity", IDENTITY_SQL, (1,)),
+    ("get_students_page", keyset_sql(STUDENTS_PAGE_SELECT, ["s.experience_level = %s"],
+                                     "s.avg_score", "s.user_id", True, False),
+     ("beginner", 21)),
+    ("get_questions_by_category", """
+        SELECT * FROM questions
+        WHERE category_id = %s AND difficulty = %s AND is_active = TRUE
+        ORDER BY RAND() LIMIT %s
+    """, (1, "medium", 10)),
+    ("get_random_questions", """
+        SELECT * FROM questions WHERE is_active = TRUE AND question_type = %s AND difficulty = %s
+        ORDER BY RAND() LIMIT %s
+    """, ("technical", "medium", 10)),
+    ("get_due_reviews", """
+        SELECT q.*, r.due_at, r.repetitions, r.interval_days
+        FROM review_schedule r
+        JOIN questions q ON q.id = r.question_id
+        WHERE r.student_id = %s AND r.category_id = %s AND r.due_at <= %s AND q.is_active = TRUE
+        ORDER BY r.due_at
+        LIMIT %s
+    """, (1, 1, NOW, 20)),
+    ("get_unreviewed_questions", """
+        SELECT q.* FROM questions q
+        LEFT JOIN review_schedule r ON r.student_id = %s AND r.question_id = q.id
+        WHERE q.category_id = %s AND q.is_active = TRUE AND r.question_id IS NULL
+        ORDER BY q.id
+        LIMIT %s
+    """, (1, 1, 20)),
+    ("get_student_sessions", """
+        SELECT * FROM interview_sessions
+        WHERE student_id = %s
+        ORDER BY started_at DESC
+        LIMIT %s
+    """, (1, 10)),
+    ("get_sessions_page", keyset_sql(SESSIONS_PAGE_SELECT, ["s.status = %s"],
+                                     "s.started_at", "s.id", True, True),
+     ("completed", NOW, NOW, 100, 21)),
+    ("get_sessions_page (unfiltered)", keyset_sql(SESSIONS_PAGE_SELECT, [],
+                                                  "s.started_at", "s.id", True, True),
+     (NOW, NOW, 100, 21)),
+    ("get_session_evaluations", """
+        SELECT e.*, q.question_text, COALESCE(e.question_type, q.question_type) AS question_type,
+               q.difficulty
+        FROM evaluations e
+        LEFT JOIN questions q ON e.question_id = q.id
+        WHERE e.session_id = %s
+        ORDER BY e.evaluated_at
+    """, (1,)),
+    ("get_evaluations_page (unfiltered)", keyset_sql(EVALUATIONS_PAGE_SELECT, [],
+                                                     "e.evaluated_at", "e.id", True, True),
+     (NOW, NOW, 100, 21)),
+    ("aggregate_student_history (weeks)", WEEKLY_HISTORY_SQL.format(session_filter=""), (1,)),
+    ("aggregate_student_history (answers)", ANSWER_HISTORY_SQL.format(session_filter=""), (1,)),
+    ("get_user_xp", USER_XP_SQL, (1,)),
+    # The incremental refresh; the startup load reads every active question by design
+    ("get_searchable_questions", SEARCHABLE_QUESTIONS_SQL.format(condition="q.id > %s"), (100000,)),
+    ("get_category_stats", """
+        SELECT category, answers, score_sum, score_sq_sum, last_seen_at
+        FROM student_category_stats WHERE user_id = %s
+    """, (1,)),
+    ("get_question_stats_since", """
+        SELECT * FROM question_stats WHERE updated_at >= %s AND updated_at < %s
+    """, (NOW, NOW)),
+    ("get_mislabeled_questions", """
+        SELECT * FROM question_stats
+        WHERE estimated_difficulty IS NOT NULL AND estimated_difficulty != labeled_difficulty
+        ORDER BY answers + skips DESC
+        LIMIT %s
+    """, (50,)),
+    ("get_question_time_buckets", """
+        SELECT q.id, q.question_text, q.estimated_time, b.bucket, b.samples
+        FROM response_time_buckets b
+        JOIN questions q ON q.id = CAST(SUBSTRING(b.scope_key, 2) AS UNSIGNED)
+        WHERE b.scope = 'question' AND b.scope_key LIKE 'q%'
+    """, None),
+    ("get_response_time_buckets", """
+        SELECT scope_key, bucket, samples FROM response_time_buckets
+        WHERE scope = %s AND scope_key IN (%s)
+    """, ("student", "1")),
+    ("get_user_achievements", """
+        SELECT a.*, ua.earned_at
+        FROM achievements a
+        JOIN user_achievements ua ON a.id = ua.achievement_id
+        WHERE ua.user_id = %s
+        ORDER BY ua.earned_at DESC
+    """, (1,)),
+    ("get_challenge_progress", """
+        SELECT challenge_id, progress, completed_at FROM daily_challenge_progress
+        WHERE user_id = %s AND challenge_day = %s
+    """, (1, NOW.date())),
+    ("get_tournaments", """
+        SELECT *, tournament_type AS type FROM tournaments
+        WHERE status != 'completed'
+        ORDER BY start_at
+    """, None),
+    ("get_open_round", """
+        SELECT * FROM tournament_rounds
+        WHERE tournament_id = %s AND status = 'open'
+        ORDER BY round_number DESC LIMIT 1
+    """, (1,)),
+    ("get_tournament_standings", """
+        SELECT r.user_id, u.first_name, u.last_name, r.score, r.final_rank
+        FROM tournament_registrations r
+        JOIN users u ON u.id = r.user_id
+        WHERE r.tournament_id = %s
+        ORDER BY r.score DESC, r.registered_at
+        LIMIT %s
+    """, (1, 10)),
+    ("get_admin_stats", """
+        SELECT sessions_completed as total, stat_date as date
+        FROM admin_daily_stats
+        WHERE sessions_completed > 0
+        ORDER BY stat_date DESC LIMIT 7
+    """, None),
+]
@@ -6,14 +6,118 @@ MySQL Database Interface for Interview Preparation Platform
 import mysql.connector
 from mysql.connector import Error
 import os
+import json
+import sys
 from datetime import datetime
+from pagination import encode_cursor, decode_cursor
+from metrics import instrument_methods
+from tracing import wrap_connection
+
+# The migration runner is shared with SkillPath AI and lives one level up
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from migrate import MigrationRunner
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+# Admin export datasets: name -> query streamed by export_batches
+EXPORT_QUERIES = {
+    "sessions": "SELECT * FROM interview_sessions",
+    "evaluations": "SELECT * FROM evaluations",
+    "students": """
+        SELECT s.*, u.email, u.first_name, u.last_name, u.created_at AS registered_at
+        FROM students s JOIN users u ON u.id = s.user_id
+    """,
+}
+
+# Request-path statements that migrations/hot_queries.py EXPLAINs as written here.
+# {placeholders} are filled in by the methods that run them.
+# The marker column splits the row: users columns before it, students columns after,
+# so both sides follow schema changes and their clashing names (created_at...) stay apart
+IDENTITY_SQL = """
+    SELECT u.*, NULL AS student__, s.*
+    FROM users u
+    LEFT JOIN students s ON s.user_id = u.id
+    WHERE u.id = %s
+"""
+
+STUDENTS_PAGE_SELECT = """
+    SELECT s.*, u.first_name, u.last_name, u.email
+    FROM students s JOIN users u ON u.id = s.user_id
+"""
+
+SESSIONS_PAGE_SELECT = "SELECT s.* FROM interview_sessions s"
+
+EVALUATIONS_PAGE_SELECT = """
+    SELECT e.*, q.question_text, COALESCE(e.question_type, q.question_type) AS question_type,
+           q.difficulty
+    FROM evaluations e LEFT JOIN questions q ON e.question_id = q.id
+"""
+
+WEEKLY_HISTORY_SQL = """
+    SELECT YEARWEEK(s.completed_at, 1) AS week,
+           COUNT(*) AS sessions,
+           SUM(s.percentage) AS score_sum,
+           MAX(s.percentage) AS best_score,
+           SUM(TIMESTAMPDIFF(SECOND, s.started_at, s.completed_at)) AS seconds,
+           SUM(COALESCE(JSON_LENGTH(s.questions_asked), 0)) AS questions
+    FROM interview_sessions s
+    WHERE s.student_id = %s AND s.status = 'completed'{session_filter}
+    GROUP BY week
+"""
+
+# Question bank evaluations have no questions row and carry their own type
+ANSWER_HISTORY_SQL = """
+    SELECT COALESCE(e.question_type, q.question_type) AS question_type,
+           COUNT(*) AS answers, SUM(e.score) AS score_sum
+    FROM interview_sessions s
+    JOIN evaluations e ON e.session_id = s.id
+    LEFT JOIN questions q ON e.question_id = q.id
+    WHERE s.student_id = %s AND s.status = 'completed'{session_filter}
+    GROUP BY COALESCE(e.question_type, q.question_type)
+"""
+
+USER_XP_SQL = "SELECT total_xp FROM user_xp WHERE user_id = %s"
+
+SEARCHABLE_QUESTIONS_SQL = """
+    SELECT q.id, q.question_text, q.ideal_answer, q.keywords, q.question_type,
+           q.difficulty, c.name AS category
+    FROM questions q
+    JOIN question_categories c ON c.id = q.category_id
+    WHERE {condition} AND q.is_active = TRUE
+    ORDER BY q.id
+"""
+
+# Keyset sort orders: name -> (SQL column, result field)
+STUDENT_SORTS = {
+    "interviews": ("s.total_interviews", "total_interviews"),
+    "score": ("s.avg_score", "avg_score"),
+}
+
+
+def keyset_sql(select, filters, sort_column, id_column, descending, has_cursor):
+    """Query for one keyset page; parameters are the filters', then the cursor's (sort value
+    twice, then id), then the row limit"""
+    filters = list(filters)
+    if has_cursor:
+        # Expanded rather than a row constructor, which MySQL does not reliably range-scan
+        past = "<" if descending else ">"
+        filters.append(f"({sort_column} {past} %s OR ({sort_column} = %s AND {id_column} {past} %s))")
+    order = "DESC" if descending else "ASC"
+    query = select
+    if filters:
+        query += " WHERE " + " AND ".join(filters)
+    return query + f" ORDER BY {sort_column} {order}, {id_column} {order} LIMIT %s"
 
 
 class Database:
     """Database connection and operations for InterviewPro AI"""
     
-    def __init__(self):
+    def __init__(self, autocommit=False):
+        # Read-only connections use autocommit so every SELECT sees the latest committed rows
+        # instead of the REPEATABLE READ snapshot taken by their first read
+        self.autocommit = autocommit
         self.connection = None
+        self._profile_listeners = []
         self.connect()
 
     def connect(self):
@@ -24,163 +128,56 @@ class Database:
                 user=os.getenv('DB_USER', 'root'),
                 password=os.getenv('DB_PASSWORD', 'Shravani@2006'),
                 database=os.getenv('DB_NAME', 'interviewpro_ai'),
-                port=int(os.getenv('DB_PORT', 3306))
+                port=int(os.getenv('DB_PORT', 3306)),
+                autocommit=self.autocommit
             )
             if self.connection.is_connected():
                 print("✅ Connected to InterviewPro AI MySQL database")
+            # Statements on sampled requests are recorded as trace spans
+            self.connection = wrap_connection(self.connection)
         except Error as e:
             print(f"⚠️ MySQL not available, using fallback data: {e}")
             self.connection = None
 
-    def create_tables(self):
-        """Create all tables from schema"""
+    def end_snapshot(self):
+        """End the current read view so rows committed on other connections become visible.
+
+        Commits rather than rolls back: the shared connection may be carrying another
+        request's writes.
+        """
         if not self.connection:
             return False
 
-        cursor = self.connection.cursor()
-        
-        # Users table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                email VARCHAR(255) NOT NULL UNIQUE,
-                password_hash VARCHAR(255) NOT NULL,
-                role ENUM('student', 'admin', 'mentor') NOT NULL DEFAULT 'student',
-                first_name VARCHAR(100) NOT NULL,
-                last_name VARCHAR(100) NOT NULL,
-                phone VARCHAR(20),
-                is_active BOOLEAN DEFAULT TRUE,
-                is_verified BOOLEAN DEFAULT FALSE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                INDEX idx_email (email),
-                INDEX idx_role (role)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-
-        # Students table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS students (
-                user_id INT PRIMARY KEY,
-                year INT NOT NULL,
-                department VARCHAR(100),
-                cgpa DECIMAL(3,2),
-                target_role VARCHAR(100),
-                experience_level ENUM('beginner', 'intermediate', 'advanced') DEFAULT 'beginner',
-                total_interviews INT DEFAULT 0,
-                avg_score DECIMAL(5,2) DEFAULT 0,
-                total_score INT DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-
-        # Question categories table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS question_categories (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                name VARCHAR(100) NOT NULL UNIQUE,
-                description TEXT,
-                icon VARCHAR(50),
-                difficulty ENUM('easy', 'medium', 'hard', 'all') DEFAULT 'all',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-
-        # Questions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS questions (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                category_id INT NOT NULL,
-                question_type ENUM('technical', 'behavioral', 'coding', 'system_design') NOT NULL,
-                difficulty ENUM('easy', 'medium', 'hard') NOT NULL,
-                question_text TEXT NOT NULL,
-                ideal_answer TEXT,
-                keywords TEXT,
-                points INT DEFAULT 10,
-                estimated_time INT DEFAULT 5,
-                is_active BOOLEAN DEFAULT TRUE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (category_id) REFERENCES question_categories(id) ON DELETE CASCADE
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-
-        # Interview sessions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS interview_sessions (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                student_id INT NOT NULL,
-                session_type ENUM('technical', 'behavioral', 'mixed', 'coding') NOT NULL DEFAULT 'mixed',
-                difficulty ENUM('easy', 'medium', 'hard') DEFAULT 'medium',
-                target_role VARCHAR(100),
-                questions_asked JSON,
-                answers_given JSON,
-                question_times JSON,
-                total_score INT DEFAULT 0,
-                max_score INT DEFAULT 100,
-                percentage DECIMAL(5,2) DEFAULT 0,
-                status ENUM('in_progress', 'completed', 'abandoned') DEFAULT 'in_progress',
-                started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                completed_at TIMESTAMP NULL,
-                FOREIGN KEY (student_id) REFERENCES users(id) ON DELETE CASCADE
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-
-        # Evaluations table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS evaluations (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                session_id INT NOT NULL,
-                question_id INT NOT NULL,
-                answer_text TEXT,
-                score DECIMAL(5,2) DEFAULT 0,
-                max_score DECIMAL(5,2) DEFAULT 10,
-                feedback TEXT,
-                strengths TEXT,
-                improvements TEXT,
-                keywords_found TEXT,
-                keywords_missing TEXT,
-                evaluated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (session_id) REFERENCES interview_sessions(id) ON DELETE CASCADE,
-                FOREIGN KEY (question_id) REFERENCES questions(id) ON DELETE CASCADE
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-
-        # Achievements table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS achievements (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                name VARCHAR(100) NOT NULL UNIQUE,
-                description TEXT,
-                icon VARCHAR(50),
-                category ENUM('interview', 'score', 'streak', 'milestone') NOT NULL,
-                requirement_type VARCHAR(50),
-                requirement_value INT,
-                points INT DEFAULT 10,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
+        try:
+            self.connection.commit()
+            return True
+        except Error as e:
+            print(f"❌ Error ending read snapshot: {e}")
+            return False
 
-        # User achievements table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS user_achievements (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id INT NOT NULL,
-                achievement_id INT NOT NULL,
-                earned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                FOREIGN KEY (achievement_id) REFERENCES achievements(id) ON DELETE CASCADE,
-                UNIQUE KEY unique_achievement (user_id, achievement_id)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
+    def create_tables(self):
+        """Bring the schema up to date by applying pending migrations"""
+        if not self.connection:
+            return False
 
-        self.connection.commit()
-        cursor.close()
-        print("✅ All database tables created successfully")
+        try:
+            applied = MigrationRunner(self.connection, MIGRATIONS_DIR).run()
+        except Error as e:
+            print(f"❌ Error applying migrations: {e}")
+            return False
+        print(f"✅ Database schema up to date ({len(applied)} migrations applied)")
         return True
 
     # ============ USER OPERATIONS ============
+
+    def add_profile_listener(self, callback):
+        """Call `callback(user_id)` after this connection commits a change to a users or
+        students row, e.g. to drop cached identities"""
+        self._profile_listeners.append(callback)
+
+    def _profile_changed(self, user_id):
+        for callback in self._profile_listeners:
+            callback(user_id)
     
     def create_user(self, email, password_hash, role, first_name, last_name, phone=None):
         """Create a new user"""
@@ -193,11 +190,15 @@ class Database:
                 INSERT INTO users (email, password_hash, role, first_name, last_name, phone)
                 VALUES (%s, %s, %s, %s, %s, %s)
             """, (email, password_hash, role, first_name, last_name, phone))
-            self.connection.commit()
             user_id = cursor.lastrowid
+            if role == 'student':
+                self._add_admin_stats(cursor, datetime.now().date(), new_students=1)
+            self.connection.commit()
             cursor.close()
+            self._profile_changed(user_id)
             return user_id
         except Error as e:
+            self.connection.rollback()
             print(f"❌ Error creating user: {e}")
             return None
 
@@ -262,6 +263,7 @@ class Database:
             """, (user_id, year, department, cgpa, target_role, experience_level))
             self.connection.commit()
             cursor.close()
+            self._profile_changed(user_id)
             return True
         except Error as e:
             print(f"❌ Error creating student: {e}")
@@ -278,6 +280,23 @@ class Database:
         cursor.close()
         return student
 
+    def get_identity(self, user_id):
+        """A user and their student profile (None if they have none) in one query"""
+        if not self.connection:
+            return self.get_user_by_id(user_id), None
+
+        cursor = self.connection.cursor()
+        cursor.execute(IDENTITY_SQL, (user_id,))
+        row = cursor.fetchone()
+        columns = cursor.column_names
+        cursor.close()
+        if not row:
+            return None, None
+        split = columns.index("student__")
+        user = dict(zip(columns[:split], row[:split]))
+        student = dict(zip(columns[split + 1:], row[split + 1:]))
+        return user, student if student["user_id"] is not None else None
+
     def update_student_stats(self, user_id, score):
         """Update student interview statistics"""
         if not self.connection:
@@ -294,21 +313,41 @@ class Database:
             """, (score, score, user_id))
             self.connection.commit()
             cursor.close()
+            self._profile_changed(user_id)
             return True
         except Error as e:
             print(f"❌ Error updating student stats: {e}")
             return False
 
-    def get_all_students(self):
-        """Get all students"""
+    def get_students_page(self, sort="interviews", descending=True, experience_level=None,
+                          after=None, limit=20):
+        """One keyset page of students with their names; returns (students, next_cursor)"""
+        if not self.connection:
+            return [], None
+
+        sort_column, sort_field = STUDENT_SORTS.get(sort, STUDENT_SORTS["interviews"])
+        filters, params = [], []
+        if experience_level:
+            filters.append("s.experience_level = %s")
+            params.append(experience_level)
+        return self._keyset_page(STUDENTS_PAGE_SELECT, filters, params, sort_column, sort_field, "s.user_id", "user_id", descending, after, limit)
+
+    def get_leaderboard_rows(self):
+        """Get points and names of all students for rebuilding the rank index"""
         if not self.connection:
             return []
-        
+
         cursor = self.connection.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM students ORDER BY total_interviews DESC")
-        students = cursor.fetchall()
+        cursor.execute("""
+            SELECT s.user_id, u.first_name, u.last_name, s.total_interviews,
+                   s.total_score + COALESCE(x.total_xp, 0) AS points
+            FROM students s
+            JOIN users u ON u.id = s.user_id
+            LEFT JOIN user_xp x ON x.user_id = s.user_id
+        """)
+        rows = cursor.fetchall()
         cursor.close()
-        return students
+        return rows
 
     # ============ QUESTION OPERATIONS ============
     
@@ -418,6 +457,164 @@ class Database:
             print(f"❌ Error adding question: {e}")
             return False
 
+    def get_question_texts(self):
+        """Text of every question, for duplicate checks"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT question_text FROM questions")
+        texts = [row[0] for row in cursor]
+        cursor.close()
+        return texts
+
+    def get_searchable_questions(self, after_id=0, ids=None):
+        """Active questions with their category name, for the search index.
+
+        Returns questions with an id above after_id, or only those in ids when given.
+        """
+        if not self.connection:
+            return []
+
+        if ids:
+            condition = "q.id IN (" + ", ".join(["%s"] * len(ids)) + ")"
+            params = tuple(ids)
+        else:
+            condition = "q.id > %s"
+            params = (after_id,)
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute(SEARCHABLE_QUESTIONS_SQL.format(condition=condition), params)
+        questions = cursor.fetchall()
+        cursor.close()
+        return questions
+
+    def get_active_question_ids(self):
+        """IDs of every active question; read from the is_active index alone"""
+        if not self.connection:
+            return set()
+
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT id FROM questions WHERE is_active = TRUE")
+        ids = {row[0] for row in cursor.fetchall()}
+        cursor.close()
+        return ids
+
+    def import_questions(self, rows, batch_size=1000):
+        """Insert (category_id, question_type, difficulty, question_text, ideal_answer,
+        keywords, points, estimated_time) rows in batches within one transaction.
+
+        rows may be any iterable and is consumed as it is inserted. Returns the
+        number of rows inserted, or None when the import was rolled back.
+        """
+        if not self.connection:
+            return None
+
+        cursor = self.connection.cursor()
+        inserted = 0
+        batch = []
+        try:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    inserted += self._insert_questions(cursor, batch)
+                    batch = []
+            if batch:
+                inserted += self._insert_questions(cursor, batch)
+            self.connection.commit()
+            return inserted
+        except Error as e:
+            self.connection.rollback()
+            print(f"❌ Error importing questions: {e}")
+            return None
+        except Exception:
+            # A file that fails to read partway through must not leave earlier batches pending
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def _insert_questions(self, cursor, batch):
+        cursor.executemany("""
+            INSERT INTO questions (category_id, question_type, difficulty, question_text,
+                                 ideal_answer, keywords, points, estimated_time)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, batch)
+        return len(batch)
+
+    # ============ REVIEW SCHEDULE OPERATIONS ============
+
+    def get_due_reviews(self, student_id, category_id, now, limit=20):
+        """Get a student's questions due for review in a category, most overdue first"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT q.*, r.due_at, r.repetitions, r.interval_days
+            FROM review_schedule r
+            JOIN questions q ON q.id = r.question_id
+            WHERE r.student_id = %s AND r.category_id = %s AND r.due_at <= %s AND q.is_active = TRUE
+            ORDER BY r.due_at
+            LIMIT %s
+        """, (student_id, category_id, now, limit))
+        questions = cursor.fetchall()
+        cursor.close()
+        return questions
+
+    def get_unreviewed_questions(self, student_id, category_id, limit=20):
+        """Get questions in a category the student has never reviewed"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT q.* FROM questions q
+            LEFT JOIN review_schedule r ON r.student_id = %s AND r.question_id = q.id
+            WHERE q.category_id = %s AND q.is_active = TRUE AND r.question_id IS NULL
+            ORDER BY q.id
+            LIMIT %s
+        """, (student_id, category_id, limit))
+        questions = cursor.fetchall()
+        cursor.close()
+        return questions
+
+    def get_review_state(self, student_id, question_id):
+        """Get the SM-2 state for one (student, question) pair"""
+        if not self.connection:
+            return None
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT ease, interval_days, repetitions, due_at FROM review_schedule
+            WHERE student_id = %s AND question_id = %s
+        """, (student_id, question_id))
+        state = cursor.fetchone()
+        cursor.close()
+        return state
+
+    def save_review(self, student_id, question_id, ease, interval_days, repetitions, due_at, reviewed_at):
+        """Store the next review for a (student, question) pair"""
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO review_schedule (student_id, question_id, category_id, ease, interval_days,
+                                             repetitions, due_at, last_reviewed_at)
+                SELECT %s, id, category_id, %s, %s, %s, %s, %s FROM questions WHERE id = %s
+                ON DUPLICATE KEY UPDATE ease = VALUES(ease), interval_days = VALUES(interval_days),
+                    repetitions = VALUES(repetitions), due_at = VALUES(due_at),
+                    last_reviewed_at = VALUES(last_reviewed_at)
+            """, (student_id, ease, interval_days, repetitions, due_at, reviewed_at, question_id))
+            self.connection.commit()
+            saved = cursor.rowcount > 0
+            cursor.close()
+            return saved
+        except Error as e:
+            print(f"❌ Error saving review: {e}")
+            return False
+
     # ============ INTERVIEW SESSION OPERATIONS ============
     
     def create_interview_session(self, student_id, session_type, difficulty, target_role, questions):
@@ -430,7 +627,7 @@ class Database:
             cursor.execute("""
                 INSERT INTO interview_sessions (student_id, session_type, difficulty, target_role, questions_asked)
                 VALUES (%s, %s, %s, %s, %s)
-            """, (student_id, session_type, difficulty, target_role, str(questions)))
+            """, (student_id, session_type, difficulty, target_role, json.dumps(questions)))
             self.connection.commit()
             session_id = cursor.lastrowid
             cursor.close()
@@ -450,38 +647,85 @@ class Database:
         cursor.close()
         return session
 
-    def update_interview_session(self, session_id, answers=None, score=None, completed=False):
-        """Update interview session"""
+    def update_interview_session(self, session_id, answers=None, score=None, completed=False,
+                                 category_scores=None, question_times=None):
+        """Update interview session; category_scores ({category: [scores]}) are folded into
+        student_category_stats, and the session into the admin rollups, in the same
+        transaction that completes it"""
+        return self.save_write_batch([], {session_id: {
+            "answers": answers, "score": score, "completed": completed,
+            "category_scores": category_scores, "question_times": question_times,
+        }})
+
+    def save_write_batch(self, evaluations, session_updates):
+        """Insert evaluation rows and apply {session_id: changes} in a single transaction"""
         if not self.connection:
             return False
         
+        updates = [(json.dumps(u["answers"]) if u.get("answers") else None,
+                    json.dumps(u["question_times"]) if u.get("question_times") else None,
+                    u.get("score"), session_id)
+                   for session_id, u in session_updates.items()
+                   if u.get("answers") or u.get("question_times") or u.get("score") is not None]
         cursor = self.connection.cursor()
         try:
-            if answers:
-                cursor.execute("""
-                    UPDATE interview_sessions SET answers_given = %s WHERE id = %s
-                """, (str(answers), session_id))
+            if evaluations:
+                cursor.executemany("""
+                    INSERT INTO evaluations (session_id, question_id, question_type, answer_text, score,
+                                           feedback, strengths, improvements, keywords_found,
+                                           keywords_missing)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """, evaluations)
             
-            if score is not None:
-                cursor.execute("""
-                    UPDATE interview_sessions SET total_score = %s WHERE id = %s
-                """, (score, session_id))
-            
-            if completed:
-                cursor.execute("""
-                    UPDATE interview_sessions 
-                    SET status = 'completed', completed_at = NOW(),
-                        percentage = (total_score / max_score) * 100
+            if updates:
+                cursor.executemany("""
+                    UPDATE interview_sessions
+                    SET answers_given = COALESCE(%s, answers_given),
+                        question_times = COALESCE(%s, question_times),
+                        total_score = COALESCE(%s, total_score)
                     WHERE id = %s
-                """, (session_id,))
+                """, updates)
+            
+            for session_id, u in session_updates.items():
+                if u.get("completed"):
+                    self._complete_session(cursor, session_id, u.get("category_scores"))
             
             self.connection.commit()
             cursor.close()
             return True
         except Error as e:
-            print(f"❌ Error updating session: {e}")
+            self.connection.rollback()
+            print(f"❌ Error updating sessions: {e}")
             return False
 
+    def _complete_session(self, cursor, session_id, category_scores):
+        cursor.execute("""
+            UPDATE interview_sessions 
+            SET status = 'completed', completed_at = NOW(),
+                percentage = (total_score / max_score) * 100
+            WHERE id = %s AND status != 'completed'
+        """, (session_id,))
+        
+        # Only the request that completed the session adds it to the rollups
+        if not cursor.rowcount:
+            return
+        cursor.execute("""
+            SELECT student_id, DATE(started_at), percentage FROM interview_sessions WHERE id = %s
+        """, (session_id,))
+        student_id, started_on, percentage = cursor.fetchone()
+        self._add_admin_stats(cursor, started_on, sessions_completed=1, score_sum=percentage or 0)
+        if category_scores:
+            cursor.executemany("""
+                INSERT INTO student_category_stats
+                    (user_id, category, answers, score_sum, score_sq_sum, last_seen_at)
+                VALUES (%s, %s, %s, %s, %s, NOW())
+                ON DUPLICATE KEY UPDATE answers = answers + VALUES(answers),
+                    score_sum = score_sum + VALUES(score_sum),
+                    score_sq_sum = score_sq_sum + VALUES(score_sq_sum),
+                    last_seen_at = VALUES(last_seen_at)
+            """, [(student_id, category, len(scores), sum(scores), sum(s * s for s in scores))
+                  for category, scores in category_scores.items() if scores])
+
     def get_student_sessions(self, student_id, limit=10):
         """Get interview sessions for a student"""
         if not self.connection:
@@ -498,22 +742,38 @@ class Database:
         cursor.close()
         return sessions
 
+    def get_sessions_page(self, student_id=None, status=None, after=None, limit=20):
+        """One keyset page of sessions, newest first; returns (sessions, next_cursor)"""
+        if not self.connection:
+            return [], None
+
+        filters, params = [], []
+        if student_id:
+            filters.append("s.student_id = %s")
+            params.append(student_id)
+        if status:
+            filters.append("s.status = %s")
+            params.append(status)
+        return self._keyset_page(SESSIONS_PAGE_SELECT, filters, params,
+                                 "s.started_at", "started_at", "s.id", "id", True, after, limit)
+
     # ============ EVALUATION OPERATIONS ============
     
-    def save_evaluation(self, session_id, question_id, answer_text, score, feedback, 
+    def save_evaluation(self, session_id, question_id, question_type, answer_text, score, feedback,
                        strengths, improvements, keywords_found, keywords_missing):
-        """Save AI evaluation"""
+        """Save AI evaluation; question_id is None for question bank questions"""
         if not self.connection:
             return False
         
         cursor = self.connection.cursor()
         try:
             cursor.execute("""
-                INSERT INTO evaluations (session_id, question_id, answer_text, score, feedback,
-                                       strengths, improvements, keywords_found, keywords_missing)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (session_id, question_id, answer_text, score, feedback, strengths, improvements, 
-                  keywords_found, keywords_missing))
+                INSERT INTO evaluations (session_id, question_id, question_type, answer_text, score,
+                                       feedback, strengths, improvements, keywords_found,
+                                       keywords_missing)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (session_id, question_id, question_type, answer_text, score, feedback, strengths,
+                  improvements, keywords_found, keywords_missing))
             self.connection.commit()
             cursor.close()
             return True
@@ -528,9 +788,10 @@ class Database:
         
         cursor = self.connection.cursor(dictionary=True)
         cursor.execute("""
-            SELECT e.*, q.question_text, q.question_type, q.difficulty
+            SELECT e.*, q.question_text, COALESCE(e.question_type, q.question_type) AS question_type,
+                   q.difficulty
             FROM evaluations e
-            JOIN questions q ON e.question_id = q.id
+            LEFT JOIN questions q ON e.question_id = q.id
             WHERE e.session_id = %s
             ORDER BY e.evaluated_at
         """, (session_id,))
@@ -538,133 +799,1038 @@ class Database:
         cursor.close()
         return evaluations
 
-    # ============ ACHIEVEMENT OPERATIONS ============
-    
-    def get_all_achievements(self):
-        """Get all achievements"""
+    def get_evaluations_page(self, session_id=None, after=None, limit=20):
+        """One keyset page of evaluations, newest first; returns (evaluations, next_cursor)"""
         if not self.connection:
-            return []
-        
+            return [], None
+
+        filters, params = [], []
+        if session_id:
+            filters.append("e.session_id = %s")
+            params.append(session_id)
+        return self._keyset_page(EVALUATIONS_PAGE_SELECT, filters, params, "e.evaluated_at", "evaluated_at", "e.id", "id", True, after, limit)
+
+    def _keyset_page(self, select, filters, params, sort_column, sort_field, id_column, id_field,
+                     descending, after, limit):
+        """Rows strictly past the cursor in (sort, id) order, plus the cursor for the next page"""
+        params = list(params)
+        position = decode_cursor(after)
+        if position:
+            params.extend((position[0], position[0], position[1]))
+        query = keyset_sql(select, filters, sort_column, id_column, descending, bool(position))
+        params.append(limit + 1)
+
         cursor = self.connection.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM achievements ORDER BY points")
-        achievements = cursor.fetchall()
+        cursor.execute(query, tuple(params))
+        rows = cursor.fetchall()
         cursor.close()
-        return achievements
 
-    def get_user_achievements(self, user_id):
-        """Get achievements earned by user"""
+        # The extra row only tells us whether another page exists
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, encode_cursor(rows[-1][sort_field], rows[-1][id_field])
+        return rows, None
+
+    # ============ ARCHIVE OPERATIONS ============
+
+    def get_partitions(self, table):
+        """Partitions of a time-partitioned table in range order, with the exclusive end of each
+        range (None for the MAXVALUE partition)"""
         if not self.connection:
             return []
-        
+
         cursor = self.connection.cursor(dictionary=True)
         cursor.execute("""
-            SELECT a.*, ua.earned_at 
-            FROM achievements a
-            JOIN user_achievements ua ON a.id = ua.achievement_id
-            WHERE ua.user_id = %s
-            ORDER BY ua.earned_at DESC
-        """, (user_id,))
-        achievements = cursor.fetchall()
+            SELECT partition_name, table_rows,
+                   IF(partition_description = 'MAXVALUE', NULL,
+                      FROM_UNIXTIME(partition_description)) AS range_end
+            FROM information_schema.partitions
+            WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL
+            ORDER BY partition_ordinal_position
+        """, (table,))
+        partitions = cursor.fetchall()
         cursor.close()
-        return achievements
+        return partitions
 
-    def award_achievement(self, user_id, achievement_id):
-        """Award achievement to user"""
-        if not self.connection:
+    def add_month_partitions(self, table, months):
+        """Split p_future into [(partition_name, range_end)] monthly partitions"""
+        if not self.connection or not months:
             return False
-        
+
+        partitions = ", ".join(f"PARTITION {name} VALUES LESS THAN (UNIX_TIMESTAMP('{end:%Y-%m-%d} 00:00:00'))"
+                               for name, end in months)
         cursor = self.connection.cursor()
         try:
-            cursor.execute("""
-                INSERT IGNORE INTO user_achievements (user_id, achievement_id)
-                VALUES (%s, %s)
-            """, (user_id, achievement_id))
-            self.connection.commit()
+            cursor.execute(f"""
+                ALTER TABLE {table} REORGANIZE PARTITION p_future INTO
+                ({partitions}, PARTITION p_future VALUES LESS THAN MAXVALUE)
+            """)
             cursor.close()
             return True
         except Error as e:
-            print(f"❌ Error awarding achievement: {e}")
+            print(f"❌ Error adding partitions to {table}: {e}")
             return False
 
-    def check_and_award_achievements(self, user_id):
-        """Check conditions and award relevant achievements"""
-        student = self.get_student_by_user_id(user_id)
-        if not student:
-            return []
-        
-        awarded = []
-        achievements = self.get_all_achievements()
-        
-        for achievement in achievements:
-            requirement_type = achievement['requirement_type']
-            requirement_value = achievement['requirement_value']
-            
-            should_award = False
-            
-            if requirement_type == 'interviews_completed':
-                should_award = student['total_interviews'] >= requirement_value
-            elif requirement_type == 'single_score':
-                should_award = student['total_score'] >= requirement_value
-            elif requirement_type == 'avg_score':
-                should_award = student['avg_score'] >= requirement_value
-            
-            if should_award:
-                if self.award_achievement(user_id, achievement['id']):
-                    awarded.append(achievement)
-        
-        return awarded
+    def iter_partition_rows(self, table, partition, batch_size=1000):
+        """Stream every row of one partition without holding it all in memory"""
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute(f"SELECT * FROM {table} PARTITION ({partition})")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+        cursor.close()
 
-    # ============ ADMIN OPERATIONS ============
-    
-    def get_admin_stats(self):
-        """Get admin dashboard statistics"""
+    def get_archived_partitions(self, table):
+        """Archived partitions of a table, newest first"""
         if not self.connection:
-            return self.get_fallback_stats()
-        
-        stats = {}
-        
+            return []
+
         cursor = self.connection.cursor(dictionary=True)
-        
-        # Total users
-        cursor.execute("SELECT COUNT(*) as total FROM users WHERE role = 'student'")
-        stats['total_students'] = cursor.fetchone()['total']
-        
-        # Total interviews
-        cursor.execute("SELECT COUNT(*) as total FROM interview_sessions WHERE status = 'completed'")
-        stats['total_interviews'] = cursor.fetchone()['total']
-        
-        # Average score
-        cursor.execute("SELECT AVG(percentage) as avg FROM interview_sessions WHERE status = 'completed'")
-        stats['avg_score'] = cursor.fetchone()['avg'] or 0
-        
-        # Recent sessions
         cursor.execute("""
-            SELECT COUNT(*) as total, DATE(started_at) as date 
-            FROM interview_sessions 
-            WHERE status = 'completed'
-            GROUP BY DATE(started_at)
-            ORDER BY date DESC LIMIT 7
-        """)
-        stats['weekly_activity'] = cursor.fetchall()
-        
+            SELECT * FROM archived_partitions WHERE table_name = %s ORDER BY range_end DESC
+        """, (table,))
+        partitions = cursor.fetchall()
         cursor.close()
-        return stats
+        return partitions
 
-    def get_fallback_stats(self):
-        """Fallback statistics when database is not available"""
-        return {
-            'total_students': 150,
-            'total_interviews': 500,
-            'avg_score': 72.5,
-            'weekly_activity': []
-        }
+    def drop_archived_partition(self, table, partition, path, row_count, range_start, range_end):
+        """Record where a partition was exported to, then drop it"""
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO archived_partitions (table_name, partition_name, path, row_count,
+                                                 range_start, range_end)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE path = VALUES(path), row_count = VALUES(row_count)
+            """, (table, partition, path, row_count, range_start, range_end))
+            self.connection.commit()
+            cursor.execute(f"ALTER TABLE {table} DROP PARTITION {partition}")
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"❌ Error dropping partition {table}.{partition}: {e}")
+            return False
+
+    # ============ EXPORT OPERATIONS ============
+
+    def export_batches(self, dataset, batch_size=1000):
+        """Stream an export dataset as (column_names, rows) batches from an unbuffered cursor.
+
+        The connection is busy until every row has been read, so exports run on a
+        Database of their own; an export abandoned part way closes that connection.
+        """
+        cursor = self.connection.cursor(buffered=False)
+        cursor.execute(EXPORT_QUERIES[dataset])
+        columns = list(cursor.column_names)
+        rows = cursor.fetchmany(batch_size)
+        yield columns, rows
+        while rows:
+            rows = cursor.fetchmany(batch_size)
+            if rows:
+                yield columns, rows
+        cursor.close()
+
+    # ============ ANALYTICS OPERATIONS ============
+
+    def aggregate_student_history(self, user_id, session_id=None):
+        """Grouped aggregates over a student's completed sessions (or just one of them)"""
+        aggregates = {"weeks": [], "answers": []}
+        if not self.connection:
+            return aggregates
+
+        session_filter = " AND s.id = %s" if session_id else ""
+        params = (user_id, session_id) if session_id else (user_id,)
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute(WEEKLY_HISTORY_SQL.format(session_filter=session_filter), params)
+        aggregates["weeks"] = cursor.fetchall()
+
+        cursor.execute(ANSWER_HISTORY_SQL.format(session_filter=session_filter), params)
+        aggregates["answers"] = cursor.fetchall()
+        cursor.close()
+        return aggregates
+
+    def get_category_stats(self, user_id):
+        """Get a student's running per-category score aggregates"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT category, answers, score_sum, score_sq_sum, last_seen_at
+            FROM student_category_stats WHERE user_id = %s
+        """, (user_id,))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def get_analytics_cache(self, user_id):
+        """Get a student's cached analytics payload"""
+        if not self.connection:
+            return None
+
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT payload FROM student_analytics WHERE user_id = %s", (user_id,))
+        row = cursor.fetchone()
+        cursor.close()
+        return json.loads(row[0]) if row else None
+
+    def save_analytics_cache(self, user_id, payload):
+        """Store a student's analytics payload"""
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO student_analytics (user_id, payload) VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE payload = VALUES(payload)
+            """, (user_id, json.dumps(payload)))
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"❌ Error saving analytics: {e}")
+            return False
+
+    # ============ QUESTION STATS OPERATIONS ============
+
+    def record_question_attempt(self, question_key, question_text, category, difficulty, score, skipped=False):
+        """Fold one answer (or skip) into a question's running statistics"""
+        if not self.connection:
+            return False
+
+        score = 0 if skipped else float(score)
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO question_stats (question_key, question_text, category, labeled_difficulty,
+                                            answers, skips, score_sum, score_sq_sum)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE answers = answers + VALUES(answers), skips = skips + VALUES(skips),
+                    score_sum = score_sum + VALUES(score_sum),
+                    score_sq_sum = score_sq_sum + VALUES(score_sq_sum),
+                    labeled_difficulty = VALUES(labeled_difficulty)
+            """, (question_key, (question_text or "")[:255], category, difficulty,
+                  0 if skipped else 1, 1 if skipped else 0, score, score * score))
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"❌ Error recording question attempt: {e}")
+            return False
+
+    def get_question_stats_since(self, watermark, until):
+        """Get question statistics changed in [watermark, until)"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor(dictionary=True)
+        if watermark:
+            cursor.execute("""
+                SELECT * FROM question_stats WHERE updated_at >= %s AND updated_at < %s
+            """, (watermark, until))
+        else:
+            cursor.execute("SELECT * FROM question_stats WHERE updated_at < %s", (until,))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def save_question_calibration(self, rows):
+        """Store calibration results; rows are (estimated_difficulty, median_seconds, question_key)"""
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            # Assigning updated_at to itself keeps calibration from marking rows as changed
+            cursor.executemany("""
+                UPDATE question_stats
+                SET estimated_difficulty = %s, median_seconds = %s, calibrated_at = NOW(),
+                    updated_at = updated_at
+                WHERE question_key = %s
+            """, rows)
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"❌ Error saving calibration: {e}")
+            return False
+
+    def get_mislabeled_questions(self, limit=50):
+        """Get questions whose estimated difficulty disagrees with their label"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT * FROM question_stats
+            WHERE estimated_difficulty IS NOT NULL AND estimated_difficulty != labeled_difficulty
+            ORDER BY answers + skips DESC
+            LIMIT %s
+        """, (limit,))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def get_database_time(self):
+        """The database server's current time, the clock that stamps updated_at columns"""
+        if not self.connection:
+            return None
+
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT NOW(6)")
+        now = cursor.fetchone()[0]
+        cursor.close()
+        return now
+
+    def get_job_watermark(self, job_name):
+        """Get the point a background job has processed up to"""
+        if not self.connection:
+            return None
+
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT watermark FROM job_watermarks WHERE job_name = %s", (job_name,))
+        row = cursor.fetchone()
+        cursor.close()
+        return row[0] if row else None
+
+    def set_job_watermark(self, job_name, watermark):
+        """Advance a background job's watermark"""
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO job_watermarks (job_name, watermark) VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE watermark = VALUES(watermark)
+            """, (job_name, watermark))
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"❌ Error saving watermark: {e}")
+            return False
+
+    # ============ RESPONSE TIME OPERATIONS ============
+
+    def save_response_time_buckets(self, rows):
+        """Add samples to response time histograms; rows are (scope, scope_key, bucket, samples)"""
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany("""
+                INSERT INTO response_time_buckets (scope, scope_key, bucket, samples)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE samples = samples + VALUES(samples)
+            """, rows)
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"❌ Error saving response times: {e}")
+            return False
+
+    def get_response_time_buckets(self, scope, keys):
+        """Get histogram buckets for some keys within a scope"""
+        if not self.connection or not keys:
+            return []
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT scope_key, bucket, samples FROM response_time_buckets
+            WHERE scope = %s AND scope_key IN (""" + ", ".join(["%s"] * len(keys)) + """)
+        """, (scope, *keys))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def get_question_time_buckets(self):
+        """Get response time buckets for every timed database question"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT q.id, q.question_text, q.estimated_time, b.bucket, b.samples
+            FROM response_time_buckets b
+            JOIN questions q ON q.id = CAST(SUBSTRING(b.scope_key, 2) AS UNSIGNED)
+            WHERE b.scope = 'question' AND b.scope_key LIKE 'q%'
+        """)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    # ============ RATING OPERATIONS ============
+
+    def get_skill_ratings(self, user_id):
+        """Get a student's per-category skill ratings"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT category, rating, answers FROM student_skill_ratings WHERE user_id = %s
+        """, (user_id,))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def get_question_ratings(self):
+        """Get every stored question rating"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("SELECT question_key, rating, answers FROM question_ratings")
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def save_answer_ratings(self, user_id, category, rating, answers, question_key, question_rating,
+                            question_answers):
+        """Store the student and question ratings produced by one answer"""
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO student_skill_ratings (user_id, category, rating, answers)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE rating = VALUES(rating), answers = VALUES(answers)
+            """, (user_id, category, rating, answers))
+            cursor.execute("""
+                INSERT INTO question_ratings (question_key, rating, answers)
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE rating = VALUES(rating), answers = VALUES(answers)
+            """, (question_key, question_rating, question_answers))
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            self.connection.rollback()
+            print(f"❌ Error saving ratings: {e}")
+            return False
+
+    # ============ ACHIEVEMENT OPERATIONS ============
+    
+    def get_all_achievements(self):
+        """Get all achievements"""
+        if not self.connection:
+            return []
+        
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM achievements ORDER BY points")
+        achievements = cursor.fetchall()
+        cursor.close()
+        return achievements
+
+    def get_user_achievements(self, user_id):
+        """Get achievements earned by user"""
+        if not self.connection:
+            return []
+        
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT a.*, ua.earned_at 
+            FROM achievements a
+            JOIN user_achievements ua ON a.id = ua.achievement_id
+            WHERE ua.user_id = %s
+            ORDER BY ua.earned_at DESC
+        """, (user_id,))
+        achievements = cursor.fetchall()
+        cursor.close()
+        return achievements
+
+    def award_achievement(self, user_id, achievement_id):
+        """Award achievement to user"""
+        if not self.connection:
+            return False
+        
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                INSERT IGNORE INTO user_achievements (user_id, achievement_id)
+                VALUES (%s, %s)
+            """, (user_id, achievement_id))
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"❌ Error awarding achievement: {e}")
+            return False
+
+    def check_and_award_achievements(self, user_id):
+        """Check conditions and award relevant achievements"""
+        student = self.get_student_by_user_id(user_id)
+        if not student:
+            return []
+        
+        awarded = []
+        achievements = self.get_all_achievements()
+        
+        for achievement in achievements:
+            requirement_type = achievement['requirement_type']
+            requirement_value = achievement['requirement_value']
+            
+            should_award = False
+            
+            if requirement_type == 'interviews_completed':
+                should_award = student['total_interviews'] >= requirement_value
+            elif requirement_type == 'single_score':
+                should_award = student['total_score'] >= requirement_value
+            elif requirement_type == 'avg_score':
+                should_award = student['avg_score'] >= requirement_value
+            
+            if should_award:
+                if self.award_achievement(user_id, achievement['id']):
+                    awarded.append(achievement)
+        
+        return awarded
+
+    # ============ XP OPERATIONS ============
+
+    def get_user_xp(self, user_id):
+        """Get a user's XP from the rollup table"""
+        if not self.connection:
+            return 0
+
+        cursor = self.connection.cursor()
+        cursor.execute(USER_XP_SQL, (user_id,))
+        row = cursor.fetchone()
+        cursor.close()
+        return row[0] if row else 0
+
+    def save_xp_entries(self, entries, totals):
+        """Append ledger entries and apply per-user totals to the rollup in one transaction"""
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany("""
+                INSERT INTO xp_ledger (user_id, amount, source, reference_id, created_at)
+                VALUES (%s, %s, %s, %s, %s)
+            """, entries)
+            cursor.executemany("""
+                INSERT INTO user_xp (user_id, total_xp) VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE total_xp = total_xp + VALUES(total_xp)
+            """, list(totals.items()))
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            self.connection.rollback()
+            print(f"❌ Error saving XP entries: {e}")
+            return False
+
+    def compact_xp_ledger(self, cutoff):
+        """Replace ledger rows older than cutoff with one summary row per user"""
+        if not self.connection:
+            return 0
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SELECT MAX(id) FROM xp_ledger WHERE created_at < %s", (cutoff,))
+            max_id = cursor.fetchone()[0]
+            if max_id is None:
+                cursor.close()
+                return 0
+
+            cursor.execute("""
+                INSERT INTO xp_ledger (user_id, amount, source, created_at)
+                SELECT user_id, SUM(amount), 'compacted', %s
+                FROM xp_ledger
+                WHERE id <= %s AND created_at < %s
+                GROUP BY user_id
+            """, (cutoff, max_id, cutoff))
+            cursor.execute("""
+                DELETE FROM xp_ledger WHERE id <= %s AND created_at < %s
+            """, (max_id, cutoff))
+            removed = cursor.rowcount
+            self.connection.commit()
+            cursor.close()
+            return removed
+        except Error as e:
+            self.connection.rollback()
+            print(f"❌ Error compacting XP ledger: {e}")
+            return 0
+
+    # ============ CHALLENGE OPERATIONS ============
+
+    def get_challenge_progress(self, user_id, day):
+        """Get a user's challenge progress rows for one day"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT challenge_id, progress, completed_at FROM daily_challenge_progress
+            WHERE user_id = %s AND challenge_day = %s
+        """, (user_id, day))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def save_challenge_progress(self, rows):
+        """Upsert challenge counters; rows are (user_id, day, challenge_id, progress, completed)"""
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany("""
+                INSERT INTO daily_challenge_progress (user_id, challenge_day, challenge_id, progress, completed_at)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE progress = VALUES(progress),
+                    completed_at = COALESCE(completed_at, VALUES(completed_at))
+            """, [(user_id, day, challenge_id, progress, datetime.now() if completed else None)
+                  for user_id, day, challenge_id, progress, completed in rows])
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"❌ Error saving challenge progress: {e}")
+            return False
+
+    # ============ ACTIVITY OPERATIONS ============
+
+    def get_activity_bitmap(self, user_id):
+        """Get a user's daily activity bitmap"""
+        if not self.connection:
+            return None
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("SELECT start_day, bitmap FROM user_activity WHERE user_id = %s", (user_id,))
+        row = cursor.fetchone()
+        cursor.close()
+        if row:
+            row["bitmap"] = bytes(row["bitmap"])
+        return row
+
+    def save_activity_bitmap(self, user_id, start_day, bitmap):
+        """Store a user's daily activity bitmap"""
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO user_activity (user_id, start_day, bitmap) VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE start_day = VALUES(start_day), bitmap = VALUES(bitmap)
+            """, (user_id, start_day, bitmap))
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"❌ Error saving activity: {e}")
+            return False
+
+    # ============ TOURNAMENT OPERATIONS ============
+
+    def get_tournaments(self):
+        """Get upcoming and running tournaments"""
+        if not self.connection:
+            return self.get_fallback_tournaments()
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT *, tournament_type AS type FROM tournaments
+            WHERE status != 'completed'
+            ORDER BY start_at
+        """)
+        tournaments = cursor.fetchall()
+        cursor.close()
+        return tournaments
+
+    def get_fallback_tournaments(self):
+        """Fallback tournaments when database is not available"""
+        return [
+            {"id": 1, "name": "Weekly Championship", "icon": "🏆", "type": "featured",
+             "description": "Compete against other candidates for the top spot!",
+             "entry_fee": 0, "prize_pool": 5000, "capacity": 256, "participants": 0,
+             "round_count": 1, "round_minutes": 120, "start_at": None, "status": "coming_soon"},
+        ]
+
+    def get_tournament(self, tournament_id):
+        """Get tournament by ID"""
+        if not self.connection:
+            return None
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("SELECT *, tournament_type AS type FROM tournaments WHERE id = %s", (tournament_id,))
+        tournament = cursor.fetchone()
+        cursor.close()
+        return tournament
+
+    def get_user_tournament_ids(self, user_id):
+        """Get IDs of tournaments a user is registered for"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT tournament_id FROM tournament_registrations WHERE user_id = %s", (user_id,))
+        ids = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        return ids
+
+    def is_registered_for_tournament(self, tournament_id, user_id):
+        """Check whether a user is registered for a tournament"""
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT 1 FROM tournament_registrations WHERE tournament_id = %s AND user_id = %s
+        """, (tournament_id, user_id))
+        registered = cursor.fetchone() is not None
+        cursor.close()
+        return registered
+
+    def register_for_tournament(self, tournament_id, user_id):
+        """Atomically claim a seat; returns 'registered', 'already_registered', 'full' or 'unavailable'"""
+        if not self.connection:
+            return "unavailable"
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                INSERT IGNORE INTO tournament_registrations (tournament_id, user_id)
+                VALUES (%s, %s)
+            """, (tournament_id, user_id))
+            if cursor.rowcount == 0:
+                self.connection.rollback()
+                cursor.close()
+                return "already_registered"
+
+            # Conditional increment holds the tournament row lock, so
+            # concurrent signups can never push participants past capacity
+            cursor.execute("""
+                UPDATE tournaments SET participants = participants + 1
+                WHERE id = %s AND status = 'open' AND participants < capacity
+            """, (tournament_id,))
+            if cursor.rowcount == 0:
+                self.connection.rollback()
+                cursor.close()
+                return "full"
+
+            self.connection.commit()
+            cursor.close()
+            return "registered"
+        except Error as e:
+            self.connection.rollback()
+            print(f"❌ Error registering for tournament: {e}")
+            return "unavailable"
+
+    def get_due_tournaments(self, now):
+        """Get open tournaments whose start time has passed"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT * FROM tournaments WHERE status = 'open' AND start_at <= %s
+        """, (now,))
+        tournaments = cursor.fetchall()
+        cursor.close()
+        return tournaments
+
+    def open_tournament_round(self, tournament_id, round_number, deck, starts_at, ends_at):
+        """Create a round with its precomputed deck and mark the tournament running"""
+        if not self.connection:
+            return None
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO tournament_rounds (tournament_id, round_number, deck, starts_at, ends_at)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (tournament_id, round_number, json.dumps(deck), starts_at, ends_at))
+            round_id = cursor.lastrowid
+            cursor.execute("""
+                UPDATE tournaments SET status = 'running' WHERE id = %s
+            """, (tournament_id,))
+            self.connection.commit()
+            cursor.close()
+            return round_id
+        except Error as e:
+            self.connection.rollback()
+            print(f"❌ Error opening tournament round: {e}")
+            return None
+
+    def get_open_round(self, tournament_id):
+        """Get the currently open round of a tournament"""
+        if not self.connection:
+            return None
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT * FROM tournament_rounds
+            WHERE tournament_id = %s AND status = 'open'
+            ORDER BY round_number DESC LIMIT 1
+        """, (tournament_id,))
+        round_row = cursor.fetchone()
+        cursor.close()
+        if round_row:
+            round_row["deck"] = json.loads(round_row["deck"])
+        return round_row
+
+    def get_due_rounds(self, now):
+        """Get open rounds whose time is up"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT * FROM tournament_rounds WHERE status = 'open' AND ends_at <= %s
+        """, (now,))
+        rounds = cursor.fetchall()
+        cursor.close()
+        for round_row in rounds:
+            round_row["deck"] = json.loads(round_row["deck"])
+        return rounds
+
+    def claim_tournament_round(self, round_id):
+        """Lock an open round for scoring; returns True only for the caller that got it.
+
+        The lock is held in a new transaction that save_round_scores commits, so a round
+        is marked scored together with its scores and a failed scoring leaves it open.
+        Other engines skip a round that is being scored instead of waiting for it.
+        """
+        if not self.connection:
+            return False
+
+        # Start from a fresh transaction so the submissions read next are current
+        self.connection.commit()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT id FROM tournament_rounds WHERE id = %s AND status = 'open'
+                FOR UPDATE SKIP LOCKED
+            """, (round_id,))
+            claimed = cursor.fetchone() is not None
+            cursor.close()
+        except Error as e:
+            self.connection.rollback()
+            print(f"❌ Error claiming tournament round: {e}")
+            return False
+        if not claimed:
+            self.connection.rollback()
+        return claimed
+
+    def save_tournament_submission(self, round_id, user_id, answers):
+        """Save (or replace) a participant's answers for a round"""
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO tournament_submissions (round_id, user_id, answers)
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE answers = VALUES(answers), submitted_at = CURRENT_TIMESTAMP
+            """, (round_id, user_id, json.dumps(answers)))
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            self.connection.rollback()
+            print(f"❌ Error saving tournament submission: {e}")
+            return False
+
+    def get_round_submissions(self, round_id):
+        """Get all submissions for a round"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT id, user_id, answers FROM tournament_submissions WHERE round_id = %s
+        """, (round_id,))
+        submissions = cursor.fetchall()
+        cursor.close()
+        for submission in submissions:
+            submission["answers"] = json.loads(submission["answers"])
+        return submissions
+
+    def save_round_scores(self, round_id, tournament_id, scores):
+        """Write round scores in batches; scores is a list of (submission_id, user_id, score)"""
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany("""
+                UPDATE tournament_submissions SET score = %s WHERE id = %s
+            """, [(score, submission_id) for submission_id, _, score in scores])
+            cursor.executemany("""
+                UPDATE tournament_registrations SET score = score + %s
+                WHERE tournament_id = %s AND user_id = %s
+            """, [(score, tournament_id, user_id) for _, user_id, score in scores])
+            cursor.execute("""
+                UPDATE tournament_rounds SET status = 'scored' WHERE id = %s
+            """, (round_id,))
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            self.connection.rollback()
+            print(f"❌ Error saving round scores: {e}")
+            return False
+
+    def complete_tournament(self, tournament_id):
+        """Assign final ranks and mark a tournament completed"""
+        if not self.connection:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                UPDATE tournament_registrations r
+                JOIN (
+                    SELECT id, RANK() OVER (ORDER BY score DESC) AS final_rank
+                    FROM tournament_registrations WHERE tournament_id = %s
+                ) ranked ON ranked.id = r.id
+                SET r.final_rank = ranked.final_rank
+            """, (tournament_id,))
+            cursor.execute("""
+                UPDATE tournaments SET status = 'completed' WHERE id = %s
+            """, (tournament_id,))
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            self.connection.rollback()
+            print(f"❌ Error completing tournament: {e}")
+            return False
+
+    def get_tournament_standings(self, tournament_id, limit=10):
+        """Get the top entrants of a tournament by score"""
+        if not self.connection:
+            return []
+
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT r.user_id, u.first_name, u.last_name, r.score, r.final_rank
+            FROM tournament_registrations r
+            JOIN users u ON u.id = r.user_id
+            WHERE r.tournament_id = %s
+            ORDER BY r.score DESC, r.registered_at
+            LIMIT %s
+        """, (tournament_id, limit))
+        standings = cursor.fetchall()
+        cursor.close()
+        return standings
+
+    # ============ ADMIN OPERATIONS ============
+    
+    def get_admin_stats(self):
+        """Get admin dashboard statistics from the rollup tables"""
+        if not self.connection:
+            return self.get_fallback_stats()
+        
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT name, value FROM admin_counters
+            WHERE name IN ('total_students', 'total_interviews', 'score_sum')
+        """)
+        counters = {row['name']: row['value'] for row in cursor.fetchall()}
+        
+        # Last 7 days with completed sessions
+        cursor.execute("""
+            SELECT sessions_completed as total, stat_date as date
+            FROM admin_daily_stats
+            WHERE sessions_completed > 0
+            ORDER BY stat_date DESC LIMIT 7
+        """)
+        weekly_activity = cursor.fetchall()
+        cursor.close()
+        
+        total_interviews = int(counters.get('total_interviews', 0))
+        return {
+            'total_students': int(counters.get('total_students', 0)),
+            'total_interviews': total_interviews,
+            'avg_score': counters.get('score_sum', 0) / total_interviews if total_interviews else 0,
+            'weekly_activity': weekly_activity,
+        }
+
+    def _add_admin_stats(self, cursor, day, new_students=0, sessions_completed=0, score_sum=0):
+        """Add to a day's rollup and the global counters, inside the caller's transaction"""
+        cursor.execute("""
+            INSERT INTO admin_daily_stats (stat_date, new_students, sessions_completed, score_sum)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE new_students = new_students + VALUES(new_students),
+                sessions_completed = sessions_completed + VALUES(sessions_completed),
+                score_sum = score_sum + VALUES(score_sum)
+        """, (day, new_students, sessions_completed, score_sum))
+        cursor.executemany("""
+            INSERT INTO admin_counters (name, value) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE value = value + VALUES(value)
+        """, [(name, value) for name, value in (('total_students', new_students),
+                                                ('total_interviews', sessions_completed),
+                                                ('score_sum', score_sum)) if value])
+
+    def rebuild_admin_stats(self):
+        """Recompute the admin rollups from users and interview_sessions"""
+        if not self.connection:
+            return False
+        
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("DELETE FROM admin_daily_stats")
+            cursor.execute("""
+                INSERT INTO admin_daily_stats (stat_date, sessions_completed, score_sum)
+                SELECT DATE(started_at), COUNT(*), COALESCE(SUM(percentage), 0)
+                FROM interview_sessions WHERE status = 'completed'
+                GROUP BY DATE(started_at)
+            """)
+            cursor.execute("""
+                INSERT INTO admin_daily_stats (stat_date, new_students)
+                SELECT DATE(created_at), COUNT(*) FROM users WHERE role = 'student'
+                GROUP BY DATE(created_at)
+                ON DUPLICATE KEY UPDATE new_students = VALUES(new_students)
+            """)
+            cursor.execute("""
+                REPLACE INTO admin_counters (name, value)
+                SELECT 'total_students', COALESCE(SUM(new_students), 0) FROM admin_daily_stats
+                UNION ALL SELECT 'total_interviews', COALESCE(SUM(sessions_completed), 0) FROM admin_daily_stats
+                UNION ALL SELECT 'score_sum', COALESCE(SUM(score_sum), 0) FROM admin_daily_stats
+            """)
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            self.connection.rollback()
+            print(f"❌ Error rebuilding admin stats: {e}")
+            return False
+
+    def get_fallback_stats(self):
+        """Fallback statistics when database is not available"""
+        return {
+            'total_students': 150,
+            'total_interviews': 500,
+            'avg_score': 72.5,
+            'weekly_activity': []
+        }
+
+    def close(self):
+        """Close database connection"""
+        if self.connection and self.connection.is_connected():
+            self.connection.close()
+            print("✅ Database connection closed")
 
-    def close(self):
-        """Close database connection"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            print("✅ Database connection closed")
 
+# Every public Database method is timed as a "db" span
+instrument_methods(Database, "db")
 
 # Global database instance
 db = Database()
@@ -0,0 +1,25 @@
+"""
+InterviewPro AI - Keyset Pagination
+Opaque page cursors built from a row's sort key and id
+"""
+
+import base64
+import json
+
+
+def encode_cursor(sort_value, row_id):
+    """Cursor pointing just past a row"""
+    raw = json.dumps([sort_value, row_id], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """(sort_value, row_id) from a cursor, or None for a missing or malformed one"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError):
+        return None
@@ -0,0 +1,128 @@
+"""
+InterviewPro AI - Slow Query Log and N+1 Detector
+Listens to every SQL statement run through Database, logs those slower than
+SLOW_QUERY_MS with their parameters, and flags requests that run the same
+statement fingerprint more than N_PLUS_ONE_LIMIT times
+
+With QUERY_STRICT=1, or while app.testing is set, the statement that crosses
+the limit raises NPlusOneError so tests catch the regression.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+import metrics
+import tracing
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+N_PLUS_ONE_LIMIT = int(os.getenv("N_PLUS_ONE_LIMIT", "10"))
+STRICT = os.getenv("QUERY_STRICT") == "1"
+
+# Longest parameter text written to the slow query log
+PARAMS_LOG_LENGTH = 500
+
+# Recent slow queries and flagged requests kept for inspection
+HISTORY = 100
+
+SLOW_QUERIES = metrics.Counter("interviewpro_slow_queries_total",
+                               "Statements slower than SLOW_QUERY_MS, by fingerprint", ("statement",))
+REPEATED_QUERIES = metrics.Counter("interviewpro_repeated_queries_total",
+                                   "Requests that ran one statement more than N_PLUS_ONE_LIMIT times",
+                                   ("route", "statement"))
+metrics.REGISTRY.extend([SLOW_QUERIES, REPEATED_QUERIES])
+
+# fingerprint -> executions, for the request being served on this thread
+_counts = ContextVar("querylog_counts", default=None)
+
+
+class NPlusOneError(RuntimeError):
+    """A request ran one statement more often than the repeat limit allows"""
+
+
+class QueryLog:
+    """Slow query log and per-request repeated statement detection"""
+
+    def __init__(self, slow_ms=SLOW_QUERY_MS, repeat_limit=N_PLUS_ONE_LIMIT, strict=STRICT):
+        self.slow_ms = slow_ms
+        self.repeat_limit = repeat_limit
+        self.strict = strict
+        self.slow = deque(maxlen=HISTORY)       # (time, ms, statement, params)
+        self.repeated = deque(maxlen=HISTORY)   # (time, route, statement, executions)
+        self._lock = threading.Lock()
+        self._strict_request = ContextVar("querylog_strict", default=False)
+
+    def on_query(self, statement, params, seconds):
+        ms = seconds * 1000
+        if ms >= self.slow_ms:
+            shown = repr(params)
+            if len(shown) > PARAMS_LOG_LENGTH:
+                shown = shown[:PARAMS_LOG_LENGTH] + "..."
+            print(f"🐢 Slow query ({ms:.0f} ms): {statement} params={shown}")
+            SLOW_QUERIES.inc(statement)
+            with self._lock:
+                self.slow.append((time.time(), round(ms, 1), statement, shown))
+
+        counts = _counts.get()
+        if counts is None:
+            # Background work outside a request
+            return
+        executions = counts[statement] = counts.get(statement, 0) + 1
+        if executions == self.repeat_limit + 1 and (self.strict or self._strict_request.get()):
+            raise NPlusOneError(f"{statement} ran more than {self.repeat_limit} times in one request")
+
+    def run_counted(self, fn, *args):
+        """Run fn(*args) with its own statement counts; returns (result, counts).
+
+        For work a request fans out to other threads in copies of its context: the copies
+        would otherwise share the request's counts dict and lose concurrent increments.
+        Hand the counts to merge() back on the request's thread.
+        """
+        if _counts.get() is None:
+            return fn(*args), None
+        _counts.set({})
+        return fn(*args), _counts.get()
+
+    def merge(self, counts):
+        """Add counts returned by run_counted to the current request's"""
+        request_counts = _counts.get()
+        if request_counts is None or not counts:
+            return
+        for statement, executions in counts.items():
+            total = request_counts[statement] = request_counts.get(statement, 0) + executions
+            if (total > self.repeat_limit >= total - executions
+                    and (self.strict or self._strict_request.get())):
+                raise NPlusOneError(f"{statement} ran more than {self.repeat_limit} times in one request")
+
+    def begin_request(self, strict=False):
+        _counts.set({})
+        self._strict_request.set(strict)
+
+    def end_request(self, route):
+        """Record every statement the request repeated past the limit; returns them"""
+        counts = _counts.get() or {}
+        _counts.set(None)
+        flagged = [(statement, n) for statement, n in counts.items() if n > self.repeat_limit]
+        for statement, executions in flagged:
+            print(f"⚠️ Possible N+1 on {route}: {executions} x {statement}")
+            REPEATED_QUERIES.inc(route, statement)
+            with self._lock:
+                self.repeated.append((time.time(), route, statement, executions))
+        return flagged
+
+    def instrument_app(self, app):
+        """Count statements per Flask request; strict while app.testing is set"""
+        from flask import request
+
+        tracing.add_query_listener(self.on_query)
+        app.before_request(lambda: self.begin_request(strict=app.testing))
+
+        def finish_request(exc=None):
+            self.end_request(request.url_rule.rule if request.url_rule else request.path)
+
+        app.teardown_request(finish_request)
+
+
+query_log = QueryLog()
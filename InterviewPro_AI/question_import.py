@@ -0,0 +1,194 @@
+"""
+InterviewPro AI - Bulk Question Import
+Validates questions from CSV, JSON or YAML as they are read and inserts them
+in batches inside a single transaction
+
+Records use the questions columns: category (name) or category_id,
+question_type, difficulty, question_text, and optionally ideal_answer,
+keywords (a comma-separated string or a list), points and estimated_time.
+
+Usage: python question_import.py <file.csv|.json|.jsonl|.yaml> [--dry-run]
+"""
+
+import csv
+import io
+import json
+import os
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+# The ENUMs on the questions table in schema.sql
+QUESTION_TYPES = ("technical", "behavioral", "coding", "system_design")
+DIFFICULTIES = ("easy", "medium", "hard")
+
+# Same bounds as the add question form
+POINTS_RANGE = (1, 100)
+TIME_RANGE = (1, 30)
+
+IMPORT_BATCH = 1000
+
+FORMATS = {".csv": "csv", ".json": "json", ".jsonl": "ndjson", ".ndjson": "ndjson",
+           ".yaml": "yaml", ".yml": "yaml"}
+
+
+def import_format(filename):
+    """Format name for a file, from its extension"""
+    fmt = FORMATS.get(os.path.splitext(filename or "")[1].lower())
+    if fmt == "yaml" and not YAML_AVAILABLE:
+        return None
+    return fmt
+
+
+def normalize_text(text):
+    """Question text as compared for duplicates: case and whitespace ignored"""
+    return " ".join(text.split()).lower()
+
+
+def read_records(stream, fmt):
+    """(position, record) pairs from a binary stream; position is the line or item number"""
+    if fmt == "csv":
+        reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == "ndjson":
+        for number, line in enumerate(io.TextIOWrapper(stream, encoding="utf-8-sig"), 1):
+            if line.strip():
+                try:
+                    yield number, json.loads(line)
+                except ValueError as e:
+                    yield number, ValueError(f"invalid JSON: {e}")
+    else:
+        # JSON and YAML documents are parsed whole; records are still validated one by one
+        if fmt == "json":
+            data = json.load(io.TextIOWrapper(stream, encoding="utf-8-sig"))
+        else:
+            try:
+                data = yaml.safe_load(stream)
+            except yaml.YAMLError as e:
+                raise ValueError(str(e))
+        if isinstance(data, dict):
+            data = data.get("questions", [])
+        if not isinstance(data, list):
+            raise ValueError("expected a list of questions")
+        yield from enumerate(data, 1)
+
+
+class QuestionImporter:
+    """Validates, deduplicates and inserts question records.
+
+    Give it a connection of its own: the import is one long transaction that is
+    rolled back whole if the file cannot be read.
+    """
+
+    def __init__(self, database, batch_size=IMPORT_BATCH):
+        self.db = database
+        self.batch_size = batch_size
+        self.categories = {}
+        for category in database.get_question_categories():
+            self.categories[str(category["id"])] = category["id"]
+            self.categories[category["name"].lower()] = category["id"]
+
+    def run(self, stream, fmt, dry_run=False):
+        """Import a file; returns {"inserted", "duplicates", "errors": [(position, message)]}"""
+        report = {"inserted": 0, "duplicates": 0, "errors": []}
+        seen = {normalize_text(text) for text in self.db.get_question_texts()}
+
+        def valid_rows():
+            for position, record in read_records(stream, fmt):
+                try:
+                    if isinstance(record, Exception):
+                        raise record
+                    row = self.validate(record)
+                except ValueError as e:
+                    report["errors"].append((position, str(e)))
+                    continue
+                key = normalize_text(row[3])
+                if key in seen:
+                    report["duplicates"] += 1
+                    continue
+                seen.add(key)
+                yield row
+
+        try:
+            if dry_run:
+                report["inserted"] = sum(1 for _ in valid_rows())
+                return report
+            inserted = self.db.import_questions(valid_rows(), self.batch_size)
+        except (ValueError, UnicodeDecodeError, csv.Error) as e:
+            report["errors"].append((0, f"could not read file: {e}"))
+            return report
+        if inserted is None:
+            report["errors"].append((0, "database error, nothing was imported"))
+        else:
+            report["inserted"] = inserted
+        return report
+
+    def validate(self, record):
+        """A record as a questions row; raises ValueError describing the first problem"""
+        if not isinstance(record, dict):
+            raise ValueError("record is not an object")
+        field = lambda name: str(record.get(name) or "").strip()
+
+        category = field("category_id") or field("category")
+        if not category:
+            raise ValueError("category is missing")
+        category_id = self.categories.get(category.lower())
+        if category_id is None:
+            raise ValueError(f"unknown category '{category}'")
+
+        question_type = field("question_type").lower()
+        if question_type not in QUESTION_TYPES:
+            raise ValueError(f"question_type must be one of {', '.join(QUESTION_TYPES)}")
+        difficulty = field("difficulty").lower()
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"difficulty must be one of {', '.join(DIFFICULTIES)}")
+
+        question_text = field("question_text")
+        if not question_text:
+            raise ValueError("question_text is empty")
+
+        keywords = record.get("keywords")
+        if isinstance(keywords, list):
+            keywords = ",".join(str(k).strip() for k in keywords)
+
+        return (category_id, question_type, difficulty, question_text,
+                field("ideal_answer") or None, (keywords or "").strip() or None,
+                self._bounded(record, "points", 10, POINTS_RANGE),
+                self._bounded(record, "estimated_time", 5, TIME_RANGE))
+
+    @staticmethod
+    def _bounded(record, name, default, bounds):
+        value = record.get(name)
+        if value in (None, ""):
+            return default
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} must be a whole number")
+        if not bounds[0] <= value <= bounds[1]:
+            raise ValueError(f"{name} must be between {bounds[0]} and {bounds[1]}")
+        return value
+
+
+if __name__ == "__main__":
+    import sys
+    from models import Database
+
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    fmt = import_format(path)
+    if not fmt:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(2)
+    database = Database()
+    with open(path, "rb") as source:
+        result = QuestionImporter(database).run(source, fmt, dry_run="--dry-run" in sys.argv)
+    database.close()
+    for position, message in result["errors"]:
+        print(f"❌ {path}:{position}: {message}")
+    print(f"✅ {'Validated' if '--dry-run' in sys.argv else 'Imported'} {result['inserted']} questions "
+          f"({result['duplicates']} duplicates skipped, {len(result['errors'])} errors)")
+    sys.exit(1 if result["errors"] else 0)
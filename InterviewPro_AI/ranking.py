@@ -0,0 +1,232 @@
+"""
+InterviewPro AI - Leaderboard Rank Index
+In-memory order-statistics index over student points
+"""
+
+import random
+import threading
+
+AVATARS = ["🎯", "🚀", "💻", "⭐", "🔥", "💡", "⚡", "🌟", "🧠", "🏅"]
+
+
+class _Node:
+    """Skip list node holding a sort key and per-level links and widths"""
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, levels):
+        self.key = key
+        self.next = [None] * levels
+        self.width = [1] * levels
+
+
+class SkipList:
+    """Indexable skip list: O(log n) insert, remove and rank lookup"""
+
+    MAX_LEVELS = 32
+
+    def __init__(self):
+        self.size = 0
+        self._tail = _Node((float("inf"),), 0)
+        self._head = _Node(None, self.MAX_LEVELS)
+        self._head.next = [self._tail] * self.MAX_LEVELS
+
+    def __len__(self):
+        return self.size
+
+    def _random_level(self):
+        level = 1
+        while level < self.MAX_LEVELS and random.random() < 0.5:
+            level += 1
+        return level
+
+    def insert(self, key):
+        """Insert a key keeping the list sorted"""
+        chain = [None] * self.MAX_LEVELS
+        steps_at_level = [0] * self.MAX_LEVELS
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level].key <= key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        levels = self._random_level()
+        new_node = _Node(key, levels)
+        steps = 0
+        for level in range(levels):
+            prev = chain[level]
+            new_node.next[level] = prev.next[level]
+            prev.next[level] = new_node
+            new_node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, self.MAX_LEVELS):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, key):
+        """Remove a key, raising KeyError if it is not present"""
+        chain = [None] * self.MAX_LEVELS
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target.key != key:
+            raise KeyError(key)
+
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), self.MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+    def index(self, key):
+        """Return the 0-based position of a key, or None if it is not present"""
+        steps = 0
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level].key < key:
+                steps += node.width[level]
+                node = node.next[level]
+        if node.next[0].key != key:
+            return None
+        return steps
+
+    def __getitem__(self, position):
+        """Return the key at a 0-based position"""
+        if position < 0 or position >= self.size:
+            raise IndexError(position)
+        node = self._head
+        remaining = position + 1
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node.key
+
+    def head(self, count):
+        """Return the first `count` keys in order"""
+        keys = []
+        node = self._head.next[0]
+        while node is not self._tail and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+class RankIndex:
+    """Leaderboard ranks by points, updated incrementally as interviews complete"""
+
+    def __init__(self):
+        # Re-entrant so listeners, which run under the lock, can read top() / rank_of()
+        self._lock = threading.RLock()
+        self._list = SkipList()
+        self._entries = {}
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """Call `callback(user_id, old_rank, new_rank, points)` whenever a user's points change
+
+        old_rank is None for a newly ranked user. Every user ranked between old_rank and
+        new_rank shifts by one place, so subscribers can follow their own rank from the
+        stream of moves. Listeners run under the index lock, in the order the moves happen.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, user_id, old_rank, new_rank):
+        for callback in self._listeners:
+            callback(user_id, old_rank, new_rank, self._entries[user_id]["points"])
+
+    @staticmethod
+    def _key(user_id, points):
+        # Highest points first; user_id breaks ties deterministically
+        return (-points, user_id)
+
+    def rebuild(self, rows):
+        """Rebuild the index from database rows (see Database.get_leaderboard_rows)"""
+        with self._lock:
+            self._list = SkipList()
+            self._entries = {}
+            for row in rows:
+                self._set(row["user_id"],
+                          int(row.get("points") or 0),
+                          int(row.get("total_interviews") or 0),
+                          f"{row.get('first_name', '')} {row.get('last_name', '')}".strip())
+        print(f"✅ Leaderboard index rebuilt with {len(self._entries)} students")
+
+    def _set(self, user_id, points, interviews, name):
+        """Store a user's points, returning their (old rank, new rank)"""
+        old_rank = None
+        entry = self._entries.get(user_id)
+        if entry:
+            old_key = self._key(user_id, entry["points"])
+            old_rank = self._list.index(old_key) + 1
+            self._list.remove(old_key)
+        self._entries[user_id] = {"points": points, "interviews": interviews, "name": name}
+        key = self._key(user_id, points)
+        self._list.insert(key)
+        return old_rank, self._list.index(key) + 1
+
+    def add_user(self, user_id, name):
+        """Register a user with zero points if not already ranked"""
+        with self._lock:
+            if user_id in self._entries:
+                return
+            self._notify(user_id, *self._set(user_id, 0, 0, name))
+
+    def record_interview(self, user_id, score, name=None):
+        """Add a completed interview's score to the user's points"""
+        with self._lock:
+            entry = self._entries.get(user_id, {"points": 0, "interviews": 0, "name": name or ""})
+            self._notify(user_id, *self._set(user_id, entry["points"] + int(score), entry["interviews"] + 1,
+                                             entry["name"] or name or ""))
+
+    def add_points(self, user_id, points):
+        """Add points (e.g. XP) to an already ranked user"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if not entry:
+                return
+            self._notify(user_id, *self._set(user_id, entry["points"] + int(points),
+                                             entry["interviews"], entry["name"]))
+
+    def top(self, count=10):
+        """Return the top `count` leaderboard rows"""
+        with self._lock:
+            rows = []
+            for position, (_, user_id) in enumerate(self._list.head(count)):
+                entry = self._entries[user_id]
+                rows.append({
+                    "rank": position + 1,
+                    "user_id": user_id,
+                    "name": entry["name"],
+                    "xp": entry["points"],
+                    "interviews": entry["interviews"],
+                    "avatar": AVATARS[user_id % len(AVATARS)],
+                })
+            return rows
+
+    def rank_of(self, user_id):
+        """Return (rank, points, points to next rank) for a user, or None if unranked"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if not entry:
+                return None
+            position = self._list.index(self._key(user_id, entry["points"]))
+            to_next = 0
+            if position > 0:
+                above_points = -self._list[position - 1][0]
+                to_next = above_points - entry["points"] + 1
+            return position + 1, entry["points"], to_next
+
+    def __len__(self):
+        return len(self._list)
+
+
+# Global rank index
+rank_index = RankIndex()
@@ -13,6 +13,25 @@ SET FOREIGN_KEY_CHECKS = 1;
 -- =================================================================
 -- DROP EXISTING TABLES
 -- =================================================================
+DROP TABLE IF EXISTS archived_partitions;
+DROP TABLE IF EXISTS admin_counters;
+DROP TABLE IF EXISTS admin_daily_stats;
+DROP TABLE IF EXISTS job_watermarks;
+DROP TABLE IF EXISTS question_stats;
+DROP TABLE IF EXISTS response_time_buckets;
+DROP TABLE IF EXISTS review_schedule;
+DROP TABLE IF EXISTS question_ratings;
+DROP TABLE IF EXISTS student_skill_ratings;
+DROP TABLE IF EXISTS student_category_stats;
+DROP TABLE IF EXISTS student_analytics;
+DROP TABLE IF EXISTS daily_challenge_progress;
+DROP TABLE IF EXISTS user_activity;
+DROP TABLE IF EXISTS user_xp;
+DROP TABLE IF EXISTS xp_ledger;
+DROP TABLE IF EXISTS tournament_submissions;
+DROP TABLE IF EXISTS tournament_rounds;
+DROP TABLE IF EXISTS tournament_registrations;
+DROP TABLE IF EXISTS tournaments;
 DROP TABLE IF EXISTS user_achievements;
 DROP TABLE IF EXISTS achievements;
 DROP TABLE IF EXISTS evaluations;
@@ -60,7 +79,10 @@ CREATE TABLE students (
     
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     INDEX idx_target_role (target_role),
-    INDEX idx_experience (experience_level)
+    INDEX idx_interviews (total_interviews),
+    INDEX idx_avg_score (avg_score),
+    INDEX idx_level_interviews (experience_level, total_interviews),
+    INDEX idx_level_score (experience_level, avg_score)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- =================================================================
@@ -92,16 +114,15 @@ CREATE TABLE questions (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
     FOREIGN KEY (category_id) REFERENCES question_categories(id) ON DELETE CASCADE,
-    INDEX idx_category (category_id),
-    INDEX idx_type (question_type),
-    INDEX idx_difficulty (difficulty)
+    INDEX idx_active_type_difficulty (is_active, question_type, difficulty),
+    INDEX idx_category_active_difficulty (category_id, is_active, difficulty)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- =================================================================
 -- INTERVIEW SESSIONS TABLE - Session tracking
 -- =================================================================
 CREATE TABLE interview_sessions (
-    id INT AUTO_INCREMENT PRIMARY KEY,
+    id INT AUTO_INCREMENT,
     student_id INT NOT NULL,
     session_type ENUM('technical', 'behavioral', 'mixed', 'coding') NOT NULL DEFAULT 'mixed',
     difficulty ENUM('easy', 'medium', 'hard') DEFAULT 'medium',
@@ -119,22 +140,27 @@ CREATE TABLE interview_sessions (
     
     -- Status
     status ENUM('in_progress', 'completed', 'abandoned') DEFAULT 'in_progress',
-    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     completed_at TIMESTAMP NULL,
     
-    FOREIGN KEY (student_id) REFERENCES users(id) ON DELETE CASCADE,
-    INDEX idx_student (student_id),
-    INDEX idx_status (status),
-    INDEX idx_completed_at (completed_at)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+    -- Monthly partitions (no foreign keys; the key includes the partition column)
+    PRIMARY KEY (id, started_at),
+    INDEX idx_student_started (student_id, started_at),
+    INDEX idx_status_started (status, started_at),
+    INDEX idx_started_at (started_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+PARTITION BY RANGE (UNIX_TIMESTAMP(started_at)) (
+    PARTITION p_future VALUES LESS THAN MAXVALUE
+);
 
 -- =================================================================
 -- EVALUATIONS TABLE - AI evaluations
 -- =================================================================
 CREATE TABLE evaluations (
-    id INT AUTO_INCREMENT PRIMARY KEY,
+    id INT AUTO_INCREMENT,
     session_id INT NOT NULL,
-    question_id INT NOT NULL,
+    question_id INT NULL,                 -- NULL for built-in question bank questions
+    question_type ENUM('technical', 'behavioral', 'coding', 'system_design') NULL,
     answer_text TEXT,
     score DECIMAL(5,2) DEFAULT 0,
     max_score DECIMAL(5,2) DEFAULT 10,
@@ -143,12 +169,17 @@ CREATE TABLE evaluations (
     improvements TEXT,
     keywords_found TEXT,
     keywords_missing TEXT,
-    evaluated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    evaluated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     
-    FOREIGN KEY (session_id) REFERENCES interview_sessions(id) ON DELETE CASCADE,
-    FOREIGN KEY (question_id) REFERENCES questions(id) ON DELETE CASCADE,
-    INDEX idx_session (session_id)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+    -- Monthly partitions (no foreign keys; the key includes the partition column)
+    PRIMARY KEY (id, evaluated_at),
+    INDEX idx_session_evaluated (session_id, evaluated_at),
+    INDEX idx_question (question_id),
+    INDEX idx_evaluated_at (evaluated_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+PARTITION BY RANGE (UNIX_TIMESTAMP(evaluated_at)) (
+    PARTITION p_future VALUES LESS THAN MAXVALUE
+);
 
 -- =================================================================
 -- ACHIEVEMENTS TABLE - Gamification badges
@@ -180,6 +211,279 @@ CREATE TABLE user_achievements (
     INDEX idx_user (user_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- =================================================================
+-- XP LEDGER TABLE - Append-only record of every XP change
+-- =================================================================
+CREATE TABLE xp_ledger (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    amount INT NOT NULL,
+    source VARCHAR(50) NOT NULL,
+    reference_id VARCHAR(100),
+    created_at DATETIME NOT NULL,
+    
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    INDEX idx_user (user_id, id),
+    INDEX idx_created_at (created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- USER XP TABLE - Per-user XP rollup maintained with each ledger batch
+-- =================================================================
+CREATE TABLE user_xp (
+    user_id INT PRIMARY KEY,
+    total_xp INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- USER ACTIVITY TABLE - One bit per day, bit 0 is start_day (ordinal)
+-- =================================================================
+CREATE TABLE user_activity (
+    user_id INT PRIMARY KEY,
+    start_day INT NOT NULL,
+    bitmap VARBINARY(4096) NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- DAILY CHALLENGE PROGRESS TABLE - Per-user counters for each day
+-- =================================================================
+CREATE TABLE daily_challenge_progress (
+    user_id INT NOT NULL,
+    challenge_day DATE NOT NULL,
+    challenge_id INT NOT NULL,
+    progress INT NOT NULL DEFAULT 0,
+    completed_at TIMESTAMP NULL,
+    
+    PRIMARY KEY (user_id, challenge_day, challenge_id),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- TOURNAMENTS TABLE - Competitive events
+-- =================================================================
+CREATE TABLE tournaments (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(150) NOT NULL,
+    description TEXT,
+    icon VARCHAR(50),
+    tournament_type ENUM('featured', 'technical', 'behavioral', 'advanced') NOT NULL DEFAULT 'featured',
+    entry_fee INT DEFAULT 0,
+    prize_pool INT DEFAULT 0,
+    capacity INT NOT NULL DEFAULT 256,
+    participants INT DEFAULT 0,
+    round_count INT DEFAULT 1,
+    questions_per_round INT DEFAULT 5,
+    round_minutes INT DEFAULT 30,
+    start_at DATETIME NOT NULL,
+    status ENUM('coming_soon', 'open', 'running', 'completed') DEFAULT 'open',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    INDEX idx_status_start (status, start_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- TOURNAMENT REGISTRATIONS TABLE - Entrants and running scores
+-- =================================================================
+CREATE TABLE tournament_registrations (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    tournament_id INT NOT NULL,
+    user_id INT NOT NULL,
+    score INT DEFAULT 0,
+    final_rank INT NULL,
+    registered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    FOREIGN KEY (tournament_id) REFERENCES tournaments(id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    UNIQUE KEY unique_registration (tournament_id, user_id),
+    INDEX idx_standings (tournament_id, score),
+    INDEX idx_user (user_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- TOURNAMENT ROUNDS TABLE - Timed rounds with a shared question deck
+-- =================================================================
+CREATE TABLE tournament_rounds (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    tournament_id INT NOT NULL,
+    round_number INT NOT NULL,
+    deck JSON NOT NULL,
+    starts_at DATETIME NOT NULL,
+    ends_at DATETIME NOT NULL,
+    status ENUM('open', 'closed', 'scored') DEFAULT 'open',
+    
+    FOREIGN KEY (tournament_id) REFERENCES tournaments(id) ON DELETE CASCADE,
+    UNIQUE KEY unique_round (tournament_id, round_number),
+    INDEX idx_status_end (status, ends_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- TOURNAMENT SUBMISSIONS TABLE - Answers per round per entrant
+-- =================================================================
+CREATE TABLE tournament_submissions (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    round_id INT NOT NULL,
+    user_id INT NOT NULL,
+    answers JSON NOT NULL,
+    score INT NULL,
+    submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    FOREIGN KEY (round_id) REFERENCES tournament_rounds(id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    UNIQUE KEY unique_submission (round_id, user_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- STUDENT CATEGORY STATS TABLE - Running score aggregates per category
+-- =================================================================
+CREATE TABLE student_category_stats (
+    user_id INT NOT NULL,
+    category VARCHAR(100) NOT NULL,
+    answers INT NOT NULL DEFAULT 0,
+    score_sum DOUBLE NOT NULL DEFAULT 0,
+    score_sq_sum DOUBLE NOT NULL DEFAULT 0,
+    last_seen_at DATETIME NULL,
+    
+    PRIMARY KEY (user_id, category),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- QUESTION STATS TABLE - Running answer statistics per question
+-- =================================================================
+CREATE TABLE question_stats (
+    question_key VARCHAR(64) PRIMARY KEY,
+    question_text VARCHAR(255),
+    category VARCHAR(100),
+    labeled_difficulty ENUM('easy', 'medium', 'hard'),
+    answers INT NOT NULL DEFAULT 0,
+    skips INT NOT NULL DEFAULT 0,
+    score_sum DOUBLE NOT NULL DEFAULT 0,
+    score_sq_sum DOUBLE NOT NULL DEFAULT 0,
+    
+    -- Filled in by the calibration job
+    median_seconds INT NULL,
+    estimated_difficulty ENUM('easy', 'medium', 'hard') NULL,
+    calibrated_at DATETIME NULL,
+    updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    
+    INDEX idx_updated_at (updated_at),
+    INDEX idx_estimated_difficulty (estimated_difficulty)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- ARCHIVED PARTITIONS TABLE - Session history exported by archive.py
+-- =================================================================
+CREATE TABLE archived_partitions (
+    table_name VARCHAR(64) NOT NULL,
+    partition_name VARCHAR(64) NOT NULL,
+    path VARCHAR(500) NOT NULL,
+    row_count INT NOT NULL DEFAULT 0,
+    range_start DATETIME NULL,
+    range_end DATETIME NOT NULL,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (table_name, partition_name),
+    INDEX idx_table_end (table_name, range_end)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- ADMIN DAILY STATS TABLE - Per-day rollup for the admin dashboard
+-- =================================================================
+CREATE TABLE admin_daily_stats (
+    stat_date DATE PRIMARY KEY,
+    new_students INT NOT NULL DEFAULT 0,
+    sessions_completed INT NOT NULL DEFAULT 0,
+    score_sum DOUBLE NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- ADMIN COUNTERS TABLE - Global totals for the admin dashboard
+-- =================================================================
+CREATE TABLE admin_counters (
+    name VARCHAR(50) PRIMARY KEY,
+    value DOUBLE NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- JOB WATERMARKS TABLE - Progress markers for incremental jobs
+-- =================================================================
+CREATE TABLE job_watermarks (
+    job_name VARCHAR(50) PRIMARY KEY,
+    watermark DATETIME(6) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- RESPONSE TIME BUCKETS TABLE - Time-to-answer histograms
+-- =================================================================
+CREATE TABLE response_time_buckets (
+    scope ENUM('question', 'student', 'interview') NOT NULL,
+    scope_key VARCHAR(64) NOT NULL,
+    bucket SMALLINT NOT NULL,
+    samples INT NOT NULL DEFAULT 0,
+    
+    PRIMARY KEY (scope, scope_key, bucket)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- REVIEW SCHEDULE TABLE - SM-2 spaced repetition per student and question
+-- =================================================================
+CREATE TABLE review_schedule (
+    student_id INT NOT NULL,
+    question_id INT NOT NULL,
+    category_id INT NOT NULL,
+    ease DOUBLE NOT NULL DEFAULT 2.5,
+    interval_days INT NOT NULL DEFAULT 0,
+    repetitions INT NOT NULL DEFAULT 0,
+    due_at DATETIME NOT NULL,
+    last_reviewed_at DATETIME NULL,
+    
+    PRIMARY KEY (student_id, question_id),
+    FOREIGN KEY (student_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (question_id) REFERENCES questions(id) ON DELETE CASCADE,
+    INDEX idx_due (student_id, category_id, due_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- STUDENT SKILL RATINGS TABLE - Elo-style rating per student and category
+-- =================================================================
+CREATE TABLE student_skill_ratings (
+    user_id INT NOT NULL,
+    category VARCHAR(100) NOT NULL,
+    rating DOUBLE NOT NULL,
+    answers INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (user_id, category),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- QUESTION RATINGS TABLE - Elo-style difficulty per question bank entry
+-- =================================================================
+CREATE TABLE question_ratings (
+    question_key VARCHAR(64) PRIMARY KEY,
+    rating DOUBLE NOT NULL,
+    answers INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =================================================================
+-- STUDENT ANALYTICS TABLE - Cached per-student analytics aggregates
+-- =================================================================
+CREATE TABLE student_analytics (
+    user_id INT PRIMARY KEY,
+    payload JSON NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- =================================================================
 -- INSERT SAMPLE DATA
 -- =================================================================
@@ -236,6 +540,13 @@ INSERT INTO achievements (name, description, icon, category, requirement_type, r
 ('Coding Champion', 'Completed 10 coding challenges', '💻', 'milestone', 'coding_challenges', 10, 35),
 ('System Design Expert', 'Completed 5 system design interviews', '🔧', 'milestone', 'system_design', 5, 45);
 
+-- Insert tournaments
+INSERT INTO tournaments (name, description, icon, tournament_type, entry_fee, prize_pool, capacity, round_count, questions_per_round, round_minutes, start_at, status) VALUES
+('Weekly Championship', 'Compete against other candidates for the top spot!', '🏆', 'featured', 0, 5000, 512, 3, 5, 40, DATE_ADD(NOW(), INTERVAL 3 DAY), 'open'),
+('Technical Focus', 'Data structures & algorithms intensive tournament.', '🎯', 'technical', 500, 3000, 256, 2, 6, 45, DATE_ADD(NOW(), INTERVAL 1 DAY), 'open'),
+('Behavioral Round', 'Master soft skills and behavioral questions.', '💬', 'behavioral', 0, 2000, 256, 1, 5, 60, DATE_ADD(NOW(), INTERVAL 2 DAY), 'open'),
+('System Design', 'Complex system design challenges.', '🏗️', 'advanced', 1000, 8000, 128, 1, 3, 180, DATE_ADD(NOW(), INTERVAL 7 DAY), 'coming_soon');
+
 -- =================================================================
 -- VERIFICATION QUERIES
 -- =================================================================
@@ -0,0 +1,313 @@
+"""
+InterviewPro AI - Question Search
+In-memory inverted index over database and question bank questions, ranked
+with BM25, with prefix matching for autocomplete
+
+Each term's postings are kept ordered by their BM25 impact and a query walks
+only the best POSTINGS_CAP of them, so common terms cost the same as rare
+ones. Autocomplete answers for a single partly typed word are computed once
+per prefix and kept until a document containing a matching term changes.
+"""
+
+import bisect
+import heapq
+import math
+import re
+import threading
+
+from adaptive import question_key
+from ai_engine import QUESTION_BANK
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Term weights per field; a keyword or title hit counts for more than one in the answer
+FIELD_WEIGHTS = (("question_text", 2), ("keywords", 2), ("ideal_answer", 1))
+
+# Completions of the last query term that take part in an autocomplete query
+PREFIX_EXPANSIONS = 20
+
+# Postings scored per query term, highest impact first
+POSTINGS_CAP = 200
+
+# Postings scored per completion of a partly typed term; completions are only guesses
+COMPLETION_POSTINGS_CAP = 40
+
+# Suggestions kept per prefix; autocomplete limits above this fall back to a search
+SUGGESTIONS = 10
+
+# Relative change in average document length before length norms are recomputed
+NORM_DRIFT = 0.1
+
+STOPWORDS = frozenset("""
+a an and are as at be between by can do does for from how i in is it of on or
+the this to what when where which who why with you your
+""".split())
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+# Question bank categories whose key is not the slug of the database category name
+CATEGORY_ALIASES = {"object_oriented_programming": "oop"}
+
+
+def tokenize(text):
+    return [t for t in TOKEN.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def category_slug(name):
+    """Category filter key shared by database category names and question bank keys"""
+    slug = "_".join(TOKEN.findall((name or "").lower()))
+    return CATEGORY_ALIASES.get(slug, slug)
+
+
+class QuestionSearch:
+    """BM25 search over questions; documents can be added and removed at any time"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._docs = {}        # doc id -> question summary
+        self._keys = {}        # (source, id) -> doc id
+        self._postings = {}    # term -> {doc id: weighted term frequency}
+        self._lengths = {}     # doc id -> weighted length
+        self._doc_terms = {}   # doc id -> indexed terms, so removal touches only its postings
+        self._terms = []       # sorted vocabulary, for prefix lookups
+        self._norms = {}       # doc id -> BM25 length normalisation
+        self._ranked = {}      # term -> [(-impact, doc id)] best first, built on first use
+        self._expansions = {}  # prefix -> its PREFIX_EXPANSIONS most common completions
+        self._suggestions = {} # prefix -> best doc ids for that single partly typed word
+        self._filters = {}     # ("category" | "difficulty", value) -> doc ids
+        self._combined = {}    # (category, difficulty) -> doc ids matching both
+        self._norm_avg = 0.0
+        self._total_length = 0
+        self._next_doc = 0
+        self.last_db_id = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    # ============ INDEXING ============
+
+    def add(self, source, key, question_text, ideal_answer=None, keywords=None,
+            category=None, difficulty=None, question_type=None):
+        """Index a question, replacing any earlier version with the same source and key"""
+        if isinstance(keywords, (list, tuple)):
+            keywords = " ".join(keywords)
+        fields = {"question_text": question_text, "ideal_answer": ideal_answer, "keywords": keywords}
+        frequencies = {}
+        for field, weight in FIELD_WEIGHTS:
+            for term in tokenize(fields[field]):
+                frequencies[term] = frequencies.get(term, 0) + weight
+
+        with self._lock:
+            self.remove(source, key)
+            doc = self._next_doc
+            self._next_doc += 1
+            self._keys[(source, key)] = doc
+            self._docs[doc] = {"source": source, "id": key, "question_text": question_text,
+                               "category": category_slug(category), "difficulty": difficulty,
+                               "question_type": question_type}
+            self._filters.setdefault(("category", category_slug(category)), set()).add(doc)
+            self._filters.setdefault(("difficulty", difficulty), set()).add(doc)
+            self._combined.clear()
+            length = sum(frequencies.values())
+            self._lengths[doc] = length
+            self._total_length += length
+            norm = self._norms[doc] = self._norm(length)
+            for term, frequency in frequencies.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    bisect.insort(self._terms, term)
+                postings[doc] = frequency
+                ranked = self._ranked.get(term)
+                if ranked is not None:
+                    bisect.insort(ranked, (-frequency / (frequency + norm), doc))
+            self._doc_terms[doc] = list(frequencies)
+            self._invalidate(frequencies)
+
+    def remove(self, source, key):
+        """Drop a question from the index; returns False if it was not indexed"""
+        with self._lock:
+            doc = self._keys.pop((source, key), None)
+            if doc is None:
+                return False
+            summary = self._docs.pop(doc)
+            self._filters[("category", summary["category"])].discard(doc)
+            self._filters[("difficulty", summary["difficulty"])].discard(doc)
+            self._combined.clear()
+            norm = self._norms.pop(doc)
+            self._total_length -= self._lengths.pop(doc)
+            terms = self._doc_terms.pop(doc)
+            for term in terms:
+                postings = self._postings[term]
+                frequency = postings.pop(doc)
+                ranked = self._ranked.get(term)
+                if ranked is not None:
+                    del ranked[bisect.bisect_left(ranked, (-frequency / (frequency + norm), doc))]
+                if not postings:
+                    del self._postings[term]
+                    self._ranked.pop(term, None)
+                    del self._terms[bisect.bisect_left(self._terms, term)]
+            self._invalidate(terms)
+            return True
+
+    def _invalidate(self, terms):
+        """Forget the prefix completions and suggestions a changed document took part in"""
+        if not self._expansions and not self._suggestions:
+            return
+        for term in terms:
+            for end in range(1, len(term) + 1):
+                self._expansions.pop(term[:end], None)
+                self._suggestions.pop(term[:end], None)
+
+    def add_question_bank(self, question_bank=QUESTION_BANK):
+        for category, levels in question_bank.items():
+            for difficulty, questions in levels.items():
+                for q in questions:
+                    self.add("bank", question_key(q["q"]), q["q"], q["a"], q["keywords"],
+                             category, difficulty)
+
+    def refresh(self, database):
+        """Index database questions added or reactivated since the last refresh and drop
+        those no longer active; returns how many were indexed"""
+        # Questions are often written on other connections; read past this one's snapshot
+        database.end_snapshot()
+        active = database.get_active_question_ids()
+        with self._lock:
+            indexed = {key for source, key in self._keys if source == "db"}
+        for key in indexed - active:
+            self.remove("db", key)
+        rows = database.get_searchable_questions(self.last_db_id)
+        reactivated = sorted(key for key in active - indexed if key <= self.last_db_id)
+        if reactivated:
+            rows += database.get_searchable_questions(ids=reactivated)
+        for row in rows:
+            self.add("db", row["id"], row["question_text"], row["ideal_answer"],
+                     (row["keywords"] or "").replace(",", " "), row["category"],
+                     row["difficulty"], row["question_type"])
+            self.last_db_id = max(self.last_db_id, row["id"])
+        return len(rows)
+
+    def _norm(self, length):
+        return K1 * (1 - B + B * length / (self._norm_avg or 1))
+
+    def _check_norms(self):
+        """Recompute length norms once the average length has drifted"""
+        average = self._total_length / len(self._docs)
+        if abs(average - self._norm_avg) > NORM_DRIFT * (self._norm_avg or 0):
+            self._norm_avg = average
+            self._norms = {doc: self._norm(length) for doc, length in self._lengths.items()}
+            self._ranked.clear()
+            self._suggestions.clear()
+
+    def _ranked_postings(self, term):
+        """A term's postings as (-impact, doc id), highest impact first"""
+        ranked = self._ranked.get(term)
+        if ranked is None:
+            norms = self._norms
+            ranked = self._ranked[term] = sorted(
+                (-frequency / (frequency + norms[doc]), doc)
+                for doc, frequency in self._postings[term].items())
+        return ranked
+
+    def _allowed(self, category, difficulty):
+        """Doc ids passing the filters, or None when there are none"""
+        if not category and not difficulty:
+            return None
+        if not difficulty:
+            return self._filters.get(("category", category), set())
+        if not category:
+            return self._filters.get(("difficulty", difficulty), set())
+        combined = self._combined.get((category, difficulty))
+        if combined is None:
+            combined = self._combined[(category, difficulty)] = (
+                self._filters.get(("category", category), set())
+                & self._filters.get(("difficulty", difficulty), set()))
+        return combined
+
+    # ============ QUERIES ============
+
+    def search(self, query, category=None, difficulty=None, limit=20, prefix=False):
+        """Best matches for a query, highest score first.
+
+        With prefix=True the last query term also matches terms it begins, as
+        the user is still typing it.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        category = category_slug(category) if category else None
+
+        with self._lock:
+            if not self._docs:
+                return []
+            self._check_norms()
+            best = self._score(terms, category, difficulty, limit, prefix)
+            return [dict(self._docs[doc], score=round(score, 4)) for doc, score in best]
+
+    def autocomplete(self, query, category=None, difficulty=None, limit=8):
+        """Question texts matching a partly typed query"""
+        terms = tokenize(query)
+        if len(terms) != 1 or category or difficulty or limit > SUGGESTIONS:
+            return [hit["question_text"] for hit in
+                    self.search(query, category, difficulty, limit, prefix=True)]
+
+        with self._lock:
+            if not self._docs:
+                return []
+            self._check_norms()
+            docs = self._suggestions.get(terms[0])
+            if docs is None:
+                docs = self._suggestions[terms[0]] = [
+                    doc for doc, _ in self._score(terms, None, None, SUGGESTIONS, prefix=True)]
+            return [self._docs[doc]["question_text"] for doc in docs[:limit]]
+
+    def _score(self, terms, category, difficulty, limit, prefix):
+        """The limit best (doc id, score) pairs for tokenized query terms"""
+        weights = {term: 1.0 for term in terms}
+        caps = dict.fromkeys(terms, POSTINGS_CAP)
+        if prefix:
+            last = terms[-1]
+            if last not in terms[:-1]:
+                del weights[last]
+            for term in self._expand(last):
+                weights[term] = max(weights.get(term, 0.0), 1.0 if term == last else 0.5)
+                caps.setdefault(term, COMPLETION_POSTINGS_CAP)
+
+        # Filters are checked per posting, so filtered-out documents are never scored
+        allowed = self._allowed(category, difficulty)
+        count = len(self._docs)
+        scores = {}
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = weight * (K1 + 1) * math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            cap = caps[term]
+            ranked = self._ranked_postings(term)
+            if allowed is None:
+                ranked = ranked[:cap]
+            walked = 0
+            for negative_impact, doc in ranked:
+                if allowed is not None:
+                    if doc not in allowed:
+                        continue
+                    walked += 1
+                    if walked > cap:
+                        break
+                scores[doc] = scores.get(doc, 0.0) - idf * negative_impact
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def _expand(self, prefix):
+        """The PREFIX_EXPANSIONS most common indexed terms starting with prefix"""
+        matches = self._expansions.get(prefix)
+        if matches is None:
+            start = bisect.bisect_left(self._terms, prefix)
+            end = bisect.bisect_left(self._terms, prefix + "\uffff", start)
+            matches = self._terms[start:end]
+            if len(matches) > PREFIX_EXPANSIONS:
+                matches = heapq.nlargest(PREFIX_EXPANSIONS, matches, key=lambda t: len(self._postings[t]))
+            self._expansions[prefix] = matches
+        return matches
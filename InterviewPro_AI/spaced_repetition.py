@@ -0,0 +1,66 @@
+"""
+InterviewPro AI - Spaced Repetition
+SM-2 review scheduling for practice questions
+"""
+
+from datetime import datetime, timedelta
+
+# Self-graded recall quality, SM-2 scale 0-5
+REVIEW_GRADES = {"again": 1, "hard": 3, "good": 4, "easy": 5}
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+
+def sm2(quality, ease=DEFAULT_EASE, interval_days=0, repetitions=0):
+    """Next (ease, interval_days, repetitions) after a review graded `quality`"""
+    if quality < 3:
+        # Forgotten: start the sequence again tomorrow, ease untouched
+        return ease, 1, 0
+    repetitions += 1
+    if repetitions == 1:
+        interval_days = 1
+    elif repetitions == 2:
+        interval_days = 6
+    else:
+        interval_days = round(interval_days * ease)
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return ease, interval_days, repetitions
+
+
+class ReviewScheduler:
+    """Serves due practice questions and reschedules them as they are reviewed"""
+
+    def __init__(self, database, page_size=20):
+        self.db = database
+        self.page_size = page_size
+
+    def practice_queue(self, user_id, category_id, now=None):
+        """Due reviews, most overdue first, topped up with questions not seen yet"""
+        now = now or datetime.now()
+        questions = self.db.get_due_reviews(user_id, category_id, now, self.page_size)
+        for question in questions:
+            question["review_status"] = "due"
+        if len(questions) < self.page_size:
+            for question in self.db.get_unreviewed_questions(user_id, category_id,
+                                                             self.page_size - len(questions)):
+                question["review_status"] = "new"
+                questions.append(question)
+        return questions
+
+    def review(self, user_id, question_id, grade, now=None):
+        """Record a self-graded review and schedule the next one"""
+        quality = REVIEW_GRADES.get(grade)
+        if quality is None:
+            return None
+        now = now or datetime.now()
+        state = self.db.get_review_state(user_id, question_id)
+        if state:
+            ease, interval_days, repetitions = sm2(quality, state["ease"], state["interval_days"],
+                                                   state["repetitions"])
+        else:
+            ease, interval_days, repetitions = sm2(quality)
+        due_at = now + timedelta(days=interval_days)
+        if not self.db.save_review(user_id, question_id, ease, interval_days, repetitions, due_at, now):
+            return None
+        return due_at
@@ -0,0 +1,116 @@
+"""
+InterviewPro AI - Response Time Analytics
+Log-bucketed time-to-answer histograms per question, per student and per interview
+"""
+
+import math
+
+from adaptive import question_key
+
+# Buckets grow by 10%, so percentiles are accurate to within about 5%
+BUCKET_BASE = 1.1
+
+# Questions need this many timed answers before their estimated_time is judged
+MIN_SAMPLES = 5
+
+# A median outside this fraction of estimated_time marks the estimate as wrong
+ESTIMATE_TOLERANCE = (0.5, 1.5)
+
+
+def bucket_of(seconds):
+    return int(math.log1p(max(seconds, 0)) / math.log(BUCKET_BASE))
+
+
+def bucket_seconds(bucket):
+    """Representative (geometric middle) value of a bucket in seconds"""
+    return BUCKET_BASE ** (bucket + 0.5) - 1
+
+
+def timing_key(question):
+    """Histogram key for a question: its database ID, or its question bank key"""
+    if question.get("id"):
+        return f"q{question['id']}"
+    return question.get("question_key") or question_key(question.get("question") or question.get("question_text", ""))
+
+
+def percentiles(buckets, points=(50, 90)):
+    """Percentiles in seconds from a {bucket: samples} histogram"""
+    total = sum(buckets.values())
+    result = {"samples": total}
+    if not total:
+        return dict(result, **{f"p{p}": None for p in points})
+    ordered = sorted(buckets.items())
+    for p in points:
+        rank, seen = math.ceil(total * p / 100), 0
+        for bucket, samples in ordered:
+            seen += samples
+            if seen >= rank:
+                result[f"p{p}"] = round(bucket_seconds(bucket))
+                break
+    return result
+
+
+class ResponseTimes:
+    """Folds each finished interview's question timings into running histograms"""
+
+    def __init__(self, database):
+        self.db = database
+
+    def record_session(self, user_id, questions, times):
+        """Add one interview's timings; skipped questions count toward the interview total only"""
+        counts = {}
+        total = 0
+        for question, timing in zip(questions, times):
+            seconds = timing["seconds"]
+            total += seconds
+            if timing.get("skipped"):
+                continue
+            for scope, key in (("question", timing_key(question)), ("student", str(user_id))):
+                slot = (scope, key, bucket_of(seconds))
+                counts[slot] = counts.get(slot, 0) + 1
+        if times:
+            slot = ("interview", str(user_id), bucket_of(total))
+            counts[slot] = counts.get(slot, 0) + 1
+        if counts:
+            self.db.save_response_time_buckets(
+                [(scope, key, bucket, samples) for (scope, key, bucket), samples in counts.items()])
+
+    def _histograms(self, scope, keys):
+        histograms = {key: {} for key in keys}
+        for row in self.db.get_response_time_buckets(scope, keys):
+            histograms[row["scope_key"]][row["bucket"]] = row["samples"]
+        return histograms
+
+    def student_summary(self, user_id):
+        """p50/p90 time-to-answer for a student, plus their fastest interview"""
+        key = str(user_id)
+        summary = percentiles(self._histograms("student", [key])[key])
+        interviews = self._histograms("interview", [key])[key]
+        summary["fastest_interview"] = round(bucket_seconds(min(interviews))) if interviews else None
+        return summary
+
+    def estimate_outliers(self):
+        """Database questions whose median answer time is far from their estimated_time"""
+        histograms = {}
+        questions = {}
+        for row in self.db.get_question_time_buckets():
+            questions[row["id"]] = row
+            histograms.setdefault(row["id"], {})[row["bucket"]] = row["samples"]
+
+        outliers = []
+        low, high = ESTIMATE_TOLERANCE
+        for question_id, buckets in histograms.items():
+            stats = percentiles(buckets)
+            if stats["samples"] < MIN_SAMPLES:
+                continue
+            estimated = questions[question_id]["estimated_time"] * 60
+            if not low * estimated <= stats["p50"] <= high * estimated:
+                outliers.append({
+                    "id": question_id,
+                    "question_text": questions[question_id]["question_text"],
+                    "estimated_minutes": questions[question_id]["estimated_time"],
+                    "p50_seconds": stats["p50"],
+                    "p90_seconds": stats["p90"],
+                    "samples": stats["samples"],
+                })
+        return outliers
@@ -0,0 +1,204 @@
+"""
+InterviewPro AI - Tournament Engine
+Timed rounds with shared question decks and pooled submission scoring
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import repeat
+
+from ai_engine import DIFFICULTY_POINTS, QUESTION_BANK, evaluate_answer
+
+# Question bank categories used for each tournament type
+TOURNAMENT_CATEGORIES = {
+    "featured": ["data_structures", "algorithms", "oop", "database", "system_design", "behavioral"],
+    "technical": ["data_structures", "algorithms"],
+    "behavioral": ["behavioral"],
+    "advanced": ["system_design", "database"],
+}
+
+# Seconds after a round ends that answers are still accepted, so the page's
+# auto-submit at the deadline arrives in time; rounds are scored after it
+SUBMIT_GRACE_SECONDS = 15
+
+# Share of the prize pool paid to 1st, 2nd and 3rd place
+PRIZE_SPLIT = (0.5, 0.3, 0.2)
+
+
+def build_deck(tournament_type, count, seed):
+    """Build the question deck for a round; the same seed always yields the same deck"""
+    pool = []
+    for category in TOURNAMENT_CATEGORIES.get(tournament_type, TOURNAMENT_CATEGORIES["featured"]):
+        for difficulty, questions in QUESTION_BANK.get(category, {}).items():
+            for q in questions:
+                pool.append({
+                    "category": category,
+                    "difficulty": difficulty,
+                    "question": q["q"],
+                    "ideal_answer": q["a"],
+                    "keywords": q["keywords"],
+                    "points": DIFFICULTY_POINTS.get(difficulty, 10),
+                })
+    rng = random.Random(seed)
+    rng.shuffle(pool)
+    return pool[:count]
+
+
+def public_deck(deck):
+    """Strip answers and keywords from a deck before showing it to entrants"""
+    return [{k: q[k] for k in ("category", "difficulty", "question", "points")} for q in deck]
+
+
+def score_submission(deck, answers):
+    """Score one entrant's answers against a round deck (runs in a worker process)"""
+    total = 0
+    for question, answer in zip(deck, answers):
+        if answer and answer.strip():
+            total += evaluate_answer(question, answer)["score"]
+    return total
+
+
+class TournamentEngine:
+    """Opens rounds on schedule, closes them when time is up and scores them in parallel"""
+
+    def __init__(self, database, registrations=None, submissions=None, workers=None, tick_seconds=5,
+                 on_standings=None, award_xp=None, get_xp=None):
+        self.db = database
+        # Registrations run on their own connection, one at a time, so a seat claim is one transaction
+        self.registrations = registrations or database
+        # Request threads save answers on another one, so they never commit inside the scheduler's round claim
+        self.submissions = submissions or database
+        self.award_xp = award_xp
+        self.get_xp = get_xp
+        self._register_lock = threading.Lock()
+        self._submit_lock = threading.Lock()
+        self.workers = workers or int(os.getenv("TOURNAMENT_SCORING_WORKERS", os.cpu_count() or 2))
+        self.tick_seconds = tick_seconds
+        self.on_standings = on_standings
+        self._pool = None
+        self._thread = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def start(self):
+        """Start the background scheduler thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="tournament-engine", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"⚠️ Tournament engine error: {e}")
+            time.sleep(self.tick_seconds)
+
+    def tick(self, now=None):
+        """Open rounds for tournaments that have started and score rounds whose time is up"""
+        now = now or datetime.now()
+        # The engine's connection lives for the process; read what other connections committed since the last tick
+        self.db.end_snapshot()
+
+        for tournament in self.db.get_due_tournaments(now):
+            self.open_round(tournament, 1, now)
+
+        for round_row in self.db.get_due_rounds(now - timedelta(seconds=SUBMIT_GRACE_SECONDS)):
+            # Only the caller that locks the round scores it; it stays open until its scores are saved
+            if not self.db.claim_tournament_round(round_row["id"]):
+                continue
+            try:
+                scored = self.score_round(round_row)
+            finally:
+                # Releases the round lock when scoring failed before anything was written
+                self.db.end_snapshot()
+            if not scored:
+                continue
+
+            tournament = self.db.get_tournament(round_row["tournament_id"])
+            if round_row["round_number"] < tournament["round_count"]:
+                self.open_round(tournament, round_row["round_number"] + 1, now)
+            elif self.db.complete_tournament(tournament["id"]):
+                self.award_prizes(tournament)
+            self._publish_standings(tournament["id"], round_row["round_number"])
+
+    def open_round(self, tournament, round_number, now):
+        """Precompute the round deck once so every entrant gets the same questions"""
+        deck = build_deck(tournament["tournament_type"],
+                          tournament["questions_per_round"],
+                          seed=f"{tournament['id']}:{round_number}")
+        ends_at = now + timedelta(minutes=tournament["round_minutes"])
+        return self.db.open_tournament_round(tournament["id"], round_number, deck, now, ends_at)
+
+    def score_round(self, round_row):
+        """Score every submission of a claimed round through the worker pool"""
+        submissions = self.db.get_round_submissions(round_row["id"])
+        if submissions:
+            deck = round_row["deck"]
+            totals = self._get_pool().map(score_submission,
+                                          repeat(deck),
+                                          [s["answers"] for s in submissions],
+                                          chunksize=max(1, len(submissions) // (self.workers * 4)))
+            scores = [(s["id"], s["user_id"], total) for s, total in zip(submissions, totals)]
+        else:
+            scores = []
+        if not self.db.save_round_scores(round_row["id"], round_row["tournament_id"], scores):
+            return False
+        print(f"✅ Scored {len(scores)} submissions for tournament round {round_row['id']}")
+        return True
+
+    def award_prizes(self, tournament):
+        """Pay the prize pool out to the top finishers"""
+        if not self.award_xp or not tournament["prize_pool"]:
+            return
+        standings = self.db.get_tournament_standings(tournament["id"], limit=len(PRIZE_SPLIT))
+        for entry, share in zip(standings, PRIZE_SPLIT):
+            if entry["score"] > 0:
+                self.award_xp(entry["user_id"], int(tournament["prize_pool"] * share),
+                              "tournament_prize", f"tournament:{tournament['id']}")
+
+    def register(self, tournament_id, user_id):
+        """Claim a seat and charge the entry fee in XP.
+
+        Returns a register_for_tournament result, or 'insufficient_xp' when the
+        user cannot pay the fee.
+        """
+        with self._register_lock:
+            self.registrations.end_snapshot()
+            tournament = self.registrations.get_tournament(tournament_id)
+            if not tournament:
+                return "unavailable"
+            fee = tournament["entry_fee"] or 0
+            if fee and (not self.get_xp or self.get_xp(user_id) < fee):
+                if self.registrations.is_registered_for_tournament(tournament_id, user_id):
+                    return "already_registered"
+                return "insufficient_xp"
+            result = self.registrations.register_for_tournament(tournament_id, user_id)
+            if result == "registered" and fee and self.award_xp:
+                self.award_xp(user_id, -fee, "tournament_entry", f"tournament:{tournament_id}")
+            return result
+
+    def submit(self, tournament_id, user_id, answers, now=None):
+        """Save answers for the open round; returns False if no round is accepting answers"""
+        now = now or datetime.now()
+        with self._submit_lock:
+            self.submissions.end_snapshot()
+            round_row = self.submissions.get_open_round(tournament_id)
+            if not round_row or round_row["ends_at"] + timedelta(seconds=SUBMIT_GRACE_SECONDS) <= now:
+                return False
+            if not self.submissions.is_registered_for_tournament(tournament_id, user_id):
+                return False
+            answers = [str(a) for a in answers[:len(round_row["deck"])]]
+            return self.submissions.save_tournament_submission(round_row["id"], user_id, answers)
+
+    def _publish_standings(self, tournament_id, round_number):
+        if self.on_standings:
+            self.on_standings(tournament_id, round_number,
+                              self.db.get_tournament_standings(tournament_id))
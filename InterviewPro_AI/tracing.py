@@ -0,0 +1,404 @@
+"""
+InterviewPro AI - Request Tracing
+Head-sampled span trees per request: the route, the Database, AI and template
+spans inside it, and every SQL statement with its fingerprint, rows and time
+
+Sampled traces are exported off the request thread, either as one JSON line
+per trace (TRACE_FILE) or as OTLP/HTTP JSON posted to TRACE_OTLP_ENDPOINT.
+Admins can send "X-Trace: 1" to force a request to be traced.
+"""
+
+import atexit
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from contextvars import ContextVar
+
+# Fraction of requests traced; the decision is made once, when the request starts
+SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+
+TRACE_FILE = os.getenv("TRACE_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                  "traces", "traces.jsonl"))
+OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT")
+
+# Traces waiting for export; beyond this they are dropped rather than slow requests down
+QUEUE_SIZE = 1000
+
+# Spans kept per trace, so a runaway loop cannot hold unbounded memory
+MAX_SPANS = 2000
+
+SERVICE_NAME = "interviewpro-ai"
+
+# (trace, current span) for the request being served, when it is sampled
+_current = ContextVar("trace_current", default=None)
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST = re.compile(r"(\(\?\+?\))(?:\s*,\s*\(\?\+?\))+")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """A statement with literals and parameters replaced by ?, so its executions group together"""
+    sql = _STRING.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(?+)", sql)
+    sql = _VALUES_LIST.sub(r"\1", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def _new_id(bits):
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    __slots__ = ("span_id", "parent", "name", "kind", "start", "end", "attributes", "error")
+
+    def __init__(self, name, kind, parent):
+        self.span_id = _new_id(64)
+        self.parent = parent
+        self.name = name
+        self.kind = kind
+        self.start = time.time_ns()
+        self.end = None
+        self.attributes = {}
+        self.error = False
+
+    @property
+    def parent_id(self):
+        return self.parent.span_id if self.parent else None
+
+    def to_dict(self):
+        return {"span_id": self.span_id, "name": self.name, "kind": self.kind,
+                "start": self.start, "duration_ms": round((self.end - self.start) / 1e6, 3),
+                "attributes": self.attributes, "error": self.error}
+
+
+class Trace:
+    __slots__ = ("trace_id", "spans", "dropped", "lock")
+
+    def __init__(self):
+        self.trace_id = _new_id(128)
+        self.spans = []
+        self.dropped = 0
+        # Work fanned out to other threads (see dashboard.py) adds spans concurrently
+        self.lock = threading.Lock()
+
+    def tree(self):
+        """The spans nested under the root, each with its children in start order"""
+        nodes = {span.span_id: dict(span.to_dict(), children=[]) for span in self.spans
+                 if span.end is not None}
+        roots = []
+        for span in self.spans:
+            node = nodes.get(span.span_id)
+            if node is None:
+                continue
+            parent = nodes.get(span.parent_id)
+            (parent["children"] if parent else roots).append(node)
+        return {"trace_id": self.trace_id, "dropped_spans": self.dropped, "spans": roots}
+
+
+# ============ SPANS ============
+
+def start_span(name, kind, **attributes):
+    """Open a child of the current span; returns None, cheaply, when the request is not sampled"""
+    current = _current.get()
+    if current is None:
+        return None
+    trace, parent = current
+    with trace.lock:
+        if len(trace.spans) >= MAX_SPANS:
+            trace.dropped += 1
+            return None
+        span = Span(name, kind, parent)
+        trace.spans.append(span)
+    span.attributes.update(attributes)
+    _current.set((trace, span))
+    return span
+
+
+def end_span(span, error=False, **attributes):
+    if span is None:
+        return
+    span.end = time.time_ns()
+    span.error = span.error or error
+    span.attributes.update(attributes)
+    current = _current.get()
+    if current is not None and current[1] is span:
+        _current.set((current[0], span.parent))
+
+
+def begin_trace(name, force=False, **attributes):
+    """Start a trace for this request if it is sampled; returns (trace id, root span) or None"""
+    if not (force or (SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE)):
+        _current.set(None)
+        return None
+    trace = Trace()
+    _current.set((trace, None))
+    return trace.trace_id, start_span(name, "request", **attributes)
+
+
+def finish_trace(root, **attributes):
+    """Close the root span and queue the trace for export"""
+    current = _current.get()
+    _current.set(None)
+    if root is None or current is None:
+        return
+    end_span(root, **attributes)
+    exporter.submit(current[0])
+
+
+# ============ SQL ============
+
+# Called with (fingerprint, params, seconds) after every statement, sampled or not
+_query_listeners = []
+
+# Fingerprints by statement text; most statements are string literals in models.py
+_fingerprints = {}
+FINGERPRINT_CACHE = 4096
+
+
+def add_query_listener(listener):
+    _query_listeners.append(listener)
+
+
+def cached_fingerprint(sql):
+    statement = _fingerprints.get(sql)
+    if statement is None:
+        if len(_fingerprints) >= FINGERPRINT_CACHE:
+            _fingerprints.clear()
+        statement = _fingerprints[sql] = fingerprint(sql)
+    return statement
+
+
+class TracedCursor:
+    """Cursor proxy that times each statement, records it as a "sql" span of the
+    current trace and hands it to the query listeners"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._span = None
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        return self._traced(self._cursor.execute, operation, params, args, kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        return self._traced(self._cursor.executemany, operation, seq_params, args, kwargs)
+
+    def _traced(self, method, operation, params, args, kwargs):
+        if not _query_listeners and _current.get() is None:
+            return method(operation, params, *args, **kwargs)
+        statement = cached_fingerprint(operation)
+        span = start_span(statement.split(" ", 1)[0].upper(), "sql", statement=statement)
+        start = time.perf_counter()
+        try:
+            result = method(operation, params, *args, **kwargs)
+        except Exception:
+            end_span(span, error=True)
+            raise
+        seconds = time.perf_counter() - start
+        # Statements returning rows are counted as they are fetched, the rest by rowcount
+        rows = 0 if getattr(self._cursor, "with_rows", False) else self._cursor.rowcount
+        end_span(span, rows=rows if rows and rows > 0 else 0)
+        self._span = span
+        for listener in _query_listeners:
+            listener(statement, params, seconds)
+        return result
+
+    def _fetched(self, rows):
+        """SELECT row counts are only known once the rows are read"""
+        if self._span is not None and rows:
+            self._span.attributes["rows"] = self._span.attributes.get("rows", 0) + rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._fetched(len(rows))
+        return rows
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._fetched(len(rows))
+        return rows
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._fetched(row is not None)
+        return row
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._fetched(1)
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class TracedConnection:
+    """Connection proxy whose cursors are traced; everything else passes straight through"""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self, *args, **kwargs):
+        return TracedCursor(self._connection.cursor(*args, **kwargs))
+
+    def commit(self):
+        # Separate commits inside one request show up as separate spans
+        span = start_span("COMMIT", "sql", statement="COMMIT")
+        try:
+            self._connection.commit()
+        except Exception:
+            end_span(span, error=True)
+            raise
+        end_span(span)
+
+    def rollback(self):
+        span = start_span("ROLLBACK", "sql", statement="ROLLBACK")
+        self._connection.rollback()
+        end_span(span)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def wrap_connection(connection):
+    """A connection whose statements are traced when the request is sampled"""
+    return TracedConnection(connection) if connection is not None else None
+
+
+# ============ EXPORT ============
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(trace):
+    """A trace as an OTLP/HTTP JSON ExportTraceServiceRequest"""
+    spans = []
+    for span in trace.spans:
+        if span.end is None:
+            continue
+        attributes = dict(span.attributes, **{"span.kind": span.kind})
+        spans.append({
+            "traceId": trace.trace_id,
+            "spanId": span.span_id,
+            "parentSpanId": span.parent_id or "",
+            "name": span.name,
+            "kind": 2 if span.kind == "request" else 3 if span.kind == "sql" else 1,
+            "startTimeUnixNano": str(span.start),
+            "endTimeUnixNano": str(span.end),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()],
+            "status": {"code": 2 if span.error else 0},
+        })
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": "interviewpro.tracing"}, "spans": spans}],
+    }]}
+
+
+class TraceExporter:
+    """Writes finished traces from a background thread so requests never wait on export"""
+
+    def __init__(self, path=TRACE_FILE, endpoint=OTLP_ENDPOINT):
+        self.path = path
+        self.endpoint = endpoint
+        self.dropped = 0
+        self._queue = queue.Queue(QUEUE_SIZE)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, trace):
+        self._start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def flush(self):
+        """Export everything queued so far"""
+        traces = []
+        while True:
+            try:
+                traces.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if traces:
+            self._export(traces)
+
+    def _run(self):
+        while True:
+            traces = [self._queue.get()]
+            while len(traces) < 100:
+                try:
+                    traces.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._export(traces)
+            except Exception as e:
+                print(f"⚠️ Trace export error: {e}")
+
+    def _export(self, traces):
+        if self.endpoint:
+            for trace in traces:
+                request = urllib.request.Request(self.endpoint, data=json.dumps(to_otlp(trace)).encode("utf-8"),
+                                                 headers={"Content-Type": "application/json"})
+                urllib.request.urlopen(request, timeout=5).close()
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as out:
+            for trace in traces:
+                out.write(json.dumps(trace.tree(), default=str, separators=(",", ":")) + "\n")
+
+
+exporter = TraceExporter()
+
+
+def instrument_app(app):
+    """Trace sampled Flask requests from before_request to teardown"""
+    from flask import request, session
+
+    def start_request():
+        # Only admins may force a trace, so clients cannot fill the trace file
+        force = request.headers.get("X-Trace") == "1" and session.get("role") == "admin"
+        request.environ["tracing.trace"] = begin_trace(f"{request.method} {request.path}", force=force,
+                                                       method=request.method, path=request.path)
+
+    def finish_request(response):
+        traced = request.environ.get("tracing.trace")
+        if traced is not None:
+            trace_id, root = traced
+            root.attributes["status"] = response.status_code
+            root.attributes["route"] = request.url_rule.rule if request.url_rule else "unmatched"
+            response.headers["X-Trace-Id"] = trace_id
+        return response
+
+    def end_request(exc=None):
+        traced = request.environ.pop("tracing.trace", None)
+        finish_trace(traced[1] if traced else None, error=exc is not None)
+
+    app.before_request(start_request)
+    app.after_request(finish_request)
+    app.teardown_request(end_request)
@@ -0,0 +1,171 @@
+"""
+InterviewPro AI - Write-Behind Buffer
+Batches evaluation inserts and interview session updates off the request thread
+"""
+
+import atexit
+import json
+import os
+import threading
+from datetime import datetime
+
+# Failed writes of one session (or one row) are retried this many times, then set aside
+MAX_ATTEMPTS = 5
+
+# Writes that kept failing, one JSON object per line, for an operator to inspect and replay
+DEAD_LETTER_LOG = os.getenv("WRITE_DEAD_LETTER_LOG",
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)), "failed_writes.log"))
+
+
+class SessionWriteBuffer:
+    """Buffers evaluations and session updates and flushes them in batches.
+
+    A session's pending writes are flushed before it is completed and whenever
+    flush_session is called, so a reader that asks for them sees its own writes.
+    The writes commit on the buffer's own connection, so flush_session also ends
+    the reader connection's snapshot; otherwise it may keep reading rows as they
+    were before the flush.
+
+    Each session's writes commit in their own transaction, so one row the database
+    keeps rejecting holds up only its own session, and only for MAX_ATTEMPTS
+    flushes before it is written to the dead letter log.
+    """
+
+    def __init__(self, database, reader=None, batch_size=200, flush_interval=0.5,
+                 dead_letter_log=DEAD_LETTER_LOG):
+        self.db = database
+        self.reader = reader
+        self.dead_letter_log = dead_letter_log
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._evaluations = []   # evaluation rows in insert order
+        self._sessions = {}      # session_id -> pending column changes
+        self._attempts = {}      # evaluation row or ("session", id) -> failed writes so far
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the background flush thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="session-writes", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def save_evaluation(self, session_id, question_id, question_type, answer_text, score, feedback,
+                        strengths, improvements, keywords_found, keywords_missing):
+        """Queue an evaluation row; question_id is None for question bank questions"""
+        with self._lock:
+            self._evaluations.append((session_id, question_id, question_type, answer_text, score,
+                                      feedback, strengths, improvements, keywords_found,
+                                      keywords_missing))
+            full = len(self._evaluations) + len(self._sessions) >= self.batch_size
+        if full:
+            self._wakeup.set()
+        return True
+
+    def update_interview_session(self, session_id, answers=None, score=None, completed=False,
+                                 category_scores=None, question_times=None):
+        """Queue session changes; completing a session writes everything pending for it now"""
+        with self._lock:
+            pending = self._sessions.setdefault(session_id, {})
+            for field, value in (("answers", answers), ("question_times", question_times),
+                                 ("score", score), ("category_scores", category_scores)):
+                if value is not None:
+                    pending[field] = value
+            if completed:
+                pending["completed"] = True
+            full = len(self._evaluations) + len(self._sessions) >= self.batch_size
+        if completed:
+            return self.flush_session(session_id)
+        if full:
+            self._wakeup.set()
+        return True
+
+    def flush_session(self, session_id):
+        """Write one session's pending evaluations and updates, then let the reader see them"""
+        with self._flush_lock:
+            with self._lock:
+                evaluations = [row for row in self._evaluations if row[0] == session_id]
+                self._evaluations = [row for row in self._evaluations if row[0] != session_id]
+                sessions = {session_id: self._sessions.pop(session_id)} if session_id in self._sessions else {}
+            written = self._write(evaluations, sessions)
+        if self.reader is not None:
+            self.reader.end_snapshot()
+        return written
+
+    def flush(self):
+        """Write everything pending, one transaction per session; returns how many items were taken"""
+        with self._flush_lock:
+            with self._lock:
+                evaluations, self._evaluations = self._evaluations, []
+                sessions, self._sessions = self._sessions, {}
+            if not self._write(evaluations, sessions):
+                return 0
+            return len(evaluations) + len(sessions)
+
+    def _write(self, evaluations, sessions):
+        """Write each session in its own transaction; returns False if anything was not written"""
+        by_session = {}
+        for row in evaluations:
+            by_session.setdefault(row[0], []).append(row)
+        written = True
+        for session_id in dict.fromkeys(list(by_session) + list(sessions)):
+            rows = by_session.get(session_id, [])
+            changes = {session_id: sessions[session_id]} if session_id in sessions else {}
+            if self.db.save_write_batch(rows, changes):
+                self._attempts.pop(("session", session_id), None)
+                for row in rows:
+                    self._attempts.pop(row, None)
+                continue
+            if not self.db.connection:
+                # Without a database there is nothing to retry against
+                return False
+            written = False
+            # Find the failing part: each row, then the session update, on its own
+            for row in rows:
+                if self.db.save_write_batch([row], {}):
+                    self._attempts.pop(row, None)
+                else:
+                    self._retry(row, [row], {})
+            if changes:
+                if self.db.save_write_batch([], changes):
+                    self._attempts.pop(("session", session_id), None)
+                else:
+                    self._retry(("session", session_id), [], changes)
+        return written
+
+    def _retry(self, key, evaluations, sessions):
+        """Put a failed write back for the next flush, or set it aside once it has failed too often"""
+        attempts = self._attempts.pop(key, 0) + 1
+        if attempts >= MAX_ATTEMPTS:
+            self._dead_letter(evaluations, sessions)
+            return
+        self._attempts[key] = attempts
+        # Newer changes win over the ones being put back
+        with self._lock:
+            self._evaluations = evaluations + self._evaluations
+            for session_id, changes in sessions.items():
+                self._sessions[session_id] = dict(changes, **self._sessions.get(session_id, {}))
+
+    def _dead_letter(self, evaluations, sessions):
+        print(f"❌ Giving up on {len(evaluations)} evaluations and {len(sessions)} session updates "
+              f"after {MAX_ATTEMPTS} attempts; see {self.dead_letter_log}")
+        try:
+            with open(self.dead_letter_log, "a", encoding="utf-8") as log:
+                log.write(json.dumps({"failed_at": datetime.now().isoformat(),
+                                      "evaluations": evaluations,
+                                      "sessions": {str(k): v for k, v in sessions.items()}},
+                                     default=str) + "\n")
+        except OSError as e:
+            print(f"❌ Could not write to the dead letter log: {e}")
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Session write buffer error: {e}")
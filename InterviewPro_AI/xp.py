@@ -0,0 +1,117 @@
+"""
+InterviewPro AI - XP Ledger
+Append-only XP ledger with batched writes and per-user rollups
+"""
+
+import atexit
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Users whose XP total is kept per process before the least recently used are evicted
+MAX_TOTALS = 10000
+
+
+class XpLedger:
+    """Buffers XP awards and flushes them to xp_ledger / user_xp in batches"""
+
+    def __init__(self, database, batch_size=100, flush_interval=1.0,
+                 retention_days=90, compact_interval=6 * 3600, max_totals=MAX_TOTALS):
+        self.db = database
+        self.max_totals = max_totals
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        self.compact_interval = compact_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._buffer = []
+        self._pending = {}       # user_id -> XP buffered but not yet flushed
+        self._totals = {}        # user_id -> current XP, kept in step; least recently used first
+        self._listeners = []
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._last_compaction = time.monotonic()
+
+    def add_listener(self, callback):
+        """Call `callback(user_id, amount)` whenever XP is awarded"""
+        self._listeners.append(callback)
+
+    def start(self):
+        """Start the background flush / compaction thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="xp-ledger", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def award(self, user_id, amount, source, reference_id=None):
+        """Record an XP change; it is visible to get_xp immediately"""
+        amount = int(amount)
+        if not user_id or amount == 0:
+            return
+        with self._lock:
+            self._buffer.append((user_id, amount, source, reference_id, datetime.now()))
+            self._pending[user_id] = self._pending.get(user_id, 0) + amount
+            if user_id in self._totals:
+                self._totals[user_id] += amount
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wakeup.set()
+        for callback in self._listeners:
+            callback(user_id, amount)
+
+    def get_xp(self, user_id):
+        """Current XP for a user; the rollup row is read again only after the total is evicted"""
+        with self._lock:
+            if user_id in self._totals:
+                total = self._totals[user_id] = self._totals.pop(user_id)
+                return total
+        # Hold the flush lock so the rollup read never races a batch in flight
+        with self._flush_lock:
+            self.db.end_snapshot()
+            stored = self.db.get_user_xp(user_id)
+            with self._lock:
+                if user_id not in self._totals:
+                    self._totals[user_id] = stored + self._pending.get(user_id, 0)
+                    while len(self._totals) > self.max_totals:
+                        del self._totals[next(iter(self._totals))]
+                return self._totals[user_id]
+
+    def flush(self):
+        """Write buffered entries with one batched insert and one rollup upsert"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+                totals, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            if not self.db.save_xp_entries(batch, totals):
+                # Keep the entries so the next flush retries them
+                with self._lock:
+                    self._buffer = batch + self._buffer
+                    for user_id, amount in totals.items():
+                        self._pending[user_id] = self._pending.get(user_id, 0) + amount
+                return 0
+            return len(batch)
+
+    def compact(self):
+        """Fold ledger rows older than the retention window into one row per user"""
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        # Shares the flush connection, so it must not run while a batch is being written
+        with self._flush_lock:
+            removed = self.db.compact_xp_ledger(cutoff)
+        if removed:
+            print(f"✅ Compacted {removed} XP ledger entries older than {cutoff:%Y-%m-%d}")
+        return removed
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+                if time.monotonic() - self._last_compaction >= self.compact_interval:
+                    self._last_compaction = time.monotonic()
+                    self.compact()
+            except Exception as e:
+                print(f"⚠️ XP ledger error: {e}")
@@ -0,0 +1,200 @@
+"""
+SkillPath AI - Baseline schema
+The tables in schema.sql; create_tables() used to create only users
+"""
+
+
+def up(m):
+    # Users table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            email VARCHAR(255) NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            role ENUM('learner', 'admin', 'mentor', 'industry_expert') NOT NULL DEFAULT 'learner',
+            first_name VARCHAR(100) NOT NULL,
+            last_name VARCHAR(100) NOT NULL,
+            phone VARCHAR(20),
+            is_active BOOLEAN DEFAULT TRUE,
+            is_verified BOOLEAN DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_email (email),
+            INDEX idx_role (role)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Learner profiles table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS learner_profiles (
+            user_id INT PRIMARY KEY,
+            year INT,
+            department VARCHAR(100),
+            current_skills TEXT,
+            target_skills TEXT,
+            career_goal VARCHAR(200),
+            experience_level ENUM('beginner', 'intermediate', 'advanced') DEFAULT 'beginner',
+            learning_style ENUM('visual', 'reading', 'practical', 'mixed') DEFAULT 'mixed',
+            weekly_hours DECIMAL(4,2) DEFAULT 10.0,
+            streak_days INT DEFAULT 0,
+            total_learning_hours DECIMAL(6,2) DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Skills table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS skills (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL UNIQUE,
+            category ENUM('programming', 'data_science', 'cloud', 'web', 'mobile', 'devops', 'soft_skills', 'other') NOT NULL,
+            description TEXT,
+            difficulty ENUM('beginner', 'intermediate', 'advanced') NOT NULL,
+            estimated_hours INT DEFAULT 40,
+            prerequisites TEXT,
+            resource_count INT DEFAULT 0,
+            demand_score INT DEFAULT 50,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # User skills table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS user_skills (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            skill_id INT NOT NULL,
+            proficiency_level ENUM('novice', 'beginner', 'intermediate', 'advanced', 'expert') NOT NULL,
+            self_assessment INT DEFAULT 1,
+            verified_by_mentor BOOLEAN DEFAULT FALSE,
+            last_practiced TIMESTAMP NULL,
+            hours_invested DECIMAL(5,2) DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            FOREIGN KEY (skill_id) REFERENCES skills(id) ON DELETE CASCADE,
+            UNIQUE KEY unique_skill (user_id, skill_id),
+            INDEX idx_user (user_id),
+            INDEX idx_skill (skill_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Learning paths table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS learning_paths (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            path_name VARCHAR(200) NOT NULL,
+            target_role VARCHAR(200),
+            description TEXT,
+            estimated_duration_weeks INT,
+            difficulty_level ENUM('beginner', 'intermediate', 'advanced') DEFAULT 'intermediate',
+            progress_percentage DECIMAL(5,2) DEFAULT 0,
+            status ENUM('active', 'completed', 'paused', 'archived') DEFAULT 'active',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            INDEX idx_user (user_id),
+            INDEX idx_status (status)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Resources table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS resources (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            skill_id INT,
+            category_id INT,
+            title VARCHAR(255) NOT NULL,
+            type ENUM('course', 'tutorial', 'book', 'video', 'article', 'project', 'certification') NOT NULL,
+            description TEXT,
+            url VARCHAR(500),
+            duration_hours DECIMAL(5,2),
+            difficulty ENUM('beginner', 'intermediate', 'advanced'),
+            is_free BOOLEAN DEFAULT TRUE,
+            rating DECIMAL(2,1) DEFAULT 0,
+            provider VARCHAR(100),
+            is_verified BOOLEAN DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (skill_id) REFERENCES skills(id) ON DELETE SET NULL,
+            INDEX idx_skill (skill_id),
+            INDEX idx_type (type)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # User progress table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS user_progress (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            resource_id INT NOT NULL,
+            learning_path_id INT,
+            status ENUM('not_started', 'in_progress', 'completed') DEFAULT 'not_started',
+            progress_percentage DECIMAL(5,2) DEFAULT 0,
+            time_spent_minutes INT DEFAULT 0,
+            notes TEXT,
+            started_at TIMESTAMP NULL,
+            completed_at TIMESTAMP NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            FOREIGN KEY (resource_id) REFERENCES resources(id) ON DELETE CASCADE,
+            FOREIGN KEY (learning_path_id) REFERENCES learning_paths(id) ON DELETE SET NULL,
+            UNIQUE KEY unique_progress (user_id, resource_id),
+            INDEX idx_user (user_id),
+            INDEX idx_status (status)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Goals table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS goals (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            title VARCHAR(200) NOT NULL,
+            description TEXT,
+            goal_type ENUM('daily', 'weekly', 'monthly', 'quarterly', 'yearly') NOT NULL,
+            target_date DATE,
+            status ENUM('pending', 'in_progress', 'completed', 'cancelled') DEFAULT 'pending',
+            priority ENUM('low', 'medium', 'high') DEFAULT 'medium',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            INDEX idx_user (user_id),
+            INDEX idx_status (status)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # User goals table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS user_goals (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            goal_id INT NOT NULL,
+            user_id INT NOT NULL,
+            completed_at TIMESTAMP NULL,
+            notes TEXT,
+            FOREIGN KEY (goal_id) REFERENCES goals(id) ON DELETE CASCADE,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Industry trends table
+    m.execute("""
+        CREATE TABLE IF NOT EXISTS industry_trends (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            skill_id INT,
+            job_role VARCHAR(200),
+            company_type ENUM('startup', 'product', 'service', 'faang', 'msme') NOT NULL,
+            demand_growth DECIMAL(5,2),
+            avg_salary_min DECIMAL(10,2),
+            avg_salary_max DECIMAL(10,2),
+            top_companies TEXT,
+            trend_direction ENUM('rising', 'stable', 'declining') NOT NULL,
+            data_source VARCHAR(100),
+            collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (skill_id) REFERENCES skills(id) ON DELETE SET NULL,
+            INDEX idx_skill (skill_id),
+            INDEX idx_trend (trend_direction)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
@@ -0,0 +1,22 @@
+"""
+SkillPath AI - Query indexes
+Composites for the per-user listings and trend queries in models.py
+"""
+
+
+def up(m):
+    # Paths and goals are listed per user, newest first
+    m.add_index("learning_paths", "idx_user_created", ["user_id", "created_at"])
+    m.drop_index("learning_paths", "idx_user")
+    m.add_index("goals", "idx_user_created", ["user_id", "created_at"])
+    m.drop_index("goals", "idx_user")
+
+    # Skill and progress lookups by user are served by the unique (user_id, ...) keys
+    m.drop_index("user_skills", "idx_user")
+    m.drop_index("user_progress", "idx_user")
+
+    # Skills are browsed per category in name order
+    m.add_index("skills", "idx_category_name", ["category", "name"])
+
+    # The trends page shows the fastest-growing skills first
+    m.add_index("industry_trends", "idx_demand_growth", ["demand_growth"])
@@ -0,0 +1,32 @@
+"""
+SkillPath AI - Hot queries
+Request-path queries from models.py that must be served by an index.
+Checked with: python migrate.py SkillPath_AI --check
+"""
+
+# Reference tables small enough to be read whole (one trend row per skill)
+ALLOW_FULL_SCAN = ("skills", "industry_trends")
+
+HOT_QUERIES = [
+    ("get_user_by_email", "SELECT * FROM users WHERE email = %s", ("learner1@edu.com",)),
+    ("get_learner_by_user_id", "SELECT * FROM learner_profiles WHERE user_id = %s", (1,)),
+    ("get_skills_by_category", "SELECT * FROM skills WHERE category = %s", ("programming",)),
+    ("get_learning_paths", """
+        SELECT * FROM learning_paths WHERE user_id = %s ORDER BY created_at DESC
+    """, (1,)),
+    ("get_resources", "SELECT * FROM resources WHERE skill_id = %s LIMIT %s", (1, 20)),
+    ("get_goals", "SELECT * FROM goals WHERE user_id = %s ORDER BY created_at DESC", (1,)),
+    ("get_industry_trends", "SELECT * FROM industry_trends WHERE skill_id = %s", (1,)),
+    ("get_top_industry_trends", """
+        SELECT * FROM industry_trends ORDER BY demand_growth DESC LIMIT 10
+    """, None),
+    ("get_user_skills", """
+        SELECT us.*, s.name as skill_name, s.category, s.demand_score
+        FROM user_skills us
+        JOIN skills s ON us.skill_id = s.id
+        WHERE us.user_id = %s
+    """, (1,)),
+    ("get_user_progress", "SELECT * FROM user_progress WHERE user_id = %s", (1,)),
+    ("get_admin_stats", "SELECT COUNT(*) as total FROM users WHERE role = 'learner'", None),
+    ("get_active_paths", "SELECT COUNT(*) as total FROM learning_paths WHERE status = 'active'", None),
+]
@@ -6,8 +6,15 @@ Personalized Career Development Platform
 import mysql.connector
 from mysql.connector import Error
 import os
+import sys
 from datetime import datetime
 
+# The migration runner is shared with InterviewPro AI and lives one level up
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from migrate import MigrationRunner
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
 
 class Database:
     def __init__(self):
@@ -31,30 +38,16 @@ class Database:
             self.connection = None
 
     def create_tables(self):
-        """Create tables from schema"""
+        """Bring the schema up to date by applying pending migrations"""
         if not self.connection:
             return False
-        
-        cursor = self.connection.cursor()
-        
-        # Create tables (simplified version)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                email VARCHAR(255) NOT NULL UNIQUE,
-                password_hash VARCHAR(255) NOT NULL,
-                role ENUM('learner', 'admin', 'mentor', 'industry_expert') DEFAULT 'learner',
-                first_name VARCHAR(100) NOT NULL,
-                last_name VARCHAR(100) NOT NULL,
-                phone VARCHAR(20),
-                is_active BOOLEAN DEFAULT TRUE,
-                is_verified BOOLEAN DEFAULT FALSE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            ) ENGINE=InnoDB
-        """)
-        
-        self.connection.commit()
-        cursor.close()
+
+        try:
+            applied = MigrationRunner(self.connection, MIGRATIONS_DIR).run()
+        except Error as e:
+            print(f"❌ Error applying migrations: {e}")
+            return False
+        print(f"✅ Database schema up to date ({len(applied)} migrations applied)")
         return True
 
     # ============ USER OPERATIONS ============
@@ -0,0 +1,190 @@
+"""
+Schema Migration Runner
+Versioned, forward-only MySQL migrations shared by InterviewPro AI and SkillPath AI
+
+Each app keeps its migrations in <app>/migrations/NNNN_name.py. A migration
+defines up(m), where m is the runner, and is applied exactly once; applied
+versions are recorded in the schema_migrations table. There are no down
+migrations - a mistake is corrected by a new migration.
+
+Usage: python migrate.py <app_dir> [--status | --check]
+"""
+
+import importlib.util
+import os
+import re
+import sys
+
+from mysql.connector import Error
+
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+# Seconds to wait for another process that is migrating the same database
+LOCK_TIMEOUT = 60
+
+# EXPLAIN access types that read a whole table or a whole index
+FULL_SCANS = {"ALL": "full table scan", "index": "full index scan"}
+
+
+def load_module(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class MigrationRunner:
+    """Applies the pending migrations in a directory, in version order"""
+
+    def __init__(self, connection, directory):
+        self.connection = connection
+        self.directory = directory
+
+    def discover(self):
+        """(version, name, path) for every migration file, oldest first"""
+        migrations = []
+        for filename in sorted(os.listdir(self.directory)):
+            match = MIGRATION_FILE.match(filename)
+            if match:
+                migrations.append((int(match.group(1)), match.group(2),
+                                   os.path.join(self.directory, filename)))
+        return migrations
+
+    def applied(self):
+        """Versions already recorded in schema_migrations"""
+        self.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INT PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """)
+        return {row[0] for row in self.query("SELECT version FROM schema_migrations")}
+
+    def pending(self):
+        applied = self.applied()
+        return [m for m in self.discover() if m[0] not in applied]
+
+    def run(self):
+        """Apply pending migrations; returns the names of those applied"""
+        # MySQL DDL commits implicitly, so concurrent starts are serialised with a named lock
+        lock = f"schema_migrations.{self.query('SELECT DATABASE()')[0][0]}"
+        if not self.query("SELECT GET_LOCK(%s, %s)", (lock, LOCK_TIMEOUT))[0][0]:
+            raise Error(msg=f"Timed out waiting for migration lock {lock}")
+        try:
+            done = []
+            for version, name, path in self.pending():
+                load_module(path, f"migration_{version:04d}").up(self)
+                self.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                             (version, name))
+                print(f"✅ Applied migration {version:04d}_{name}")
+                done.append(name)
+            return done
+        finally:
+            self.query("SELECT RELEASE_LOCK(%s)", (lock,))
+
+    # ============ HELPERS FOR MIGRATIONS ============
+
+    def execute(self, sql, params=None):
+        cursor = self.connection.cursor()
+        cursor.execute(sql, params)
+        self.connection.commit()
+        cursor.close()
+
+    def query(self, sql, params=None):
+        cursor = self.connection.cursor()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def index_exists(self, table, index):
+        return bool(self.query("""
+            SELECT 1 FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+            LIMIT 1
+        """, (table, index)))
+
+    def add_index(self, table, index, columns, unique=False):
+        """Create an index unless a database built from schema.sql already has it"""
+        if not self.index_exists(table, index):
+            kind = "UNIQUE INDEX" if unique else "INDEX"
+            self.execute(f"ALTER TABLE {table} ADD {kind} {index} ({', '.join(columns)})")
+
+    def drop_index(self, table, index):
+        if self.index_exists(table, index):
+            self.execute(f"ALTER TABLE {table} DROP INDEX {index}")
+
+    def drop_foreign_keys(self, table):
+        """Drop every foreign key declared on a table"""
+        for (name,) in self.query("""
+            SELECT constraint_name FROM information_schema.referential_constraints
+            WHERE constraint_schema = DATABASE() AND table_name = %s
+        """, (table,)):
+            self.execute(f"ALTER TABLE {table} DROP FOREIGN KEY {name}")
+
+    def is_partitioned(self, table):
+        return bool(self.query("""
+            SELECT 1 FROM information_schema.partitions
+            WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL
+            LIMIT 1
+        """, (table,)))
+
+    # ============ QUERY PLAN CHECK ============
+
+    def check_plans(self, queries, allow_full_scan=()):
+        """EXPLAIN each (name, sql, params) and report every full table or full index scan.
+
+        Run it against a database with realistic row counts: on a near-empty one the
+        optimizer may scan a table it could look up. Small tables that are meant to be
+        read whole go in allow_full_scan.
+        """
+        problems = []
+        cursor = self.connection.cursor(dictionary=True)
+        for name, sql, params in queries:
+            cursor.execute("EXPLAIN " + sql, params)
+            for step in cursor.fetchall():
+                if step["type"] in FULL_SCANS and step["table"] not in allow_full_scan:
+                    problems.append(f"{name}: {FULL_SCANS[step['type']]} of {step['table']} "
+                                    f"(~{step['rows']} rows)")
+        cursor.close()
+        return problems
+
+
+def main(argv):
+    if len(argv) < 2 or argv[1].startswith("-"):
+        print(__doc__.strip().splitlines()[-1])
+        return 2
+    app_dir = os.path.abspath(argv[1])
+    directory = os.path.join(app_dir, "migrations")
+    sys.path.insert(0, app_dir)
+    from models import Database
+
+    database = Database()
+    if not database.connection:
+        return 1
+    runner = MigrationRunner(database.connection, directory)
+    try:
+        if "--status" in argv:
+            pending = runner.pending()
+            print(f"{len(runner.applied())} applied, {len(pending)} pending")
+            for version, name, _ in pending:
+                print(f"  {version:04d}_{name}")
+        elif "--check" in argv:
+            hot = load_module(os.path.join(directory, "hot_queries.py"), "hot_queries")
+            problems = runner.check_plans(hot.HOT_QUERIES, hot.ALLOW_FULL_SCAN)
+            for problem in problems:
+                print(f"❌ {problem}")
+            if problems:
+                return 1
+            print(f"✅ {len(hot.HOT_QUERIES)} hot queries use indexes")
+        else:
+            applied = runner.run()
+            print(f"✅ Schema up to date ({len(applied)} migrations applied)")
+    finally:
+        database.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))